@@ -102,28 +102,41 @@ copy_file() {
   fi
 }
 
-# Copy prompts
-mkdir -p "$TARGET_DIR/.github/prompts"
-find . -type f -name '*.prompt.md' -print0 | while IFS= read -r -d '' f; do
-  copy_file "$f" "$TARGET_DIR/.github/prompts/$(basename "$f")"
-done
+# Copy prompts, rules and .vscode
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+if command -v python3 >/dev/null 2>&1 && [[ -f "$SCRIPT_DIR/scripts/distribute_prompts.py" ]]; then
+  # Incremental sync: only changed files are written and files that left the
+  # library are removed, tracked by a manifest in the target.
+  SYNC_ARGS=(--root . sync "$TARGET_DIR")
+  [ "$DRY_RUN" = true ] && SYNC_ARGS+=(--dry-run)
+  [ "$VERBOSE" = true ] && SYNC_ARGS+=(--verbose)
+  if ! python3 "$SCRIPT_DIR/scripts/distribute_prompts.py" "${SYNC_ARGS[@]}"; then
+    echo "Error syncing prompt library to $TARGET_DIR" >&2
+    exit 1
+  fi
+else
+  mkdir -p "$TARGET_DIR/.github/prompts"
+  find . -type f -name '*.prompt.md' -print0 | while IFS= read -r -d '' f; do
+    copy_file "$f" "$TARGET_DIR/.github/prompts/$(basename "$f")"
+  done
 
-# Copy rules
-mkdir -p "$TARGET_DIR/.rules"
-find .rules -type f -name '*.mdc' -print0 | while IFS= read -r -d '' f; do
-  copy_file "$f" "$TARGET_DIR/.rules/$(basename "$f")"
-done
+  # Copy rules
+  mkdir -p "$TARGET_DIR/.rules"
+  find .rules -type f -name '*.mdc' -print0 | while IFS= read -r -d '' f; do
+    copy_file "$f" "$TARGET_DIR/.rules/$(basename "$f")"
+  done
 
-# Copy .vscode directory if it exists
-if [ -d ".vscode" ]; then
-  if [ "$DRY_RUN" = true ]; then
-    echo "[DRY RUN] Would copy .vscode directory to $TARGET_DIR/.vscode"
-  else
-    cp -r .vscode "$TARGET_DIR/.vscode"
-    if [[ $? -ne 0 ]]; then
-      echo "Error copying .vscode directory to $TARGET_DIR/.vscode" >&2
+  # Copy .vscode directory if it exists
+  if [ -d ".vscode" ]; then
+    if [ "$DRY_RUN" = true ]; then
+      echo "[DRY RUN] Would copy .vscode directory to $TARGET_DIR/.vscode"
     else
-      [ "$VERBOSE" = true ] && echo "Copied .vscode directory to $TARGET_DIR/.vscode"
+      cp -r .vscode "$TARGET_DIR/.vscode"
+      if [[ $? -ne 0 ]]; then
+        echo "Error copying .vscode directory to $TARGET_DIR/.vscode" >&2
+      else
+        [ "$VERBOSE" = true ] && echo "Copied .vscode directory to $TARGET_DIR/.vscode"
+      fi
     fi
   fi
 fi
@@ -222,6 +235,16 @@ merge_gitignore_templates() {
 
   [ "$VERBOSE" = true ] && echo "Merging .gitignore templates for project type: $detected_type"
 
+  if command -v python3 >/dev/null 2>&1 && [[ -f "$script_dir/scripts/gitignore_merge.py" ]]; then
+    # Idempotent merge: generated content is regenerated instead of nested, duplicate
+    # patterns are dropped, and the file is only rewritten when it changes.
+    local merge_args=("$target_gitignore" --templates "$templates_dir" --type "$detected_type")
+    [ "$DRY_RUN" = true ] && merge_args+=(--dry-run)
+    [ "$VERBOSE" = true ] && merge_args+=(--verbose)
+    python3 "$script_dir/scripts/gitignore_merge.py" "${merge_args[@]}"
+    return
+  fi
+
   # Create a temporary file for the merged content
   local temp_file
   temp_file=$(mktemp)
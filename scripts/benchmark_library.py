@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the library scripts on synthetic libraries.
+
+`generate` writes a deterministic library of N files: *.prompt.md files with
+realistic frontmatter (some without a version or description, so that
+version_prompts and lint have work to do) and body sizes from a few hundred
+bytes to tens of kilobytes, spread over nested category directories, plus
+.rules/**/*.mdc rule files.
+
+`run` generates a library per size (1k, 10k and 100k files by default) and
+runs generate_index (cold and warm cache), prompt_cli search/show/lint and
+version_prompts (first run and no-op re-run) against it as subprocesses. Each
+sample records wall time, peak RSS of the process tree (from wait4), the total
+syscall count of every process and thread (from `strace -f -c`, when strace is
+installed) and the read/write syscall counts and bytes of the main process
+(from /proc/<pid>/io, where available); the results are written as JSON with
+the syscall source used. `compare` reports the ratio between two result files
+and exits non-zero on a wall-time regression.
+
+Usage:
+    python3 benchmark_library.py run --sizes 1000 10000 --output bench-<commit>.json
+    python3 benchmark_library.py compare bench-old.json bench-new.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPTS_DIR, ".."))
+
+RESULTS_FORMAT = 2
+DEFAULT_SIZES = (1000, 10000, 100000)
+FILES_PER_DIR = 100
+RULE_EVERY = 10  # every 10th file is a .mdc rule
+
+CATEGORIES = ('aiops', 'mlops', 'terraform', 'kubernetes', 'security', 'frontend', 'backend', 'data', 'docs', 'ci')
+WORDS = (
+    'analyze', 'pipeline', 'deployment', 'kubernetes', 'terraform', 'module', 'review', 'security', 'latency',
+    'cluster', 'service', 'incident', 'runbook', 'observability', 'metrics', 'dashboard', 'refactor', 'migration',
+    'schema', 'database', 'cache', 'queue', 'python', 'golang', 'typescript', 'component', 'pull', 'request',
+    'changelog', 'release', 'rollback', 'secret', 'policy', 'compliance', 'budget', 'capacity', 'ownership',
+)
+TOOLS = ('copilot', 'claude', 'cursor', 'chatgpt', 'gemini', 'all')
+SEARCH_KEYWORD = 'observability runbook'
+
+# Runs a script like `python3 script args...` and dumps /proc/self/io on exit.
+_IO_WRAPPER = """\
+import atexit, os, runpy, sys
+report, script = sys.argv[1], sys.argv[2]
+def _dump_io():
+    try:
+        with open('/proc/self/io') as src, open(report, 'w') as dst:
+            dst.write(src.read())
+    except OSError:
+        pass
+atexit.register(_dump_io)
+sys.argv = sys.argv[2:]
+sys.path.insert(0, os.path.dirname(script))
+runpy.run_path(script, run_name='__main__')
+"""
+
+
+def _is_rule(index):
+    return index % RULE_EVERY == RULE_EVERY - 1
+
+
+def _directory(rng, index):
+    category = CATEGORIES[index % len(CATEGORIES)]
+    group = index // (FILES_PER_DIR * len(CATEGORIES))
+    return os.path.join(category, f"group-{group:03d}", rng.choice(WORDS))
+
+
+def _paragraph(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(20, 80))]
+    return ' '.join(words).capitalize() + '.'
+
+
+def _body(rng, title, link=None):
+    # Mostly short prompts with a long tail of large ones, as in the real library.
+    paragraphs = min(200, 2 + int(rng.expovariate(1 / 8)))
+    sections = [f"# {title}", ""]
+    for number in range(paragraphs):
+        if number % 4 == 0:
+            sections += [f"## {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}", ""]
+        sections += [_paragraph(rng), ""]
+    if link:
+        sections += [f"See also [a related prompt]({link}).", ""]
+    return '\n'.join(sections)
+
+
+def prompt_id(index):
+    return f"bench-prompt-{index:06d}"
+
+
+def generate_library(root, size, seed=0):
+    """Write a synthetic library of size files under root; returns the relative paths written."""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(size):
+        directory = _directory(rng, index)
+        slug = '-'.join(rng.sample(WORDS, 2))
+        if _is_rule(index):
+            rel_path = os.path.join('.rules', directory, f"{slug}-{index:06d}.mdc")
+            content = "---\ndescription: {}\nglobs: \"**/*.{}\"\nalwaysApply: false\n---\n{}".format(
+                _paragraph(rng)[:120], rng.choice(('py', 'ts', 'go', 'tf')), _body(rng, f"{slug} rules"))
+        else:
+            rel_path = os.path.join(directory, f"{slug}-{index:06d}.prompt.md")
+            title = f"{slug.replace('-', ' ').title()} {index}"
+            lines = ["---", f"id: {prompt_id(index)}", f"name: \"{title}\""]
+            if rng.random() < 0.9:
+                lines.append(f"description: \"{_paragraph(rng)[:160]}\"")
+            lines.append(f"category: \"{directory.split(os.sep)[0]}\"")
+            if rng.random() < 0.8:
+                lines.append(f"version: \"1.{rng.randint(0, 9)}.{rng.randint(0, 20)}\"")
+            lines += [
+                "created_date: \"2025-01-15\"",
+                "last_updated: \"2025-06-01\"",
+                "tags: [{}]".format(', '.join(f'"{tag}"' for tag in rng.sample(WORDS, rng.randint(1, 4)))),
+                "tool_compatibility: [{}]".format(', '.join(f'"{tool}"' for tool in rng.sample(TOOLS, rng.randint(1, 3)))),
+                "---",
+                "",
+            ]
+            # Some prompts link to their neighbour, for the cross-file lint rules.
+            previous = paths[-1] if paths else ''
+            link = None
+            if previous.endswith('.prompt.md') and os.path.dirname(previous) == directory and rng.random() < 0.1:
+                link = os.path.basename(previous)
+            content = '\n'.join(lines) + _body(rng, title, link)
+        os.makedirs(os.path.join(root, os.path.dirname(rel_path)), exist_ok=True)
+        with open(os.path.join(root, rel_path), 'w', encoding='utf-8') as f:
+            f.write(content)
+        paths.append(rel_path)
+    return paths
+
+
+def _read_io(report):
+    try:
+        with open(report, 'r', encoding='utf-8') as f:
+            fields = dict(line.split(': ', 1) for line in f.read().splitlines() if ': ' in line)
+    except OSError:
+        return {}
+    if 'syscr' not in fields:
+        return {}
+    return {
+        'read_syscalls': int(fields['syscr']), 'write_syscalls': int(fields['syscw']),
+        'read_bytes': int(fields['rchar']), 'write_bytes': int(fields['wchar']),
+    }
+
+
+def _read_strace_total(report):
+    """Return the total call count from a `strace -c` summary, or None."""
+    try:
+        with open(report, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    header = next((line for line in lines if line.lstrip().startswith('% time')), None)
+    total = next((line for line in reversed(lines) if line.split()[-1:] == ['total']), None)
+    if header is None or ' calls' not in header or total is None:
+        return None
+    # Columns are right-aligned and some are blank on the total line, so cut by position.
+    end = header.index(' calls') + len(' calls')
+    start = len(header[:end - len(' calls')].rstrip())
+    try:
+        return int(total[start:end])
+    except ValueError:
+        return None
+
+
+def measure(argv, cwd, strace=None):
+    """Run `python3 argv...` and return one sample: wall time, peak RSS and syscall counts.
+
+    With strace (the path to the binary) the run is traced with `strace -f -c`
+    and 'syscalls' is the total made by every process and thread. Tracing slows
+    the run down, so wall times are only comparable between runs that agree on
+    it. The read/write counts of the main process are recorded either way.
+    """
+    fd, report = tempfile.mkstemp(prefix='bench-io-', suffix='.txt')
+    os.close(fd)
+    command = [sys.executable, '-c', _IO_WRAPPER, report] + argv
+    trace = None
+    if strace:
+        fd, trace = tempfile.mkstemp(prefix='bench-strace-', suffix='.txt')
+        os.close(fd)
+        command = [strace, '-f', '-c', '-o', trace] + command
+    try:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # wait4 reports the child's resource usage, including the workers it reaped.
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        sample = {'wall_s': round(wall, 4), 'peak_rss_kb': usage.ru_maxrss, 'exit_code': proc.returncode}
+        sample.update(_read_io(report))
+        if trace:
+            sample['syscalls'] = _read_strace_total(trace)
+        return sample
+    finally:
+        os.unlink(report)
+        if trace:
+            os.unlink(trace)
+
+
+def _clear_cache(library):
+    shutil.rmtree(os.path.join(library, '.prompt_cache'), ignore_errors=True)
+
+
+def benchmarks(library, size, jobs=1):
+    """Return (name, argv, setup, samples) for each benchmark, in the order they must run."""
+    def script(name):
+        return os.path.join(SCRIPTS_DIR, name)
+
+    cli = [script('prompt_cli.py'), '--root', library]
+    show_index = next(i for i in range(size // 2, -1, -1) if not _is_rule(i))
+    return [
+        ('generate_index (cold)', [script('generate_index.py'), '--root', library, '--jobs', str(jobs)], _clear_cache, None),
+        ('generate_index (warm)', [script('generate_index.py'), '--root', library, '--jobs', str(jobs)], None, None),
+        ('prompt_cli search', cli + ['search', SEARCH_KEYWORD, '--limit', '20'], None, None),
+        ('prompt_cli show', cli + ['show', prompt_id(show_index)], None, None),
+        ('prompt_cli lint', cli + ['lint', '--jobs', str(jobs)], None, None),
+        # The first run adds missing versions (and rebuilds the index), later runs change nothing.
+        ('version_prompts (first run)', [script('version_prompts.py'), '--root', library, '--jobs', str(jobs)], None, 1),
+        ('version_prompts (no-op)', [script('version_prompts.py'), '--root', library, '--jobs', str(jobs)], None, None),
+    ]
+
+
+def run_benchmarks(sizes, workdir, repeat=3, jobs=1, seed=0, keep=False, log=print, strace=None):
+    """Generate a library per size, run every benchmark and return the list of results.
+
+    Total syscalls are only counted with strace (see measure); otherwise
+    'syscalls' is None and only 'read_write_syscalls' of the main process is set.
+    """
+    results = []
+    for size in sizes:
+        library = os.path.join(workdir, f"library-{size}")
+        shutil.rmtree(library, ignore_errors=True)
+        start = time.perf_counter()
+        generate_library(library, size, seed)
+        log(f"📚 Generated {size} files in {time.perf_counter() - start:.1f}s at {library}")
+
+        for name, argv, setup, samples in benchmarks(library, size, jobs):
+            runs = []
+            for _ in range(samples or repeat):
+                if setup:
+                    setup(library)
+                runs.append(measure(argv, library, strace))
+            result = {
+                'size': size,
+                'benchmark': name,
+                'wall_s': min(run['wall_s'] for run in runs),
+                'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+                'syscalls': min((run['syscalls'] for run in runs if run.get('syscalls') is not None), default=None),
+                'read_write_syscalls': min((run['read_syscalls'] + run['write_syscalls'] for run in runs if 'read_syscalls' in run),
+                                           default=None),
+                'syscall_source': 'strace' if strace else 'proc-io',
+                'exit_code': max((run['exit_code'] for run in runs), key=abs),
+                'samples': runs,
+            }
+            results.append(result)
+            if result['syscalls'] is not None:
+                syscalls = f"{result['syscalls']} syscalls"
+            elif result['read_write_syscalls'] is not None:
+                syscalls = f"{result['read_write_syscalls']} read/write syscalls"
+            else:
+                syscalls = 'n/a syscalls'
+            status = '' if result['exit_code'] == 0 else f" (exit {result['exit_code']})"
+            log(f"  {name:<28} {result['wall_s']:8.3f}s  {result['peak_rss_kb'] / 1024:7.1f} MB  {syscalls}{status}")
+        if not keep:
+            shutil.rmtree(library, ignore_errors=True)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(baseline, current, threshold=0.2):
+    """Return (rows, regressions) comparing wall time and peak RSS of matching benchmarks."""
+    before = {(r['size'], r['benchmark']): r for r in baseline['results']}
+    rows = []
+    regressions = 0
+    for result in current['results']:
+        old = before.get((result['size'], result['benchmark']))
+        if old is None:
+            continue
+        wall_ratio = result['wall_s'] / old['wall_s'] if old['wall_s'] else None
+        rss_ratio = result['peak_rss_kb'] / old['peak_rss_kb'] if old['peak_rss_kb'] else None
+        regressed = wall_ratio is not None and wall_ratio > 1 + threshold
+        regressions += regressed
+        rows.append({'size': result['size'], 'benchmark': result['benchmark'], 'wall_ratio': wall_ratio,
+                     'rss_ratio': rss_ratio, 'regressed': regressed})
+    return rows, regressions
+
+
+def run_command(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix='prompt-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    strace = None if args.no_strace else shutil.which('strace')
+    if not strace:
+        print("Counting read/write syscalls of the main process only (strace not used)")
+    try:
+        results = run_benchmarks(args.sizes, workdir, args.repeat, args.jobs, args.seed, args.keep, strace=strace)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    report = {
+        'format': RESULTS_FORMAT,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': args.repeat,
+        'jobs': args.jobs,
+        'seed': args.seed,
+        'syscall_source': 'strace' if strace else 'proc-io',
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"\n📝 Results written to {args.output}")
+    if any(result['exit_code'] != 0 for result in results):
+        sys.exit(1)
+
+
+def compare_command(args):
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+    if baseline.get('syscall_source') != current.get('syscall_source'):
+        print("Warning: only one of the result files was traced with strace; wall times are not comparable",
+              file=sys.stderr)
+    rows, regressions = compare_results(baseline, current, args.threshold)
+    for row in rows:
+        wall = 'n/a' if row['wall_ratio'] is None else f"{row['wall_ratio']:.2f}x"
+        rss = 'n/a' if row['rss_ratio'] is None else f"{row['rss_ratio']:.2f}x"
+        marker = '❌' if row['regressed'] else '✅'
+        print(f"{marker} {row['size']:>7} {row['benchmark']:<28} wall {wall:>7}  rss {rss:>7}")
+    print(f"\n📊 {len(rows)} benchmarks compared, {regressions} slower by more than {args.threshold:.0%}")
+    if regressions:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the library scripts on synthetic libraries.")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    generate_parser = subparsers.add_parser("generate", help="Write a synthetic library.")
+    generate_parser.add_argument("size", type=int, help="Number of prompt and rule files.")
+    generate_parser.add_argument("output", help="Directory to write the library to.")
+    generate_parser.add_argument("--seed", type=int, default=0, help="Random seed (the same seed gives the same library).")
+
+    run_parser = subparsers.add_parser("run", help="Generate libraries and benchmark the scripts against them.")
+    run_parser.add_argument("--sizes", type=int, nargs='+', default=list(DEFAULT_SIZES), help="Library sizes to benchmark.")
+    run_parser.add_argument("--output", "-o", default="benchmark-results.json", help="Write results as JSON to this file.")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Samples per benchmark (the fastest is reported).")
+    run_parser.add_argument("--jobs", "-j", type=int, default=1,
+                            help="--jobs passed to the scripts.")
+    run_parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated libraries.")
+    run_parser.add_argument("--workdir", help="Directory for the generated libraries (default: a temporary directory).")
+    run_parser.add_argument("--keep", action="store_true", help="Keep the generated libraries after the run.")
+    run_parser.add_argument("--no-strace", action="store_true",
+                            help="Don't trace with strace; only read/write syscalls of the main process are counted.")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files.")
+    compare_parser.add_argument("baseline", help="Results from the reference commit.")
+    compare_parser.add_argument("current", help="Results from the commit under test.")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="Relative wall-time increase that counts as a regression.")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        print(f"Wrote {len(generate_library(args.output, args.size, args.seed))} files to {args.output}")
+    elif args.command == "run":
+        run_command(args)
+    elif args.command == "compare":
+        compare_command(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
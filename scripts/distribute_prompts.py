@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Incremental distribution of the prompt library into target repositories.
+
+`sync` lays out files the way copy-prompts.sh does (every *.prompt.md flattened
+into .github/prompts/, every .rules/*.mdc into .rules/, .vscode/ as is) but only
+writes files whose content changed. A manifest written into the target records
+source and destination (mtime, size, sha256), so a re-sync of an unchanged
+library only stats files, and files that left the library are removed again.
+
+Several targets (or every repository in symlink_config.json) can be synced in
+one run: the library is walked, stat'ed and hashed once and shared by a
+bounded pool of worker threads, one target each.
+
+`pack` writes the same files plus the .gitignore templates and the generated
+index into one versioned .tar.gz whose first member is a manifest of paths and
+hashes; `install` streams such a bundle into a target without a library
+checkout, skipping files whose hashes already match.
+"""
+import argparse
+import errno
+import fcntl
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from metadata_cache import NEW_FILE_MODE, file_hash, write_atomic
+from walker import walk
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MANIFEST_FILE = ".github/prompts/.prompt-sync-manifest.json"
+MANIFEST_VERSION = 1
+LINK_MODES = ('copy', 'hardlink', 'reflink')
+BUNDLE_MANIFEST = "bundle-manifest.json"
+BUNDLE_FORMAT = 1
+GITIGNORE_TEMPLATES_DIR = "templates/gitignore"
+INDEX_FILE = "PROMPT_RULE_INDEX.md"
+# Linux FICLONE ioctl: share the source's blocks copy-on-write (btrfs, XFS, ...).
+FICLONE = 0x40049409
+
+
+def plan_sources(root):
+    """Return {destination_rel_path: source_rel_path} for the library at root.
+
+    On basename collisions the first file in walk order wins and the others are
+    reported, instead of silently overwriting each other as `cp` would. Like the
+    find-based copy in copy-prompts.sh, .gitignore is not honoured, so a synced
+    repository (which ignores .github/prompts/ and .rules/) can be redistributed.
+    """
+    sources = {}
+    for dirpath, _, filenames in walk(root, use_gitignore=False):
+        rel_dir = os.path.relpath(dirpath, root)
+        rel_dir = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/')
+        top = rel_dir.split('/', 1)[0]
+        for name in sorted(filenames):
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if top == '.vscode':
+                destination = rel_path
+            elif name.endswith('.prompt.md'):
+                destination = f".github/prompts/{name}"
+            elif top == '.rules' and name.endswith('.mdc'):
+                destination = f".rules/{name}"
+            else:
+                continue
+            if destination in sources:
+                print(f"Warning: {rel_path} collides with {sources[destination]} at {destination}; skipping it")
+                continue
+            sources[destination] = rel_path
+    return sources
+
+
+class LibrarySnapshot:
+    """The distributable files of a library, stat'ed once and hashed at most once.
+
+    Hashes are computed lazily, so a re-sync whose targets are all up to date
+    never reads a source file; the snapshot is safe to share between threads.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.sources = plan_sources(root)
+        self.stats = {destination: _stat_key(os.path.join(root, source))
+                      for destination, source in self.sources.items()}
+        self._digests = {}
+        # One lock per file: concurrent targets wait for a hash in progress instead of repeating it.
+        self._locks = {destination: threading.Lock() for destination in self.sources}
+
+    def digest(self, destination):
+        with self._locks[destination]:
+            digest = self._digests.get(destination)
+            if digest is None:
+                digest = self._digests[destination] = file_hash(os.path.join(self.root, self.sources[destination]))
+        return digest
+
+
+def load_target_manifest(target):
+    """Return the files recorded by the previous sync into target, or {}."""
+    try:
+        with open(os.path.join(target, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if isinstance(data, dict) and data.get('version') == MANIFEST_VERSION:
+        return data.get('files', {})
+    return {}
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _reflink(src, dst):
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def install_file(src, dst, link='copy'):
+    """Place src at dst atomically (temp name + rename) by copy, hardlink or reflink.
+
+    hardlink and reflink fall back to a plain copy when the filesystem refuses.
+    """
+    directory = os.path.dirname(dst)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(dst) + '-', suffix='.tmp')
+    os.close(fd)
+    try:
+        if link == 'hardlink':
+            os.unlink(tmp_path)
+            try:
+                os.link(src, tmp_path)
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    raise
+                shutil.copy2(src, tmp_path)
+        elif link == 'reflink':
+            try:
+                _reflink(src, tmp_path)
+                shutil.copymode(src, tmp_path)
+            except OSError:
+                shutil.copy2(src, tmp_path)
+        else:
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def sync(root, target, link='copy', dry_run=False, verbose=False, library=None, log=print):
+    """Sync the library at root into target; returns counts of copied/unchanged/removed files.
+
+    Pass a LibrarySnapshot as library to share one scan of root between targets.
+    """
+    library = library or LibrarySnapshot(root)
+    previous = load_target_manifest(target)
+    files = {}
+    counts = {'copied': 0, 'unchanged': 0, 'removed': 0}
+
+    for destination, source in sorted(library.sources.items()):
+        src = os.path.join(root, source)
+        dst = os.path.join(target, destination)
+        src_key = library.stats[destination]
+        dst_key = _stat_key(dst)
+        recorded = previous.get(destination)
+
+        # Fast path: neither side changed since the last sync, so no hashing at all.
+        if (recorded and recorded['source'] == source and dst_key is not None
+                and [recorded['source_mtime_ns'], recorded['source_size']] == list(src_key)
+                and [recorded['mtime_ns'], recorded['size']] == list(dst_key)):
+            files[destination] = recorded
+            counts['unchanged'] += 1
+            continue
+
+        digest = library.digest(destination)
+        if dst_key is not None and dst_key[1] == src_key[1] and file_hash(dst) == digest:
+            counts['unchanged'] += 1
+            if verbose:
+                log(f"Unchanged: {dst}")
+        else:
+            counts['copied'] += 1
+            if dry_run:
+                log(f"[DRY RUN] Would copy {src} to {dst}")
+                continue
+            install_file(src, dst, link)
+            dst_key = _stat_key(dst)
+            if verbose:
+                log(f"Copied {src} to {dst}")
+        files[destination] = {
+            'source': source, 'sha256': digest,
+            'source_mtime_ns': src_key[0], 'source_size': src_key[1],
+            'mtime_ns': dst_key[0], 'size': dst_key[1],
+        }
+
+    counts['removed'] = _remove_stale(target, previous, library.sources, dry_run, verbose, log)
+    if not dry_run:
+        _write_target_manifest(target, files, previous)
+    return counts
+
+
+def _remove_stale(target, previous, wanted, dry_run=False, verbose=False, log=print):
+    """Remove files recorded in previous but no longer wanted; returns how many."""
+    removed = 0
+    # Only files a previous sync or install created are ever removed.
+    for destination in sorted(set(previous) - set(wanted)):
+        dst = os.path.join(target, destination)
+        if not os.path.lexists(dst):
+            continue
+        removed += 1
+        if dry_run:
+            log(f"[DRY RUN] Would remove {dst}")
+            continue
+        os.remove(dst)
+        if verbose:
+            log(f"Removed {dst} (no longer in the library)")
+    return removed
+
+
+def _write_target_manifest(target, files, previous):
+    manifest_path = os.path.join(target, MANIFEST_FILE)
+    if files == previous and os.path.exists(manifest_path):
+        return
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    write_atomic(manifest_path, json.dumps({'version': MANIFEST_VERSION, 'files': files}, indent=2, sort_keys=True) + '\n')
+
+
+def _sync_target(target, root, library, link, dry_run, verbose):
+    """Sync one target, buffering its output; safe to run on a worker thread."""
+    output = []
+    result = {'target': target, 'copied': 0, 'unchanged': 0, 'removed': 0, 'error': None, 'output': output}
+    started = time.perf_counter()
+    try:
+        result.update(sync(root, target, link, dry_run, verbose, library, output.append))
+    except OSError as e:
+        result['error'] = str(e)
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def sync_many(root, targets, link='copy', dry_run=False, verbose=False, jobs=1):
+    """Sync one library scan into many targets on a bounded thread pool.
+
+    Yields per-target results in the order of targets.
+    """
+    library = LibrarySnapshot(root)
+    run = partial(_sync_target, root=root, library=library, link=link, dry_run=dry_run, verbose=verbose)
+    if jobs > 1 and len(targets) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(run, targets)
+    else:
+        yield from map(run, targets)
+
+
+def _bundle_entries(root, library):
+    """Return bundle manifest entries: distributable files first, then extras that are not installed."""
+    entries = [
+        {'path': f"files/{destination}", 'install_to': destination, 'source': source,
+         'sha256': library.digest(destination), 'size': library.stats[destination][1]}
+        for destination, source in sorted(library.sources.items())
+    ]
+    extras = []
+    templates_dir = os.path.join(root, GITIGNORE_TEMPLATES_DIR)
+    if os.path.isdir(templates_dir):
+        extras += [f"{GITIGNORE_TEMPLATES_DIR}/{name}" for name in sorted(os.listdir(templates_dir))
+                   if os.path.isfile(os.path.join(templates_dir, name))]
+    if os.path.isfile(os.path.join(root, INDEX_FILE)):
+        extras.append(INDEX_FILE)
+    for rel_path in extras:
+        path = os.path.join(root, rel_path)
+        entries.append({'path': rel_path, 'install_to': None, 'source': rel_path,
+                        'sha256': file_hash(path), 'size': os.path.getsize(path)})
+    return entries
+
+
+def pack(root, output=None, version=None):
+    """Write the library at root into a versioned .tar.gz bundle; returns (output, manifest).
+
+    output defaults to prompt-library-<version>.tar.gz in the current directory.
+    """
+    entries = _bundle_entries(root, LibrarySnapshot(root))
+    if version is None:
+        # Content-derived: the same library always packs to the same version.
+        digest = hashlib.sha256(json.dumps([(e['path'], e['sha256']) for e in entries]).encode('utf-8'))
+        version = digest.hexdigest()[:12]
+    manifest = {'format': BUNDLE_FORMAT, 'version': version, 'files': entries}
+    output = output or f"prompt-library-{version}.tar.gz"
+
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(output) + '-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f, tarfile.open(fileobj=f, mode='w:gz') as tar:
+            data = json.dumps(manifest, indent=2).encode('utf-8')
+            info = tarfile.TarInfo(BUNDLE_MANIFEST)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+            for entry in entries:
+                with open(os.path.join(root, entry['source']), 'rb') as src:
+                    # From the open file, so symlinked sources are stored as regular files with content.
+                    info = tar.gettarinfo(arcname=entry['path'], fileobj=src)
+                    info.uid = info.gid = 0
+                    info.uname = info.gname = ''
+                    tar.addfile(info, src)
+        os.chmod(tmp_path, NEW_FILE_MODE)
+        os.replace(tmp_path, output)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return output, manifest
+
+
+def _safe_destination(path):
+    parts = path.split('/')
+    if os.path.isabs(path) or '..' in parts or '' in parts:
+        raise ValueError(f"refusing to install outside the target: {path!r}")
+    return path
+
+
+def _extract_member(tar, member, path, sha256):
+    """Stream one member to path, raising ValueError if its hash does not match."""
+    digest = hashlib.sha256()
+    with open(path, 'wb') as out:
+        src = tar.extractfile(member)
+        for chunk in iter(lambda: src.read(1024 * 1024), b''):
+            digest.update(chunk)
+            out.write(chunk)
+    if digest.hexdigest() != sha256:
+        raise ValueError(f"hash mismatch for {member.name} in bundle")
+    os.chmod(path, NEW_FILE_MODE)
+
+
+def install(bundle, target, dry_run=False, verbose=False, log=print):
+    """Install a bundle made by pack into target; returns counts and the bundle version.
+
+    The archive is read once, sequentially. Changed files are staged in a
+    temporary directory inside target and only moved into place once the whole
+    bundle has been read and verified, so a corrupt or truncated bundle leaves
+    the target untouched. Files whose hash already matches are left alone and
+    files installed by an earlier version but no longer in the bundle are removed.
+    """
+    previous = load_target_manifest(target)
+    files = {}
+    staged = []
+    counts = {'installed': 0, 'unchanged': 0, 'removed': 0}
+    staging = None
+    if not dry_run:
+        os.makedirs(target, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=target, prefix='.prompt-install-')
+    try:
+        manifest = _stage_bundle(bundle, target, previous, files, staged, staging, counts, dry_run, log)
+        installed = {e['install_to'] for e in manifest['files'] if e['install_to']}
+        if not dry_run and set(files) != installed:
+            raise ValueError(f"{bundle} is truncated: {len(installed) - len(files)} file(s) missing")
+        for tmp_path, destination in staged:
+            dst = os.path.join(target, destination)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(tmp_path, dst)
+            files[destination]['mtime_ns'], files[destination]['size'] = _stat_key(dst)
+            if verbose:
+                log(f"Installed {dst}")
+    finally:
+        if staging:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    counts['removed'] = _remove_stale(target, previous, installed, dry_run, verbose, log)
+    if not dry_run:
+        _write_target_manifest(target, files, previous)
+    counts['version'] = manifest['version']
+    return counts
+
+
+def _stage_bundle(bundle, target, previous, files, staged, staging, counts, dry_run, log):
+    """Read a bundle, staging changed files under staging; returns the bundle manifest."""
+    with tarfile.open(bundle, mode='r|*') as tar:
+        first = tar.next()
+        if first is None or first.name != BUNDLE_MANIFEST:
+            raise ValueError(f"{bundle} is not a prompt library bundle")
+        manifest = json.load(tar.extractfile(first))
+        if manifest.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"unsupported bundle format: {manifest.get('format')}")
+        wanted = {e['path']: e for e in manifest['files'] if e['install_to']}
+
+        for member in tar:
+            entry = wanted.get(member.name)
+            if entry is None or not member.isfile():
+                continue
+            destination = _safe_destination(entry['install_to'])
+            dst = os.path.join(target, destination)
+            dst_key = _stat_key(dst)
+            recorded = previous.get(destination)
+
+            if (recorded and recorded['sha256'] == entry['sha256'] and dst_key is not None
+                    and [recorded['mtime_ns'], recorded['size']] == list(dst_key)) or (
+                    dst_key is not None and dst_key[1] == entry['size'] and file_hash(dst) == entry['sha256']):
+                counts['unchanged'] += 1
+            else:
+                counts['installed'] += 1
+                if dry_run:
+                    log(f"[DRY RUN] Would install {destination} into {target}")
+                    continue
+                tmp_path = os.path.join(staging, str(len(staged)))
+                _extract_member(tar, member, tmp_path, entry['sha256'])
+                staged.append((tmp_path, destination))
+                dst_key = (None, None)  # filled in once the file is moved into place
+            files[destination] = {
+                'source': entry['source'], 'sha256': entry['sha256'],
+                'source_mtime_ns': None, 'source_size': entry['size'],
+                'mtime_ns': dst_key[0], 'size': dst_key[1],
+            }
+    return manifest
+
+
+def _config_targets(config_path):
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    return [repo_config['path'] for repo_config in config['repositories']]
+
+
+def sync_command(args):
+    targets = list(args.targets)
+    if args.config:
+        targets += _config_targets(args.config)
+    if not targets:
+        raise SystemExit("Error: give at least one target or --config")
+    jobs = args.jobs or os.cpu_count() or 1
+    prefix = "[DRY RUN] " if args.dry_run else ""
+
+    results = []
+    for result in sync_many(args.root, targets, args.link, args.dry_run, args.verbose, jobs):
+        for line in result['output']:
+            print(line)
+        if result['error']:
+            print(f"Error syncing {args.root} to {result['target']}: {result['error']}")
+        else:
+            print(f"{prefix}Synced {args.root} to {result['target']}: "
+                  f"{result['copied']} copied, {result['unchanged']} unchanged, {result['removed']} removed")
+        results.append(result)
+
+    failed = [r for r in results if r['error']]
+    if len(results) > 1:
+        print(f"\n{prefix}Summary: {len(results)} targets, {len(failed)} failed, "
+              f"{sum(r['copied'] for r in results)} copied, {sum(r['unchanged'] for r in results)} unchanged, "
+              f"{sum(r['removed'] for r in results)} removed")
+        for r in failed:
+            print(f"  FAILED {r['target']}: {r['error']}")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump([{k: v for k, v in r.items() if k != 'output'} for r in results], f, indent=2)
+    if failed:
+        raise SystemExit(1)
+
+
+def pack_command(args):
+    output, manifest = pack(args.root, args.output, args.version)
+    print(f"Packed {len(manifest['files'])} files into {output} (version {manifest['version']})")
+
+
+def install_command(args):
+    try:
+        counts = install(args.bundle, args.target, args.dry_run, args.verbose)
+    except (OSError, ValueError, tarfile.TarError) as e:
+        print(f"Error installing {args.bundle} into {args.target}: {e}")
+        raise SystemExit(1)
+    prefix = "[DRY RUN] " if args.dry_run else ""
+    print(f"{prefix}Installed version {counts['version']} into {args.target}: "
+          f"{counts['installed']} installed, {counts['unchanged']} unchanged, {counts['removed']} removed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distribute the prompt library into target repositories.")
+    parser.add_argument("--root", default=REPO_ROOT, help="Root directory of the prompt library.")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    sync_parser = subparsers.add_parser("sync", help="Incrementally copy prompts, rules and .vscode into target repositories.")
+    sync_parser.add_argument("targets", nargs="*", help="Paths to the target repositories.")
+    sync_parser.add_argument("--config", help="Also sync every repository listed in this symlink_config.json.")
+    sync_parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of targets to sync concurrently (0 = one per CPU).")
+    sync_parser.add_argument("--report", metavar="FILE", help="Write per-target results as JSON to FILE.")
+    sync_parser.add_argument("--link", choices=LINK_MODES, default="copy",
+                             help="How to place files: copy, or hardlink/reflink to share storage with the library.")
+    sync_parser.add_argument("--dry-run", "-n", action="store_true", help="Preview changes without writing anything.")
+    sync_parser.add_argument("--verbose", "-v", action="store_true", help="Show detailed output.")
+    sync_parser.set_defaults(func=sync_command)
+
+    pack_parser = subparsers.add_parser("pack", help="Pack the library into a versioned bundle for offline installs.")
+    pack_parser.add_argument("--output", "-o", help="Bundle path (default: prompt-library-<version>.tar.gz).")
+    pack_parser.add_argument("--version", help="Bundle version (default: derived from the content hashes).")
+    pack_parser.set_defaults(func=pack_command)
+
+    install_parser = subparsers.add_parser("install", help="Install a bundle into a target repository.")
+    install_parser.add_argument("bundle", help="Path to a bundle created by pack.")
+    install_parser.add_argument("target", help="Path to the target repository.")
+    install_parser.add_argument("--dry-run", "-n", action="store_true", help="Preview changes without writing anything.")
+    install_parser.add_argument("--verbose", "-v", action="store_true", help="Show detailed output.")
+    install_parser.set_defaults(func=install_command)
+
+    args = parser.parse_args()
+    if hasattr(args, 'func'):
+        args.func(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Shared YAML frontmatter parser for prompt and rule files.
+
+Files are read line by line and only up to the closing '---' (plus the first
+'#' heading when a 'name' fallback is needed), so large prompt bodies are never
+loaded just to list metadata. Flat `key: value` frontmatter is parsed without
+PyYAML; anything else goes through libyaml's CSafeLoader when it is available.
+"""
+import re
+
+import yaml
+
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+HEADING_RE = re.compile(r'^# ?(.+)')
+FLAT_LINE_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_-]*):(?:[ \t]+(.*?))?[ \t]*$')
+PLAIN_SCALAR_RE = re.compile(r'^[A-Za-z][A-Za-z0-9 _./()-]*$')
+FLAT_BOOLS = {'true': True, 'True': True, 'false': False, 'False': False}
+# Plain words PyYAML resolves to something other than a string.
+YAML_SPECIAL_WORDS = {'yes', 'no', 'on', 'off', 'true', 'false', 'null'}
+
+
+def _flat_value(value):
+    """Convert a flat scalar the way PyYAML would, or raise ValueError."""
+    if value in FLAT_BOOLS:
+        return FLAT_BOOLS[value]
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        inner = value[1:-1]
+        if '"' not in inner and '\\' not in inner:
+            return inner
+    elif len(value) >= 2 and value[0] == value[-1] == "'":
+        inner = value[1:-1]
+        if "'" not in inner:
+            return inner
+    elif PLAIN_SCALAR_RE.match(value) and value.lower() not in YAML_SPECIAL_WORDS:
+        return value
+    raise ValueError(value)
+
+
+def parse_flat(text):
+    """Parse frontmatter made only of single-line `key: scalar` pairs.
+
+    Returns None when the text uses anything beyond that subset, in which case
+    the caller must fall back to a full YAML parse.
+    """
+    result = {}
+    for line in text.split('\n'):
+        if not line.strip() or line.startswith('#'):
+            continue
+        m = FLAT_LINE_RE.match(line)
+        if not m or not m.group(2) or m.group(1).lower() in YAML_SPECIAL_WORDS:
+            return None
+        try:
+            result[m.group(1)] = _flat_value(m.group(2))
+        except ValueError:
+            return None
+    return result
+
+
+def load_yaml(text):
+    """Load frontmatter text, using the flat fast path when possible."""
+    flat = parse_flat(text)
+    if flat is not None:
+        return flat or None
+    return yaml.load(text, Loader=YAML_LOADER)
+
+
+def find_frontmatter_end(lines):
+    """Return the index of the closing '---' in lines, or None if absent."""
+    if not lines or lines[0].strip() != '---':
+        return None
+    for i, line in enumerate(lines[1:], 1):
+        if line.strip() == '---':
+            return i
+    return None
+
+
+def _decode(raw):
+    return raw.decode('utf-8', errors='ignore').replace('\r\n', '\n')
+
+
+def _heading(line):
+    m = HEADING_RE.match(line)
+    return m.group(1).strip() if m else None
+
+
+def read_frontmatter(filepath, title_fallback=True):
+    """Read the frontmatter of a markdown file without loading its body.
+
+    Returns a record dict with:
+      frontmatter  parsed mapping ({} if absent or not a mapping)
+      title        first '#' heading seen; the body is only searched for one
+                   when title_fallback is set and 'name' is missing
+      error        YAML error message, or None
+      body_offset  byte offset of the content after the closing '---'
+    """
+    frontmatter = {}
+    error = None
+    body_offset = 0
+
+    with open(filepath, 'rb') as f:
+        first = f.readline()
+        offset = len(first)
+        first_line = _decode(first)
+        title = _heading(first_line)
+
+        if first_line.strip() == '---':
+            fm_lines = []
+            for raw in f:
+                offset += len(raw)
+                line = _decode(raw)
+                if line.strip() == '---':
+                    break
+                if title is None:
+                    title = _heading(line)
+                fm_lines.append(line)
+            body_offset = offset
+            try:
+                meta = load_yaml(''.join(fm_lines))
+                if isinstance(meta, dict):
+                    frontmatter = meta
+            except Exception as e:
+                error = str(e)
+
+        if title is None and title_fallback and not frontmatter.get('name'):
+            for raw in f:
+                title = _heading(_decode(raw))
+                if title is not None:
+                    break
+
+    return {'frontmatter': frontmatter, 'title': title, 'error': error, 'body_offset': body_offset}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Character-trigram index for typo-tolerant `prompt_cli search --fuzzy`.
+
+Words from each prompt's id, name, title, tags and file name are broken into
+padded trigrams and stored in .prompt_cache/trigram_index.json. A query word
+only visits vocabulary words sharing at least one trigram with it, so lookups
+stay sub-linear in library size. Like the BM25 index, documents are re-indexed
+only when their content hash changes.
+"""
+import json
+import os
+import re
+from collections import Counter
+
+from metadata_cache import CACHE_DIR, write_atomic
+
+INDEX_FILE = "trigram_index.json"
+INDEX_VERSION = 1
+
+FUZZY_FIELDS = ('id', 'name', 'title', 'tags')
+# Minimum Dice similarity between a query word and an indexed word.
+MIN_SIMILARITY = 0.4
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def trigrams(word):
+    """Return the set of trigrams of word padded with '$' at both ends."""
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _words(text):
+    return WORD_RE.findall(text.lower())
+
+
+def _entry_words(entry):
+    words = set()
+    for field in FUZZY_FIELDS:
+        value = entry['frontmatter'].get(field)
+        values = value if isinstance(value, list) else [value]
+        for v in values:
+            if isinstance(v, str):
+                words.update(_words(v))
+    stem = os.path.basename(entry['path']).split('.')[0]
+    words.update(_words(stem))
+    return words
+
+
+class TrigramIndex:
+    """Trigram index over the identifying words of library entries."""
+
+    def __init__(self, root, persist=True):
+        self.root = root
+        self.persist = persist
+        self.path = os.path.join(root, CACHE_DIR, INDEX_FILE)
+        self.docs = {}
+        self.words = {}
+        self.trigrams = {}
+        self.dirty = False
+        if persist:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+            self.docs = data['docs']
+            self.words = {word: set(paths) for word, paths in data['words'].items()}
+            self.trigrams = {tri: set(words) for tri, words in data['trigrams'].items()}
+
+    def _remove(self, path):
+        doc = self.docs.pop(path, None)
+        if doc is None:
+            return
+        for word in doc['words']:
+            paths = self.words.get(word)
+            if paths is None:
+                continue
+            paths.discard(path)
+            if not paths:
+                del self.words[word]
+                for tri in trigrams(word):
+                    vocabulary = self.trigrams.get(tri)
+                    if vocabulary is not None:
+                        vocabulary.discard(word)
+                        if not vocabulary:
+                            del self.trigrams[tri]
+        self.dirty = True
+
+    def _add(self, entry):
+        path = entry['path']
+        words = _entry_words(entry)
+        self.docs[path] = {'sha256': entry['sha256'], 'words': sorted(words)}
+        for word in words:
+            if word not in self.words:
+                self.words[word] = set()
+                for tri in trigrams(word):
+                    self.trigrams.setdefault(tri, set()).add(word)
+            self.words[word].add(path)
+        self.dirty = True
+
+    def update(self, entries):
+        """Index new or changed entries and drop ones no longer in the library."""
+        live = set()
+        for entry in entries:
+            path = entry['path']
+            live.add(path)
+            doc = self.docs.get(path)
+            if doc and entry['sha256'] is not None and doc['sha256'] == entry['sha256']:
+                continue
+            self._remove(path)
+            self._add(entry)
+        for path in set(self.docs) - live:
+            self._remove(path)
+
+    def similar_words(self, word):
+        """Return {indexed_word: dice_similarity} for words close to word."""
+        query_trigrams = trigrams(word)
+        shared = Counter()
+        for tri in query_trigrams:
+            for candidate in self.trigrams.get(tri, ()):
+                shared[candidate] += 1
+        matches = {}
+        for candidate, count in shared.items():
+            similarity = 2 * count / (len(query_trigrams) + len(trigrams(candidate)))
+            if similarity >= MIN_SIMILARITY:
+                matches[candidate] = similarity
+        return matches
+
+    def search(self, query, limit=None):
+        """Return [(path, score)] ranked by summed best word similarity per query word."""
+        scores = Counter()
+        for word in set(_words(query)):
+            best = {}
+            for candidate, similarity in self.similar_words(word).items():
+                for path in self.words[candidate]:
+                    if similarity > best.get(path, 0):
+                        best[path] = similarity
+            scores.update(best)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def save(self):
+        """Atomically persist the index if it changed."""
+        if not self.persist or not self.dirty:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'docs': self.docs,
+            'words': {word: sorted(paths) for word, paths in self.words.items()},
+            'trigrams': {tri: sorted(words) for tri, words in self.trigrams.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_atomic(self.path, json.dumps(data, separators=(',', ':')))
+        except OSError as e:
+            print(f"Warning: could not write trigram index {self.path}: {e}")
+            return
+        self.dirty = False
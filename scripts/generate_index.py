@@ -8,97 +8,213 @@ Outputs to PROMPT_RULE_INDEX.md in the repo root.
 Script to generate an index of all prompts and rules in the repository.
 Outputs to PROMPT_RULE_INDEX.md in the repo root.
 """
+import argparse
+import hashlib
+import json
 import os
-import re
-import yaml
 from collections import defaultdict
 
+from frontmatter_parser import read_frontmatter
+from library_manifest import build_id_map, build_manifest, walk_library, write_id_map, write_manifest
+from metadata_cache import CACHE_DIR, MetadataCache, write_atomic
+
 INDEX_FILE = "PROMPT_RULE_INDEX.md"
+SECTIONS_FILE = "index_sections.json"
+SECTIONS_VERSION = 1
 ROOT = os.path.dirname(os.path.abspath(__file__))
 REPO = os.path.abspath(os.path.join(ROOT, ".."))
 
-def extract_metadata(filepath):
-    """Extract all metadata from YAML frontmatter if present."""
-    with open(filepath, encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-    
-    metadata = {}
-    if lines and lines[0].strip() == '---':
-        fm_lines = []
-        for line in lines[1:]:
-            if line.strip() == '---':
-                break
-            fm_lines.append(line)
-        try:
-            meta = yaml.safe_load(''.join(fm_lines))
-            if isinstance(meta, dict):
-                metadata = meta
-        except Exception as e:
-            print(f"Error parsing YAML in {filepath}: {e}")
-    
+def _metadata_from_record(filepath, record):
+    """Build index metadata from a parsed record, falling back to the first heading for 'name'."""
+    if record['error']:
+        print(f"Error parsing YAML in {filepath}: {record['error']}")
+    metadata = dict(record['frontmatter'])
+
     # Fallback for title if 'name' is not in frontmatter
     if 'name' not in metadata or not metadata['name']:
-        for line in lines:
-            m = re.match(r'^# ?(.+)', line)
-            if m:
-                metadata['name'] = m.group(1).strip()
-                break
-    
+        if record['title']:
+            metadata['name'] = record['title']
+
     return metadata
 
-all_prompts = defaultdict(list)
-
-for subdir, _, files in os.walk(REPO):
-    for file in files:
-        if file.endswith(('.md', '.mdc')) and not file.startswith(INDEX_FILE.split('.')[0]):
-            filepath = os.path.join(subdir, file)
-            rel_path = os.path.relpath(filepath, REPO)
-            metadata = extract_metadata(filepath)
-            
-            if not metadata.get('name'):
-                continue # Skip files without a name
-
-            # Determine category based on directory structure
-            category = os.path.basename(os.path.dirname(rel_path))
-            if category == '.github':
-                category = '.github/prompts'
-            elif category == '.rules':
-                category = '.rules'
-            elif category == 'prompt-library': # Root level files
-                category = 'root'
-            
-            all_prompts[category].append({
-                'name': metadata.get('name', os.path.basename(file)),
-                'id': metadata.get('id', ''),
-                'description': metadata.get('description', 'No description provided.'),
-                'version': metadata.get('version', 'N/A'),
-                'tags': ', '.join(metadata.get('tags', [])),
-                'tool_compatibility': ', '.join(metadata.get('tool_compatibility', [])),
-                'path': rel_path
-            })
-
-index_content = ["# Prompt & Rule Index\n", "This document is automatically generated. Do not edit manually.\n"]
-
-# Sort categories for consistent output
-sorted_categories = sorted(all_prompts.keys())
-
-for category in sorted_categories:
+def extract_metadata(filepath):
+    """Extract all metadata from YAML frontmatter if present."""
+    return _metadata_from_record(filepath, read_frontmatter(filepath))
+
+def collect_prompts(repo, cache, jobs=1, executor='process', filepaths=None):
+    """Parse indexable files (on a worker pool when jobs > 1) and group them by category."""
+    if filepaths is None:
+        filepaths, _ = walk_library(repo)
+    all_prompts = defaultdict(list)
+    records = cache.get_many(filepaths, jobs, executor)
+
+    for filepath, record in zip(filepaths, records):
+        file = os.path.basename(filepath)
+        rel_path = os.path.relpath(filepath, repo)
+        metadata = _metadata_from_record(filepath, record)
+
+        if not metadata.get('name'):
+            continue # Skip files without a name
+
+        # Determine category based on directory structure
+        category = os.path.basename(os.path.dirname(rel_path))
+        if category == '.github':
+            category = '.github/prompts'
+        elif category == '.rules':
+            category = '.rules'
+        elif category == 'prompt-library': # Root level files
+            category = 'root'
+
+        all_prompts[category].append({
+            'name': metadata.get('name', os.path.basename(file)),
+            'id': metadata.get('id', ''),
+            'description': metadata.get('description', 'No description provided.'),
+            'version': metadata.get('version', 'N/A'),
+            'tags': ', '.join(metadata.get('tags', [])),
+            'tool_compatibility': ', '.join(metadata.get('tool_compatibility', [])),
+            'path': rel_path
+        })
+
+    cache.prune(os.path.relpath(filepath, repo) for filepath in filepaths)
+    return all_prompts
+
+def render_category(category, prompts):
+    """Render one category heading and table as a list of index lines."""
     if category == 'root':
-        index_content.append(f"## Root Level Prompts\n")
+        lines = [f"## Root Level Prompts\n"]
     else:
-        index_content.append(f"## {category.replace('_', ' ').title()} Prompts\n")
-    
-    index_content.append("| Name | ID | Description | Version | Tags | Tools | Path |")
-    index_content.append("|---|---|---|---|---|---|---|")
+        lines = [f"## {category.replace('_', ' ').title()} Prompts\n"]
+
+    lines.append("| Name | ID | Description | Version | Tags | Tools | Path |")
+    lines.append("|---|---|---|---|---|---|---|")
 
     # Sort prompts within each category by name
-    sorted_prompts = sorted(all_prompts[category], key=lambda x: x['name'].lower())
+    sorted_prompts = sorted(prompts, key=lambda x: x['name'].lower())
 
     for prompt in sorted_prompts:
-        index_content.append(f"| [{prompt['name']}]({prompt['path']}) | {prompt['id']} | {prompt['description']} | {prompt['version']} | {prompt['tags']} | {prompt['tool_compatibility']} | `{prompt['path']}` |")
-    index_content.append("\n") # Add a newline for spacing between categories
+        lines.append(f"| [{prompt['name']}]({prompt['path']}) | {prompt['id']} | {prompt['description']} | {prompt['version']} | {prompt['tags']} | {prompt['tool_compatibility']} | `{prompt['path']}` |")
+    lines.append("\n") # Add a newline for spacing between categories
+    return lines
+
+def render_index(all_prompts, sections=None):
+    """Render the grouped prompts as the PROMPT_RULE_INDEX.md document.
+
+    When a SectionCache is given, categories whose member files are unchanged
+    reuse their previously rendered lines.
+    """
+    index_content = ["# Prompt & Rule Index\n", "This document is automatically generated. Do not edit manually.\n"]
 
-with open(os.path.join(REPO, INDEX_FILE), 'w', encoding='utf-8') as out:
-    out.write('\n'.join(index_content))
+    # Sort categories for consistent output
+    sorted_categories = sorted(all_prompts.keys())
+
+    for category in sorted_categories:
+        if sections is None:
+            index_content.extend(render_category(category, all_prompts[category]))
+        else:
+            index_content.extend(sections.render(category, all_prompts[category]))
+
+    return '\n'.join(index_content)
+
+class SectionCache:
+    """Rendered category sections keyed by a fingerprint of their member files."""
+
+    def __init__(self, root, cache):
+        self.path = os.path.join(root, CACHE_DIR, SECTIONS_FILE)
+        self.root = root
+        self.cache = cache
+        self.sections = {}
+        self.rendered = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SECTIONS_VERSION:
+                self.sections = data.get('sections', {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _fingerprint(self, prompts):
+        digest = hashlib.sha256()
+        for path in sorted(prompt['path'] for prompt in prompts):
+            content_hash = self.cache.content_hash(os.path.join(self.root, path))
+            if content_hash is None:
+                return None
+            digest.update(f"{path}\0{content_hash}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def render(self, category, prompts):
+        """Return the section lines for category, re-rendering only if its members changed."""
+        fingerprint = self._fingerprint(prompts)
+        cached = self.sections.get(category)
+        if fingerprint is not None and cached and cached['fingerprint'] == fingerprint:
+            return cached['lines']
+
+        lines = render_category(category, prompts)
+        self.rendered.append(category)
+        if fingerprint is not None:
+            self.sections[category] = {'fingerprint': fingerprint, 'lines': lines}
+        return lines
+
+    def save(self, categories):
+        """Persist sections for the given categories, dropping any others."""
+        stale = set(self.sections) - set(categories)
+        if not self.rendered and not stale:
+            return
+        for category in stale:
+            del self.sections[category]
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_atomic(self.path, json.dumps({'version': SECTIONS_VERSION, 'sections': self.sections}, separators=(',', ':')))
+        except OSError as e:
+            print(f"Warning: could not write index section cache {self.path}: {e}")
+
+def write_index(path, content):
+    """Write the index unless the file already has exactly this content.
+
+    Returns True if the file was written. Skipping identical writes keeps the
+    file's mtime stable so downstream builds are not needlessly invalidated.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    write_atomic(path, content)
+    return True
+
+def build_index(root, use_cache=True, jobs=1, executor='process'):
+    """Regenerate the index for root in-process; returns True if it was rewritten."""
+    cache = MetadataCache(root, enabled=use_cache)
+    filepaths, watched = walk_library(root)
+    all_prompts = collect_prompts(root, cache, jobs, executor, filepaths)
+
+    sections = SectionCache(root, cache) if use_cache else None
+    content = render_index(all_prompts, sections)
+    changed = write_index(os.path.join(root, INDEX_FILE), content)
+
+    cache.save()
+    if sections is not None:
+        sections.save(all_prompts.keys())
+        # Built last so the recorded directory mtimes include the index write above.
+        manifest = build_manifest(root, filepaths, watched, cache)
+        write_manifest(root, manifest)
+        write_id_map(root, build_id_map(manifest['prompts']), manifest)
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate PROMPT_RULE_INDEX.md for the prompt library.")
+    parser.add_argument("--root", default=REPO, help="Root directory of the prompt library.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every file and do not read or write the metadata cache.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of parallel parse workers (0 = one per CPU).")
+    parser.add_argument("--executor", choices=["process", "thread"], default="process",
+                        help="Worker pool type for --jobs; 'thread' suits I/O-bound network filesystems.")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if build_index(args.root, not args.no_cache, jobs, args.executor):
+        print(f"Index written to {INDEX_FILE}")
+    else:
+        print(f"Index unchanged: {INDEX_FILE}")
 
-print(f"Index written to {INDEX_FILE}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Merge the .gitignore templates into a target repository's .gitignore.
+
+The result is the generated header, the base, security and technology
+templates, and then any custom entries from the existing file. Content that a
+previous merge generated is recognised and regenerated rather than appended
+again, so repeated merges converge instead of nesting the old file inside the
+new one. Duplicate patterns (compared after gitignore normalisation) are
+dropped in a way that keeps git's last-match-wins result for every path,
+negations are kept in order, and the file is only written when its content
+changes.
+
+Usage:
+    python3 gitignore_merge.py /path/to/repo/.gitignore --type python
+    python3 gitignore_merge.py /path/to/repo/.gitignore --type nodejs --type terraform --dry-run
+"""
+
+import argparse
+import os
+import sys
+
+from gitignore_rules import parse_line
+from metadata_cache import write_atomic
+
+DEFAULT_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates', 'gitignore')
+BASE_TEMPLATES = ('base', 'security')
+
+HEADER = """\
+# This .gitignore file was generated/updated by the prompt-library distribution system
+# Source: https://github.com/yourusername/prompt-library
+#
+# It combines:
+#   - Base patterns (OS, IDE, logs, environment)
+#   - Security patterns (credentials, secrets, keys)
+#   - Technology-specific patterns (based on project type)
+#
+# You can customize this file, but be aware that patterns may be regenerated
+# if you run the distribution script again.
+#
+# To prevent specific files from being ignored, use negation patterns:
+#   !file-to-include.txt
+"""
+HEADER_LINES = HEADER.splitlines()
+BANNER_RULE = "####################"
+BANNER_TITLE = "# Custom Entries (from existing .gitignore)"
+BANNER = [BANNER_RULE, BANNER_TITLE, BANNER_RULE]
+
+
+def load_templates(templates_dir, project_types=()):
+    """Return [(name, lines)] for the base, security and project type templates that exist."""
+    templates = []
+    for name in dict.fromkeys(BASE_TEMPLATES + tuple(project_types)):
+        path = os.path.join(templates_dir, f"{name}.gitignore")
+        if name == 'unknown' or not os.path.isfile(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            templates.append((name, f.read().splitlines()))
+    return templates
+
+
+def custom_entries(existing_lines, template_rules):
+    """Return the lines of an existing .gitignore that the templates do not regenerate.
+
+    In a file written by an earlier merge, everything before the last Custom
+    Entries banner was generated: only patterns that no template provides are
+    kept from it (e.g. edits made in place). Everything after the banner, or the
+    whole file if it was never merged, is the user's own content.
+    """
+    if HEADER_LINES[0] not in existing_lines:
+        return list(existing_lines)
+    banner_at = max((i for i, line in enumerate(existing_lines) if line.rstrip() == BANNER_TITLE), default=None)
+    if banner_at is None:
+        generated, custom = existing_lines, []
+    else:
+        generated, custom = existing_lines[:banner_at], existing_lines[banner_at + 1:]
+        if custom and custom[0].rstrip() == BANNER_RULE:
+            custom = custom[1:]
+    kept = [line for line in generated if parse_line(line) and parse_line(line) not in template_rules]
+    return kept + [line for line in custom if line.rstrip() not in (BANNER_RULE, BANNER_TITLE)]
+
+
+def dedupe(lines):
+    """Return lines with repeated patterns removed, leaving comments and blanks alone.
+
+    A later copy of a pattern is dropped when no pattern of the opposite
+    polarity (ignore vs. '!' negation) was kept since the first copy, as it
+    cannot change any outcome. Otherwise the earlier copy is dropped instead:
+    the later one decides every path it matches under last-match-wins.
+    """
+    kept = list(lines)
+    first_seen = {}
+    emitted = {True: 0, False: 0}
+    for i, line in enumerate(lines):
+        rule = parse_line(line)
+        if rule is None:
+            continue
+        negate = rule[1]
+        if rule in first_seen:
+            j, opposite = first_seen[rule]
+            if emitted[not negate] == opposite:
+                kept[i] = None
+                continue
+            kept[j] = None
+        first_seen[rule] = (i, emitted[not negate])
+        emitted[negate] += 1
+    return kept
+
+
+def _tidy(lines):
+    """Collapse runs of blank lines and strip leading and trailing blanks."""
+    tidy = []
+    for line in lines:
+        if line.strip() or (tidy and tidy[-1].strip()):
+            tidy.append(line)
+    while tidy and not tidy[-1].strip():
+        tidy.pop()
+    return tidy
+
+
+def merge(templates, existing_text=''):
+    """Return (merged_text, duplicates_removed) for templates merged with an existing .gitignore."""
+    template_rules = {parse_line(line) for _, lines in templates for line in lines} - {None}
+    existing_lines = existing_text.splitlines()
+    custom = [line.rstrip() for line in custom_entries(existing_lines, template_rules)]
+
+    sections = [[line.rstrip() for line in lines] for _, lines in templates] + [custom]
+    flat = [line for section in sections for line in section]
+    kept = dedupe(flat)
+    removed = sum(1 for line, keep in zip(flat, kept) if keep is None and parse_line(line))
+
+    out = HEADER_LINES + ['']
+    offset = 0
+    for index, section in enumerate(sections):
+        section_kept = [line for line in kept[offset:offset + len(section)] if line is not None]
+        offset += len(section)
+        if index < len(templates):
+            out += section_kept + ['']
+        else:
+            section_kept = _tidy(section_kept)
+            if section_kept:
+                out += BANNER + section_kept
+    return '\n'.join(_tidy(out)) + '\n', removed
+
+
+def merge_file(gitignore_path, project_types=(), templates_dir=DEFAULT_TEMPLATES_DIR, dry_run=False):
+    """Merge the templates into gitignore_path; returns (changed, duplicates_removed, merged_text)."""
+    try:
+        with open(gitignore_path, 'r', encoding='utf-8', errors='replace') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        existing = None
+    merged, removed = merge(load_templates(templates_dir, project_types), existing or '')
+    changed = merged != existing
+    if changed and not dry_run:
+        write_atomic(gitignore_path, merged)
+    return changed, removed, merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge .gitignore templates into a repository's .gitignore.")
+    parser.add_argument("gitignore", help="Path to the target .gitignore (created if missing).")
+    parser.add_argument("--type", dest="types", action="append", default=[],
+                        help="Project type template to include (repeatable); base and security are always included.")
+    parser.add_argument("--templates", default=DEFAULT_TEMPLATES_DIR, help="Directory holding the <type>.gitignore templates.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+    parser.add_argument("--verbose", action="store_true", help="Show the templates used and a preview of the result.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.templates):
+        print(f"Warning: .gitignore templates directory not found at {args.templates}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.verbose:
+        for name, _ in load_templates(args.templates, args.types):
+            print(f"  - Adding {name} patterns")
+
+    changed, removed, merged = merge_file(args.gitignore, args.types, args.templates, args.dry_run)
+    if args.verbose and removed:
+        print(f"  - Dropped {removed} duplicate patterns")
+    if not changed:
+        print(f"{args.gitignore} is already up to date")
+    elif args.dry_run:
+        print(f"[DRY RUN] Would update {args.gitignore} with merged templates")
+        if args.verbose:
+            print("Merged content preview (first 20 lines):")
+            print('\n'.join(merged.splitlines()[:20]))
+    else:
+        print(f"Updated {args.gitignore} with merged templates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compiled .gitignore matching with git's semantics.
+
+Patterns support negation ('!'), anchoring ('/'), directory-only rules (trailing
+'/'), '*', '?', character classes and '**'. All rules of a file are compiled
+into a single regular expression whose alternatives are ordered last rule
+first, so one match call finds the rule that wins under git's last-match-wins
+precedence.
+"""
+import re
+
+
+def _translate_class(pattern, i):
+    """Translate a '[...]' class starting at pattern[i]; returns (regex, next_index) or None."""
+    j = i + 1
+    if j < len(pattern) and pattern[j] in '!^':
+        j += 1
+    if j < len(pattern) and pattern[j] == ']':
+        j += 1
+    while j < len(pattern) and pattern[j] != ']':
+        j += 1
+    if j >= len(pattern):
+        return None
+    body = pattern[i + 1:j]
+    if body[:1] in ('!', '^'):
+        body = '^' + body[1:]
+    return '[' + body.replace('\\', '\\\\') + ']', j + 1
+
+
+def translate(pattern):
+    """Translate one gitignore glob (without '!' or trailing '/') to a regex body."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        at_segment_start = i == 0 or pattern[i - 1] == '/'
+        if at_segment_start and pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif at_segment_start and pattern.startswith('**', i) and i + 2 == n:
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and _translate_class(pattern, i):
+            regex, i = _translate_class(pattern, i)
+            out.append(regex)
+        elif pattern[i] == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+def parse_line(line):
+    """Parse a .gitignore line into (pattern_regex, negate, dir_only), or None."""
+    line = line.rstrip('\n').rstrip('\r')
+    if not line.endswith('\\ '):
+        line = line.rstrip()
+    if not line or line.startswith('#'):
+        return None
+
+    negate = False
+    if line.startswith('!'):
+        negate = True
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    anchored = '/' in line
+    line = line.lstrip('/')
+    prefix = '' if anchored else '(?:.*/)?'
+    return prefix + translate(line), negate, dir_only
+
+
+class GitignoreMatcher:
+    """All rules of one .gitignore file, compiled for last-match-wins lookups."""
+
+    def __init__(self, lines):
+        self.rules = [rule for rule in (parse_line(line) for line in lines) if rule]
+        self._file_regex = self._compile(include_dir_only=False)
+        self._dir_regex = self._compile(include_dir_only=True)
+
+    def _compile(self, include_dir_only):
+        alternatives = []
+        for index in range(len(self.rules) - 1, -1, -1):
+            regex, _, dir_only = self.rules[index]
+            if dir_only and not include_dir_only:
+                continue
+            alternatives.append(f'(?P<r{index}>{regex})')
+        if not alternatives:
+            return None
+        return re.compile('^(?:' + '|'.join(alternatives) + ')$', re.DOTALL)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return cls(f.readlines())
+
+    def match(self, rel_path, is_dir=False):
+        """Return True (ignored), False (re-included by '!') or None (no rule matched).
+
+        rel_path is '/'-separated and relative to the .gitignore's directory.
+        Parent directories are not consulted; see is_ignored for that.
+        """
+        regex = self._dir_regex if is_dir else self._file_regex
+        if regex is None:
+            return None
+        m = regex.match(rel_path)
+        if m is None:
+            return None
+        return not self.rules[int(m.lastgroup[1:])][1]
+
+    def is_ignored(self, rel_path, is_dir=False):
+        """Whether git would ignore rel_path, including via an ignored parent directory."""
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            if self.match('/'.join(parts[:depth]), is_dir=True):
+                return True
+        return bool(self.match(rel_path, is_dir))
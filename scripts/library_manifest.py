@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Compiled library manifest written by generate_index.py and read by prompt_cli.py.
+
+The manifest (.prompt_cache/manifest.json) lists every indexable file with its
+id, name, tags, tool_compatibility, version, path, body byte offset and content
+hash, plus the full frontmatter for linting. It is considered fresh while every
+recorded directory and file still has the same mtime (and size), which costs a stat per entry instead of a read and YAML parse per file.
+
+A separate id map (.prompt_cache/ids.json) lets `prompt_cli show` resolve a
+single id by stat-checking just the one file it points to.
+"""
+import hashlib
+import json
+import os
+
+from metadata_cache import CACHE_DIR, write_atomic
+from walker import walk
+
+INDEX_PREFIX = "PROMPT_RULE_INDEX"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 2
+IDS_FILE = "ids.json"
+ID_ENTRY_FIELDS = ('path', 'body_offset', 'mtime_ns', 'size', 'frontmatter')
+
+
+def manifest_path(root):
+    return os.path.join(root, CACHE_DIR, MANIFEST_FILE)
+
+
+def walk_library(root):
+    """Return (filepaths, watched) for all indexable markdown files under root.
+
+    filepaths are in walk order; watched lists every directory visited, which
+    the manifest records so that added or removed files make it stale.
+
+    .gitignore files are not honoured: repositories that receive the library
+    through copy-prompts.sh ignore .github/prompts/ and .rules/, which are
+    exactly the files to index there.
+    """
+    filepaths = []
+    watched = []
+    for subdir, _, files in walk(root, use_gitignore=False):
+        watched.append(subdir)
+        for file in files:
+            if file.endswith(('.md', '.mdc')) and not file.startswith(INDEX_PREFIX):
+                filepaths.append(os.path.join(subdir, file))
+    return filepaths, watched
+
+
+def build_manifest(root, filepaths, watched, cache):
+    """Build the manifest from cache entries for the given walk results."""
+    prompts = []
+    for filepath in filepaths:
+        entry = cache.entry(filepath)
+        if entry is None:
+            return None
+        record = entry['record']
+        frontmatter = record['frontmatter']
+        prompts.append({
+            'path': os.path.relpath(filepath, root),
+            'id': frontmatter.get('id', ''),
+            'name': frontmatter.get('name') or record['title'] or '',
+            'tags': frontmatter.get('tags', []),
+            'tool_compatibility': frontmatter.get('tool_compatibility', []),
+            'version': frontmatter.get('version', ''),
+            'body_offset': record['body_offset'],
+            'sha256': entry['sha256'],
+            'mtime_ns': entry['mtime_ns'],
+            'size': entry['size'],
+            'frontmatter': frontmatter,
+            'error': record['error'],
+        })
+
+    watched_mtimes = {}
+    for path in watched:
+        watched_mtimes[os.path.relpath(path, root)] = os.stat(path).st_mtime_ns
+
+    return {'version': MANIFEST_VERSION, 'watched': watched_mtimes, 'prompts': prompts}
+
+
+def write_manifest(root, manifest):
+    """Atomically write the manifest; returns False if it could not be written."""
+    path = manifest_path(root)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, json.dumps(manifest, separators=(',', ':')))
+    except OSError as e:
+        print(f"Warning: could not write library manifest {path}: {e}")
+        return False
+    return True
+
+
+def is_fresh(root, manifest):
+    """Check that no recorded directory or file has changed since the build."""
+    try:
+        for rel_path, mtime_ns in manifest['watched'].items():
+            if os.stat(os.path.join(root, rel_path)).st_mtime_ns != mtime_ns:
+                return False
+        for prompt in manifest['prompts']:
+            st = os.stat(os.path.join(root, prompt['path']))
+            if st.st_mtime_ns != prompt['mtime_ns'] or st.st_size != prompt['size']:
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def load_manifest(root):
+    """Return the manifest if it exists and is fresh, otherwise None."""
+    try:
+        with open(manifest_path(root), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest if is_fresh(root, manifest) else None
+
+
+def read_body(root, entry):
+    """Read the body of a library file, skipping its frontmatter."""
+    with open(os.path.join(root, entry['path']), 'rb') as f:
+        f.seek(entry['body_offset'])
+        return f.read().decode('utf-8', errors='ignore')
+
+
+def build_id_map(entries):
+    """Map each string id to its first entry in walk order."""
+    ids = {}
+    for entry in entries:
+        prompt_id = entry['frontmatter'].get('id')
+        if isinstance(prompt_id, str) and prompt_id not in ids:
+            ids[prompt_id] = {field: entry.get(field) for field in ID_ENTRY_FIELDS}
+    return ids
+
+
+def manifest_key(manifest):
+    """Fingerprint of the directory and file states a manifest was built from."""
+    digest = hashlib.sha256()
+    for rel_path, mtime_ns in sorted(manifest['watched'].items()):
+        digest.update(f"{rel_path}\0{mtime_ns}\n".encode('utf-8'))
+    for prompt in manifest['prompts']:
+        digest.update(f"{prompt['path']}\0{prompt['mtime_ns']}\0{prompt['size']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _read_id_map(root):
+    try:
+        with open(os.path.join(root, CACHE_DIR, IDS_FILE), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def write_id_map(root, ids, manifest=None):
+    """Atomically write the id map next to the manifest; returns True if it was rewritten.
+
+    The map is left alone when it already has this content. Given the manifest
+    it was built from, it also records that library state (see id_map_covers).
+    """
+    data = {'version': MANIFEST_VERSION, 'manifest': manifest_key(manifest) if manifest else None, 'ids': ids}
+    if _read_id_map(root) == data:
+        return False
+    path = os.path.join(root, CACHE_DIR, IDS_FILE)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, json.dumps(data, separators=(',', ':')))
+    except OSError as e:
+        print(f"Warning: could not write id map {path}: {e}")
+        return False
+    return True
+
+
+def id_map_covers(root, manifest):
+    """Whether the id map on disk was built from manifest, so an id missing from it does not exist."""
+    data = _read_id_map(root)
+    return data is not None and data.get('manifest') is not None and data['manifest'] == manifest_key(manifest)
+
+
+def load_id_entry(root, prompt_id):
+    """Return the id map entry for prompt_id if its file is unchanged, otherwise None."""
+    data = _read_id_map(root)
+    try:
+        entry = data['ids'].get(prompt_id) if data else None
+        if entry is None:
+            return None
+        st = os.stat(os.path.join(root, entry['path']))
+    except (OSError, KeyError, AttributeError):
+        return None
+    if st.st_mtime_ns != entry['mtime_ns'] or st.st_size != entry['size']:
+        return None
+    return entry
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Rule-registry lint engine for prompt frontmatter.
+
+Rules are declared once with the @rule or @library_rule decorator and can be
+selected or disabled by id. File rules are evaluated independently per prompt,
+optionally on a process pool; library rules see every prompt at once and build
+hash maps in a single pass, so cross-file checks stay linear in library size.
+Results can be rendered as text, JSON or SARIF.
+"""
+import json
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+SEVERITIES = ('ERROR', 'WARNING')
+SARIF_LEVELS = {'ERROR': 'error', 'WARNING': 'warning'}
+
+# copy-prompts.sh flattens these into a single directory per target repo.
+FLATTENED_DIRS = (('.prompt.md', '.github/prompts/'), ('.mdc', '.rules/'))
+
+LINK_RE = re.compile(r'!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+URL_SCHEME_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*:')
+
+RULES = {}
+
+
+def rule(rule_id, name, severity, description):
+    """Register a file rule: a function taking a prompt dict and returning a message or None."""
+    def register(check):
+        RULES[rule_id] = {'id': rule_id, 'name': name, 'severity': severity,
+                          'description': description, 'check': check, 'scope': 'file'}
+        return check
+    return register
+
+
+def library_rule(rule_id, name, severity, description, whole_library=True):
+    """Register a cross-file rule: a function taking (prompts, root, only) and yielding (path, message).
+
+    only is None for a full lint, or the set of paths being linted.
+
+    Rules that need no other prompt's data (whole_library=False) are only run
+    over the prompts being linted, not over the rest of the library.
+    """
+    def register(check):
+        RULES[rule_id] = {'id': rule_id, 'name': name, 'severity': severity, 'description': description,
+                          'check': check, 'scope': 'library', 'whole_library': whole_library}
+        return check
+    return register
+
+
+@rule('PL001', 'missing-id', 'ERROR', "Prompt frontmatter must define an 'id'.")
+def _missing_id(prompt):
+    if not prompt.get('id'):
+        return "Missing 'id' in frontmatter."
+
+
+@rule('PL002', 'missing-name', 'ERROR', "Prompt frontmatter must define a 'name'.")
+def _missing_name(prompt):
+    if not prompt.get('name'):
+        return "Missing 'name' in frontmatter."
+
+
+@rule('PL003', 'missing-description', 'WARNING', "Prompt frontmatter should define a 'description'.")
+def _missing_description(prompt):
+    if not prompt.get('description'):
+        return "Missing 'description' in frontmatter."
+
+
+@rule('PL004', 'missing-version', 'WARNING', "Prompt frontmatter should define a 'version'.")
+def _missing_version(prompt):
+    if not prompt.get('version'):
+        return "Missing 'version' in frontmatter."
+
+
+@rule('PL005', 'tags-not-list', 'ERROR', "'tags' must be a list.")
+def _tags_not_list(prompt):
+    if not isinstance(prompt.get('tags', []), list):
+        return "'tags' should be a list."
+
+
+@rule('PL006', 'tools-not-list', 'ERROR', "'tool_compatibility' must be a list.")
+def _tools_not_list(prompt):
+    if not isinstance(prompt.get('tool_compatibility', []), list):
+        return "'tool_compatibility' should be a list."
+
+
+@library_rule('PL101', 'duplicate-id', 'ERROR', "Prompt ids must be unique across the library.")
+def _duplicate_id(prompts, root, only=None):
+    paths_by_id = defaultdict(list)
+    for prompt in prompts:
+        prompt_id = prompt.get('id')
+        if isinstance(prompt_id, str) and prompt_id:
+            paths_by_id[prompt_id].append(prompt['path'])
+    for prompt_id, paths in paths_by_id.items():
+        if len(paths) < 2:
+            continue
+        for path in paths[1:]:
+            yield path, f"Duplicate id '{prompt_id}' (first defined in {paths[0]})."
+        if only is not None and paths[0] in only:
+            # Linting just the first definition must still report the clash.
+            yield paths[0], f"Duplicate id '{prompt_id}' (also defined in {', '.join(paths[1:])})."
+
+
+def _flattened_destination(path):
+    for suffix, destination in FLATTENED_DIRS:
+        if path.endswith(suffix):
+            return destination + os.path.basename(path)
+    return None
+
+
+@library_rule('PL102', 'basename-collision', 'WARNING',
+              "Files copied into one flat directory by copy-prompts.sh must have distinct names.")
+def _basename_collision(prompts, root, only=None):
+    paths_by_destination = defaultdict(list)
+    for prompt in prompts:
+        destination = _flattened_destination(prompt['path'])
+        if destination:
+            paths_by_destination[destination].append(prompt['path'])
+    for destination, paths in paths_by_destination.items():
+        if len(paths) > 1:
+            for path in paths:
+                others = ', '.join(p for p in paths if p != path)
+                yield path, f"Collides with {others} when copied to {destination}."
+
+
+def _link_targets(text):
+    in_fence = False
+    for line in text.split('\n'):
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        for target in LINK_RE.findall(line):
+            if target.startswith('#') or URL_SCHEME_RE.match(target):
+                continue
+            if '/' not in target and '.' not in target:
+                # Bare words like "(link)" are template placeholders, not paths.
+                continue
+            target = target.split('#', 1)[0].split('?', 1)[0]
+            if target:
+                yield target
+
+
+@library_rule('PL103', 'missing-link-target', 'WARNING', "Relative links must point to files that exist.",
+              whole_library=False)
+def _missing_link_target(prompts, root, only=None):
+    exists = {}
+    for prompt in prompts:
+        try:
+            with open(os.path.join(root, prompt['path']), 'r', encoding='utf-8', errors='ignore') as f:
+                text = f.read()
+        except OSError:
+            continue
+        for target in dict.fromkeys(_link_targets(text)):
+            if target.startswith('/'):
+                resolved = os.path.normpath(os.path.join(root, target.lstrip('/')))
+            else:
+                resolved = os.path.normpath(os.path.join(root, os.path.dirname(prompt['path']), target))
+            if resolved not in exists:
+                exists[resolved] = os.path.exists(resolved)
+            if not exists[resolved]:
+                yield prompt['path'], f"Link target '{target}' does not exist."
+
+
+def select_rules(select=None, disable=None):
+    """Return rule ids to run; select and disable accept ids or names."""
+    def _resolve(keys):
+        wanted = set(keys or ())
+        unknown = wanted - set(RULES) - {r['name'] for r in RULES.values()}
+        if unknown:
+            raise ValueError(f"Unknown lint rule(s): {', '.join(sorted(unknown))}")
+        return {rule_id for rule_id, r in RULES.items() if rule_id in wanted or r['name'] in wanted}
+
+    rule_ids = _resolve(select) if select else set(RULES)
+    return sorted(rule_ids - _resolve(disable))
+
+
+def check_prompt(prompt, rule_ids):
+    """Run the given file rules against one prompt; module-level for process pools."""
+    path = prompt.get('path', 'N/A')
+    issues = []
+    for rule_id in rule_ids:
+        r = RULES[rule_id]
+        if r['scope'] != 'file':
+            continue
+        message = r['check'](prompt)
+        if message:
+            issues.append({'rule': rule_id, 'severity': r['severity'], 'path': path, 'message': message})
+    return issues
+
+
+def run_lint(prompts, rule_ids=None, jobs=1, root='.', library=None, only=None):
+    """Lint prompts and return (issues, errors) where errors counts files with an ERROR.
+
+    Library rules are evaluated over library (prompts by default) so that
+    linting a few files still catches clashes with the rest of the tree; when
+    only is given, library issues are reported just for those paths and rules
+    that read file bodies are run over those paths alone.
+    """
+    if rule_ids is None:
+        rule_ids = sorted(RULES)
+    if jobs > 1 and len(prompts) > 1:
+        chunksize = max(1, len(prompts) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            per_prompt = list(pool.map(check_prompt, prompts, [rule_ids] * len(prompts), chunksize=chunksize))
+    else:
+        per_prompt = [check_prompt(prompt, rule_ids) for prompt in prompts]
+
+    issues_by_path = {}
+    for prompt, prompt_issues in zip(prompts, per_prompt):
+        issues_by_path.setdefault(prompt.get('path', 'N/A'), []).extend(prompt_issues)
+
+    library = prompts if library is None else library
+    linted = library if only is None else [prompt for prompt in library if prompt['path'] in only]
+    for rule_id in rule_ids:
+        r = RULES[rule_id]
+        if r['scope'] != 'library':
+            continue
+        for path, message in r['check'](library if r['whole_library'] else linted, root, only):
+            if only is None or path in only:
+                issues_by_path.setdefault(path, []).append({'rule': rule_id, 'severity': r['severity'], 'path': path, 'message': message})
+
+    issues = [issue for path_issues in issues_by_path.values() for issue in path_issues]
+    errors = sum(1 for path_issues in issues_by_path.values()
+                 if any(issue['severity'] == 'ERROR' for issue in path_issues))
+    return issues, errors
+
+
+def format_text(issues, errors, rule_ids=None):
+    lines = ["\n--- Linting Prompts ---"]
+    for issue in issues:
+        lines.append(f"[{issue['severity']}] {issue['path']}: {issue['message']}")
+    if errors == 0:
+        lines.append("All prompts passed linting with no errors.")
+    else:
+        lines.append(f"Linting completed with {errors} errors.")
+    return '\n'.join(lines)
+
+
+def format_json(issues, errors, rule_ids=None):
+    return json.dumps({'issues': issues, 'errors': errors}, indent=2)
+
+
+def format_sarif(issues, errors, rule_ids=None):
+    rule_ids = sorted(RULES) if rule_ids is None else rule_ids
+    driver_rules = [{
+        'id': rule_id,
+        'name': RULES[rule_id]['name'],
+        'shortDescription': {'text': RULES[rule_id]['description']},
+        'defaultConfiguration': {'level': SARIF_LEVELS[RULES[rule_id]['severity']]},
+    } for rule_id in rule_ids]
+    results = [{
+        'ruleId': issue['rule'],
+        'level': SARIF_LEVELS[issue['severity']],
+        'message': {'text': issue['message']},
+        'locations': [{'physicalLocation': {'artifactLocation': {'uri': issue['path']}}}],
+    } for issue in issues]
+    sarif = {
+        'version': '2.1.0',
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'runs': [{'tool': {'driver': {'name': 'prompt-lint', 'rules': driver_rules}}, 'results': results}],
+    }
+    return json.dumps(sarif, indent=2)
+
+
+FORMATTERS = {'text': format_text, 'json': format_json, 'sarif': format_sarif}
@@ -1,40 +1,56 @@
 import os
 import json
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-def _create_symlink_single(source, link_name, force=False):
+PLAN_OPS = ('create', 'fix', 'remove-orphan', 'no-op')
+
+def _create_symlink_single(source, link_name, force=False, log=print):
     os.makedirs(os.path.dirname(link_name), exist_ok=True)
     if os.path.exists(link_name):
         if os.path.islink(link_name):
             if os.readlink(link_name) == source:
-                print(f"Symlink already exists and is correct: {link_name} -> {source}")
+                log(f"Symlink already exists and is correct: {link_name} -> {source}")
                 return True
             else:
                 if force:
-                    print(f"Removing incorrect symlink: {link_name}")
+                    log(f"Removing incorrect symlink: {link_name}")
                     os.remove(link_name)
                 else:
-                    print(f"Symlink exists but points to a different source: {link_name} -> {os.readlink(link_name)} (expected {source}). Use --force to update.")
+                    log(f"Symlink exists but points to a different source: {link_name} -> {os.readlink(link_name)} (expected {source}). Use --force to update.")
                     return False
         else:
             if force:
-                print(f"Removing existing file (not a symlink): {link_name}")
+                log(f"Removing existing file (not a symlink): {link_name}")
                 os.remove(link_name)
             else:
-                print(f"File exists and is not a symlink: {link_name}. Use --force to overwrite.")
+                log(f"File exists and is not a symlink: {link_name}. Use --force to overwrite.")
                 return False
     
     try:
         os.symlink(source, link_name)
-        print(f"Created symlink: {link_name} -> {source}")
+        log(f"Created symlink: {link_name} -> {source}")
         return True
     except OSError as e:
-        print(f"Error creating symlink {link_name} -> {source}: {e}")
+        log(f"Error creating symlink {link_name} -> {source}: {e}")
         return False
 
-def _process_repo_symlinks(repo_config, prompt_library_root, action, force=False):
+def _process_repo_symlinks(repo_config, prompt_library_root, action, force=False, log=print):
+    """Create, update or validate one repository's links; returns {'ok': n, 'failed': n}."""
     repo_path = repo_config['path']
-    print(f"Processing repository: {repo_path} for action: {action}")
+    log(f"Processing repository: {repo_path} for action: {action}")
+    counts = {'ok': 0, 'failed': 0}
+
+    def _handle(source, link_path):
+        if action == "create" or action == "update":
+            ok = _create_symlink_single(source, link_path, force, log)
+        elif action == "validate":
+            ok = _validate_symlink_single(source, link_path, log)
+        else:
+            return
+        counts['ok' if ok else 'failed'] += 1
 
     for symlink_type, files in repo_config['symlinks'].items():
         target_dir = os.path.join(repo_path, symlink_type)
@@ -44,82 +60,273 @@ def _process_repo_symlinks(repo_config, prompt_library_root, action, force=False
             if file_name == "*":
                 source_dir = os.path.join(prompt_library_root, symlink_type)
                 if not os.path.isdir(source_dir):
-                    print(f"Warning: Source directory not found for wildcard: {source_dir}")
+                    log(f"Warning: Source directory not found for wildcard: {source_dir}")
                     continue
                 
                 for item in os.listdir(source_dir):
                     source_item_path = os.path.join(source_dir, item)
                     if os.path.isfile(source_item_path):
-                        link_path = os.path.join(target_dir, item)
-                        if action == "create" or action == "update":
-                            _create_symlink_single(source_item_path, link_path, force)
-                        elif action == "validate":
-                            _validate_symlink_single(source_item_path, link_path)
+                        _handle(source_item_path, os.path.join(target_dir, item))
             else:
                 source_path = os.path.join(prompt_library_root, symlink_type, file_name)
-                link_path = os.path.join(target_dir, file_name)
-                if action == "create" or action == "update":
-                    _create_symlink_single(source_path, link_path, force)
-                elif action == "validate":
-                    _validate_symlink_single(source_path, link_path)
+                _handle(source_path, os.path.join(target_dir, file_name))
+    return counts
 
-def _validate_symlink_single(source, link_name):
+def _validate_symlink_single(source, link_name, log=print):
     if not os.path.exists(link_name):
-        print(f"Validation FAILED: Symlink does not exist: {link_name}")
+        log(f"Validation FAILED: Symlink does not exist: {link_name}")
         return False
     if not os.path.islink(link_name):
-        print(f"Validation FAILED: Path is not a symlink: {link_name}")
+        log(f"Validation FAILED: Path is not a symlink: {link_name}")
         return False
     
     current_source = os.readlink(link_name)
     if current_source != source:
-        print(f"Validation FAILED: Symlink {link_name} points to {current_source}, expected {source}")
+        log(f"Validation FAILED: Symlink {link_name} points to {current_source}, expected {source}")
         return False
     if not os.path.exists(source):
-        print(f"Validation FAILED: Symlink {link_name} points to a non-existent source: {source}")
+        log(f"Validation FAILED: Symlink {link_name} points to a non-existent source: {source}")
         return False
     
-    print(f"Validation PASSED: {link_name} -> {source}")
+    log(f"Validation PASSED: {link_name} -> {source}")
     return True
 
-def create_symlinks_command(args):
+def _run_repo(repo_config, prompt_library_root, action, force):
+    """Process one repository, buffering its output; safe to run on a worker thread."""
+    output = []
+    result = {'repository': repo_config['path'], 'ok': 0, 'failed': 0, 'error': None, 'output': output}
+    started = time.perf_counter()
+    try:
+        result.update(_process_repo_symlinks(repo_config, prompt_library_root, action, force, output.append))
+    except OSError as e:
+        result['error'] = str(e)
+        output.append(f"Error processing repository {repo_config['path']}: {e}")
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+def run_repositories(repositories, prompt_library_root, action, force=False, jobs=1):
+    """Process repositories on a thread pool; yields per-repo results in config order."""
+    run = partial(_run_repo, prompt_library_root=prompt_library_root, action=action, force=force)
+    if jobs > 1 and len(repositories) > 1:
+        # Repositories often live on NFS, where the cost is per-call latency rather than CPU.
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(run, repositories)
+    else:
+        yield from map(run, repositories)
+
+def _run_command(args, action, force=False):
     with open(args.config, 'r') as f:
         config = json.load(f)
-    for repo_config in config['repositories']:
-        _process_repo_symlinks(repo_config, args.root, "create", args.force)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    results = []
+    for result in run_repositories(config['repositories'], args.root, action, force, jobs):
+        for line in result['output']:
+            print(line)
+        results.append(result)
+    elapsed = time.perf_counter() - started
+
+    failed = [r for r in results if r['failed'] or r['error']]
+    print(f"\nSummary ({action}): {len(results)} repositories, "
+          f"{sum(r['ok'] for r in results)} links ok, {sum(r['failed'] for r in results)} failed, "
+          f"{sum(1 for r in results if r['error'])} repository errors in {elapsed:.2f}s")
+    for r in failed:
+        detail = r['error'] or f"{r['failed']} failed"
+        print(f"  FAILED {r['repository']}: {detail} ({r['seconds']:.2f}s)")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump([{k: v for k, v in r.items() if k != 'output'} for r in results], f, indent=2)
+    if failed:
+        raise SystemExit(1)
+
+def create_symlinks_command(args):
+    _run_command(args, "create", args.force)
 
 def validate_symlinks_command(args):
-    with open(args.config, 'r') as f:
-        config = json.load(f)
-    for repo_config in config['repositories']:
-        _process_repo_symlinks(repo_config, args.root, "validate")
+    _run_command(args, "validate")
 
 def update_symlinks_command(args):
+    _run_command(args, "update", force=True) # Update implies force
+
+def _scan_dir(path):
+    """Return {name: DirEntry} for path with a single scandir, or None if it is missing."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return None
+
+def _desired_links(repo_config, prompt_library_root):
+    """Yield (target_dir, source_dir, {name: source}) per symlink type of a repository."""
+    for symlink_type, files in repo_config['symlinks'].items():
+        source_dir = os.path.join(prompt_library_root, symlink_type)
+        desired = {}
+        for file_name in files:
+            if file_name == "*":
+                sources = _scan_dir(source_dir)
+                if sources is None:
+                    print(f"Warning: Source directory not found for wildcard: {source_dir}")
+                    continue
+                for name, entry in sources.items():
+                    if entry.is_file():
+                        desired[name] = os.path.join(source_dir, name)
+            else:
+                desired[file_name] = os.path.join(source_dir, file_name)
+        yield os.path.join(repo_config['path'], symlink_type), source_dir, desired
+
+def plan_repo(repo_config, prompt_library_root):
+    """Diff desired against actual links for one repository with one scandir per target directory.
+
+    Returns a list of operations {'op', 'link', 'source', 'current', 'is_link'}
+    where op is one of PLAN_OPS. Orphans are symlinks in a target directory
+    that point into the library's source directory but are no longer wanted;
+    other files are never touched.
+    """
+    operations = []
+    for target_dir, source_dir, desired in _desired_links(repo_config, prompt_library_root):
+        actual = _scan_dir(target_dir) or {}
+        for name, source in sorted(desired.items()):
+            link = os.path.join(target_dir, name)
+            entry = actual.get(name)
+            if entry is None:
+                operations.append({'op': 'create', 'link': link, 'source': source, 'current': None, 'is_link': False})
+            elif not entry.is_symlink():
+                operations.append({'op': 'fix', 'link': link, 'source': source, 'current': None, 'is_link': False})
+            else:
+                current = os.readlink(link)
+                op = 'no-op' if current == source else 'fix'
+                operations.append({'op': op, 'link': link, 'source': source, 'current': current, 'is_link': True})
+
+        for name in sorted(set(actual) - set(desired)):
+            if not actual[name].is_symlink():
+                continue
+            link = os.path.join(target_dir, name)
+            current = os.readlink(link)
+            if os.path.dirname(current) == source_dir:
+                operations.append({'op': 'remove-orphan', 'link': link, 'source': None, 'current': current, 'is_link': True})
+    return operations
+
+def _replace_symlink(source, link_name):
+    # Create the new link beside the old one and rename over it, so the path is never missing.
+    tmp_link = f"{link_name}.tmp-{os.getpid()}"
+    os.symlink(source, tmp_link)
+    try:
+        os.replace(tmp_link, link_name)
+    except OSError:
+        os.remove(tmp_link)
+        raise
+
+def apply_plan(operations, force=False):
+    """Execute every operation except no-ops; returns the number of failures."""
+    failures = 0
+    for operation in operations:
+        op, link, source = operation['op'], operation['link'], operation['source']
+        try:
+            if op == 'create':
+                os.makedirs(os.path.dirname(link), exist_ok=True)
+                os.symlink(source, link)
+                print(f"Created symlink: {link} -> {source}")
+            elif op == 'fix':
+                if not operation['is_link'] and not force:
+                    print(f"File exists and is not a symlink: {link}. Use --force to overwrite.")
+                    failures += 1
+                    continue
+                _replace_symlink(source, link)
+                print(f"Fixed symlink: {link} -> {source}")
+            elif op == 'remove-orphan':
+                os.remove(link)
+                print(f"Removed orphaned symlink: {link}")
+        except OSError as e:
+            print(f"Error applying {op} for {link}: {e}")
+            failures += 1
+    return failures
+
+def _format_operation(operation):
+    op, link = operation['op'], operation['link']
+    if op == 'remove-orphan':
+        return f"  {op:<13} {link} (-> {operation['current']})"
+    if op == 'fix' and not operation['is_link']:
+        return f"  {op:<13} {link} -> {operation['source']} (replaces a regular file)"
+    if op == 'fix':
+        return f"  {op:<13} {link} -> {operation['source']} (was {operation['current']})"
+    return f"  {op:<13} {link} -> {operation['source']}"
+
+def _load_plan(args):
     with open(args.config, 'r') as f:
         config = json.load(f)
-    for repo_config in config['repositories']:
-        _process_repo_symlinks(repo_config, args.root, "update", force=True) # Update implies force
+    repositories = config['repositories']
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1 and len(repositories) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            plans = list(pool.map(partial(plan_repo, prompt_library_root=args.root), repositories))
+    else:
+        plans = [plan_repo(repo_config, args.root) for repo_config in repositories]
+    return [(repo_config['path'], operations) for repo_config, operations in zip(repositories, plans)]
+
+def plan_command(args):
+    plans = _load_plan(args)
+    if args.json:
+        print(json.dumps([{'repository': path, 'operations': ops} for path, ops in plans], indent=2))
+        return
+    counts = dict.fromkeys(PLAN_OPS, 0)
+    for path, operations in plans:
+        print(f"Repository: {path}")
+        for operation in operations:
+            counts[operation['op']] += 1
+            if operation['op'] != 'no-op' or args.verbose:
+                print(_format_operation(operation))
+    print("Plan: " + ", ".join(f"{counts[op]} {op}" for op in PLAN_OPS))
+
+def apply_command(args):
+    failures = 0
+    changes = 0
+    for path, operations in _load_plan(args):
+        pending = [operation for operation in operations if operation['op'] != 'no-op']
+        if pending:
+            print(f"Applying {len(pending)} change(s) to repository: {path}")
+        changes += len(pending)
+        failures += apply_plan(pending, args.force)
+    print(f"Applied {changes - failures} of {changes} change(s).")
+    if failures:
+        raise SystemExit(1)
 
 def main():
     parser = argparse.ArgumentParser(description="Manage symlinks for prompt library.")
     parser.add_argument("--config", default="symlink_config.json", help="Path to the symlink configuration JSON file.")
     parser.add_argument("--root", default=os.getcwd(), help="Root directory of the prompt library.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of repositories to process concurrently (0 = one per CPU).")
     
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # Create command
     create_parser = subparsers.add_parser("create", help="Create symlinks.")
     create_parser.add_argument("--force", action="store_true", help="Force overwrite existing files/symlinks.")
+    create_parser.add_argument("--report", metavar="FILE", help="Write per-repository results as JSON to FILE.")
     create_parser.set_defaults(func=create_symlinks_command)
 
     # Validate command
     validate_parser = subparsers.add_parser("validate", help="Validate existing symlinks.")
+    validate_parser.add_argument("--report", metavar="FILE", help="Write per-repository results as JSON to FILE.")
     validate_parser.set_defaults(func=validate_symlinks_command)
 
     # Update command
     update_parser = subparsers.add_parser("update", help="Update (recreate) symlinks, forcing overwrite.")
+    update_parser.add_argument("--report", metavar="FILE", help="Write per-repository results as JSON to FILE.")
     update_parser.set_defaults(func=update_symlinks_command)
 
+    # Plan command
+    plan_parser = subparsers.add_parser("plan", help="Show the create/fix/remove-orphan operations needed for every repository.")
+    plan_parser.add_argument("--json", action="store_true", help="Print the plan as JSON.")
+    plan_parser.add_argument("--verbose", "-v", action="store_true", help="Also list links that are already correct.")
+    plan_parser.set_defaults(func=plan_command)
+
+    # Apply command
+    apply_parser = subparsers.add_parser("apply", help="Compute the plan and execute only the operations that change something.")
+    apply_parser.add_argument("--force", action="store_true", help="Replace regular files that are in the way of a symlink.")
+    apply_parser.set_defaults(func=apply_command)
+
     args = parser.parse_args()
 
     if hasattr(args, 'func'):
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Persistent metadata cache shared by generate_index.py and prompt_cli.py.
+
+Parsed frontmatter is stored in .prompt_cache/metadata.json under the library
+root, keyed by repository-relative path. An entry is reused while the file's
+(mtime, size) are unchanged; when they differ the content hash decides whether
+the file really needs to be re-parsed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from frontmatter_parser import read_frontmatter
+
+CACHE_DIR = ".prompt_cache"
+CACHE_FILE = "metadata.json"
+CACHE_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _current_umask():
+    # The umask can only be read by setting it; this runs once at import, before any threads.
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Mode for newly created files, as open() would create them.
+NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+
+def file_hash(filepath):
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path, text):
+    """Write text to path via a temp file in the same directory and a rename."""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '-', suffix='.tmp')
+    try:
+        # mkstemp creates 0600 files; keep the existing mode (or the umask default) instead.
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except OSError:
+            mode = NEW_FILE_MODE
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _to_json_safe(record):
+    # YAML can yield dates and other non-JSON scalars; normalise them so that
+    # a fresh parse and a cache hit always hand back identical values.
+    return json.loads(json.dumps(record, default=str))
+
+
+def load_entry(filepath, previous=None, hash_content=True):
+    """Stat, hash and, unless the hash is unchanged from previous, parse a file.
+
+    Module-level so it can be shipped to process-pool workers.
+    """
+    st = os.stat(filepath)
+    digest = file_hash(filepath) if hash_content else None
+    if previous and digest is not None and previous['sha256'] == digest:
+        # Touched but not modified (e.g. by a checkout): only the stat key changes.
+        record = previous['record']
+    else:
+        record = _to_json_safe(read_frontmatter(filepath))
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': digest, 'record': record}
+
+
+class MetadataCache:
+    """On-disk cache of parsed file records for a prompt library root."""
+
+    def __init__(self, root, enabled=True):
+        self.root = root
+        self.enabled = enabled
+        self.path = os.path.join(root, CACHE_DIR, CACHE_FILE)
+        self.entries = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        if enabled:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            self.entries = data.get('entries', {})
+
+    def lookup(self, filepath):
+        """Return the cached record for filepath if its (mtime, size) still match."""
+        if not self.enabled:
+            return None
+        entry = self.entries.get(os.path.relpath(filepath, self.root))
+        if not entry:
+            return None
+        st = os.stat(filepath)
+        if entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            self.hits += 1
+            return entry['record']
+        return None
+
+    def entry(self, filepath):
+        """Return the raw cache entry for filepath, or None."""
+        return self.entries.get(os.path.relpath(filepath, self.root))
+
+    def _store(self, filepath, entry):
+        self.misses += 1
+        if self.enabled:
+            self.entries[os.path.relpath(filepath, self.root)] = entry
+            self.dirty = True
+        return entry['record']
+
+    def get(self, filepath):
+        """Return the parsed record for filepath, re-parsing only on change."""
+        record = self.lookup(filepath)
+        if record is None:
+            record = self._store(filepath, load_entry(filepath, self.entry(filepath), self.enabled))
+        return record
+
+    def get_many(self, filepaths, jobs=1, executor='process'):
+        """Return records for filepaths in order, parsing misses on a worker pool.
+
+        executor is 'process' for CPU-bound parsing or 'thread' for I/O-bound
+        network filesystems. Results are merged back in input order, so output
+        does not depend on jobs.
+        """
+        records = [self.lookup(filepath) for filepath in filepaths]
+        missing = [i for i, record in enumerate(records) if record is None]
+        paths = [filepaths[i] for i in missing]
+        load_args = (paths, [self.entry(p) for p in paths], [self.enabled] * len(paths))
+
+        if jobs > 1 and len(missing) > 1:
+            pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+            chunksize = max(1, len(missing) // (jobs * 4))
+            with pool_class(max_workers=jobs) as pool:
+                entries = list(pool.map(load_entry, *load_args, chunksize=chunksize))
+        else:
+            entries = list(map(load_entry, *load_args))
+
+        for i, entry in zip(missing, entries):
+            records[i] = self._store(filepaths[i], entry)
+        return records
+
+    def content_hash(self, filepath):
+        """Return the cached sha256 of filepath, or None if it is not cached."""
+        entry = self.entry(filepath)
+        return entry['sha256'] if entry else None
+
+    def prune(self, seen_paths):
+        """Drop entries for files that no longer exist in the library."""
+        for rel_path in set(self.entries) - set(seen_paths):
+            del self.entries[rel_path]
+            self.dirty = True
+
+    def save(self):
+        """Atomically write the cache back to disk if anything changed."""
+        if not self.enabled or not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_atomic(self.path, json.dumps({'version': CACHE_VERSION, 'entries': self.entries}, separators=(',', ':')))
+        except OSError as e:
+            # A read-only checkout must still be usable; the cache is only an optimisation.
+            print(f"Warning: could not write metadata cache {self.path}: {e}")
+            return
+        self.dirty = False
@@ -1,47 +1,100 @@
 import os
+import sys
 import json
 import argparse
-import yaml
+
+from library_manifest import (
+    build_id_map, build_manifest, id_map_covers, load_id_entry, load_manifest, read_body, walk_library,
+    write_id_map, write_manifest,
+)
+from fuzzy_index import TrigramIndex
+from lint_engine import FORMATTERS, run_lint, select_rules
+from metadata_cache import MetadataCache
+from search_index import SearchIndex
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-def _get_all_prompts(repo_root):
+def _load_manifest(repo_root, use_cache=True, jobs=1):
+    """Return the library manifest, rebuilding it if it is missing or stale.
+
+    Without the cache only {'prompts': entries} is returned and nothing is written.
+    """
+    if use_cache:
+        manifest = load_manifest(repo_root)
+        if manifest is not None:
+            return manifest
+
+    # Manifest missing or stale: walk the tree, then refresh the manifest for next time.
+    cache = MetadataCache(repo_root, enabled=use_cache)
+    filepaths, watched = walk_library(repo_root)
+    records = cache.get_many(filepaths, jobs)
+    if not use_cache:
+        return {'prompts': [
+            {'path': os.path.relpath(filepath, repo_root), 'sha256': None, **record}
+            for filepath, record in zip(filepaths, records)
+        ]}
+
+    cache.prune(os.path.relpath(filepath, repo_root) for filepath in filepaths)
+    cache.save()
+    manifest = build_manifest(repo_root, filepaths, watched, cache)
+    write_manifest(repo_root, manifest)
+    return manifest
+
+def _load_library(repo_root, use_cache=True, jobs=1):
+    """Return manifest entries (path, frontmatter, error, body_offset, sha256, ...) for the library."""
+    return _load_manifest(repo_root, use_cache, jobs)['prompts']
+
+def _prompts_from_entries(repo_root, entries, stream=None):
     all_prompts_data = []
-    for subdir, _, files in os.walk(repo_root):
-        for file in files:
-            if file.endswith(('.md', '.mdc')) and not file.startswith('PROMPT_RULE_INDEX'):
-                filepath = os.path.join(subdir, file)
-                rel_path = os.path.relpath(filepath, repo_root)
-                
-                metadata = {}
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                
-                if lines and lines[0].strip() == '---':
-                    fm_lines = []
-                    for line in lines[1:]:
-                        if line.strip() == '---':
-                            break
-                        fm_lines.append(line)
-                    try:
-                        meta = yaml.safe_load(''.join(fm_lines))
-                        if isinstance(meta, dict):
-                            metadata = meta
-                    except Exception as e:
-                        print(f"Error parsing YAML in {filepath}: {e}")
-                
-                if metadata: # Include all prompts for linting purposes
-                    metadata['path'] = rel_path
-                    all_prompts_data.append(metadata)
+    for entry in entries:
+        if entry['error']:
+            print(f"Error parsing YAML in {os.path.join(repo_root, entry['path'])}: {entry['error']}", file=stream)
+        metadata = dict(entry['frontmatter'])
+        if metadata: # Include all prompts for linting purposes
+            metadata['path'] = entry['path']
+            all_prompts_data.append(metadata)
     return all_prompts_data
 
-def search_prompts(args):
-    prompts = _get_all_prompts(args.root)
+def _get_all_prompts(repo_root, use_cache=True, jobs=1, stream=None):
+    return _prompts_from_entries(repo_root, _load_library(repo_root, use_cache, jobs), stream)
+
+def _lint_library(entries):
+    # Files without frontmatter are not linted themselves but still take part in
+    # cross-file checks such as basename collisions.
+    return [dict(entry['frontmatter'], path=entry['path']) for entry in entries]
+
+def _check_files(repo_root, files):
+    """Return absolute paths for files, raising ValueError for missing files or files outside repo_root."""
+    root = os.path.abspath(repo_root)
+    filepaths = []
+    for f in files:
+        filepath = os.path.abspath(f)
+        if not os.path.isfile(filepath):
+            raise ValueError(f"No such file: {f}")
+        rel_path = os.path.relpath(filepath, root)
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            raise ValueError(f"{f} is outside the library root {repo_root}")
+        filepaths.append(filepath)
+    return filepaths
+
+def _load_files(repo_root, files, use_cache=True, jobs=1):
+    """Return entries for only the given files (paths relative to the current directory)."""
+    cache = MetadataCache(repo_root, enabled=use_cache)
+    filepaths = _check_files(repo_root, files)
+    records = cache.get_many(filepaths, jobs)
+    cache.save()
+    return [
+        {'path': os.path.relpath(filepath, repo_root), **record}
+        for filepath, record in zip(filepaths, records)
+    ]
+
+def _filter_prompts(prompts, scores, keyword=None, tag=None, tool=None, limit=None):
+    """Apply search matching and ranking; scores maps path to full-text score."""
     results = []
     for prompt in prompts:
-        match = False
-        if args.keyword:
-            keyword_lower = args.keyword.lower()
+        match = prompt['path'] in scores
+        if keyword:
+            keyword_lower = keyword.lower()
             if (
                 keyword_lower in str(prompt.get('name', '')).lower() or
                 keyword_lower in str(prompt.get('description', '')).lower() or
@@ -49,15 +102,35 @@ def search_prompts(args):
             ):
                 match = True
         
-        if args.tag and args.tag.lower() in [t.lower() for t in prompt.get('tags', [])]:
+        if tag and tag.lower() in [t.lower() for t in prompt.get('tags', [])]:
             match = True
         
-        if args.tool and args.tool.lower() in [t.lower() for t in prompt.get('tool_compatibility', [])]:
+        if tool and tool.lower() in [t.lower() for t in prompt.get('tool_compatibility', [])]:
             match = True
 
-        if match or (not args.keyword and not args.tag and not args.tool):
+        if match or (not keyword and not tag and not tool):
             results.append(prompt)
-    
+
+    # Best full-text match first; substring-only and tag/tool matches keep walk order after them.
+    results.sort(key=lambda p: -scores.get(p['path'], 0))
+    if limit:
+        results = results[:limit]
+    return results
+
+def search_prompts(args):
+    entries = _load_library(args.root, not args.no_cache)
+    prompts = _prompts_from_entries(args.root, entries)
+
+    scores = {}
+    if args.keyword:
+        index_class = TrigramIndex if args.fuzzy else SearchIndex
+        index = index_class(args.root, persist=not args.no_cache)
+        index.update([entry for entry in entries if entry['frontmatter']])
+        index.save()
+        scores = dict(index.search(args.keyword))
+
+    results = _filter_prompts(prompts, scores, args.keyword, args.tag, args.tool, args.limit)
+
     if results:
         print("\nSearch Results:")
         for r in results:
@@ -66,74 +139,88 @@ def search_prompts(args):
         print("No prompts found matching your criteria.")
 
 def show_prompt(args):
-    prompts = _get_all_prompts(args.root)
-    found = False
-    for prompt in prompts:
-        if prompt.get('id') == args.prompt_id:
-            found = True
-            print(f"\n--- Prompt: {prompt.get('name', 'N/A')} (ID: {prompt.get('id', 'N/A')}) ---")
-            print(f"Description: {prompt.get('description', 'N/A')}")
-            print(f"Version: {prompt.get('version', 'N/A')}")
-            print(f"Path: {prompt.get('path', 'N/A')}")
-            print(f"Tags: {prompt.get('tags', [])}")
-            print(f"Tools: {prompt.get('tool_compatibility', [])}")
-            print("\n--- Content ---")
-            with open(os.path.join(args.root, prompt['path']), 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                # Remove frontmatter for display
-                if content.startswith('---'):
-                    parts = content.split('---', 2)
-                    if len(parts) > 2:
-                        content = parts[2].strip()
-                print(content)
-            break
-    if not found:
+    use_cache = not args.no_cache
+    entry = load_id_entry(args.root, args.prompt_id) if use_cache else None
+    if entry is None:
+        manifest = load_manifest(args.root) if use_cache else None
+        # While the library matches the manifest the id map was built from, a miss is final.
+        if manifest is None or not id_map_covers(args.root, manifest):
+            # Unknown or stale id: rebuild the id map from the manifest (or a walk).
+            manifest = manifest or _load_manifest(args.root, use_cache)
+            ids = build_id_map(manifest['prompts'])
+            if use_cache:
+                write_id_map(args.root, ids, manifest)
+            entry = ids.get(args.prompt_id)
+    if entry is None:
         print(f"Prompt with ID '{args.prompt_id}' not found.")
+        return
+
+    prompt = dict(entry['frontmatter'], path=entry['path'])
+    print(f"\n--- Prompt: {prompt.get('name', 'N/A')} (ID: {prompt.get('id', 'N/A')}) ---")
+    print(f"Description: {prompt.get('description', 'N/A')}")
+    print(f"Version: {prompt.get('version', 'N/A')}")
+    print(f"Path: {prompt.get('path', 'N/A')}")
+    print(f"Tags: {prompt.get('tags', [])}")
+    print(f"Tools: {prompt.get('tool_compatibility', [])}")
+    print("\n--- Content ---")
+    # Only the body bytes after the frontmatter are read
+    print(read_body(args.root, entry).strip())
 
 def lint_prompts(args):
-    prompts = _get_all_prompts(args.root)
-    errors = 0
-    print("\n--- Linting Prompts ---")
-    for prompt in prompts:
-        is_valid = True
-        if not prompt.get('id'):
-            print(f"[ERROR] {prompt.get('path', 'N/A')}: Missing 'id' in frontmatter.")
-            is_valid = False
-        if not prompt.get('name'):
-            print(f"[ERROR] {prompt.get('path', 'N/A')}: Missing 'name' in frontmatter.")
-            is_valid = False
-        if not prompt.get('description'):
-            print(f"[WARNING] {prompt.get('path', 'N/A')}: Missing 'description' in frontmatter.")
-        if not prompt.get('version'):
-            print(f"[WARNING] {prompt.get('path', 'N/A')}: Missing 'version' in frontmatter.")
-        if not isinstance(prompt.get('tags', []), list):
-            print(f"[ERROR] {prompt.get('path', 'N/A')}: 'tags' should be a list.")
-            is_valid = False
-        if not isinstance(prompt.get('tool_compatibility', []), list):
-            print(f"[ERROR] {prompt.get('path', 'N/A')}: 'tool_compatibility' should be a list.")
-            is_valid = False
-        
-        # Add more linting rules as needed (e.g., valid semantic version, date format, etc.)
+    try:
+        rule_ids = select_rules(args.select, args.disable)
+        _check_files(args.root, args.files)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
 
-        if not is_valid:
-            errors += 1
-    
-    if errors == 0:
-        print("All prompts passed linting with no errors.")
+    use_cache = not args.no_cache
+    jobs = args.jobs or os.cpu_count() or 1
+    # Keep machine-readable output clean: parse errors go to stderr there.
+    stream = None if args.format == 'text' else sys.stderr
+    entries = _load_library(args.root, use_cache, jobs)
+    if args.files:
+        file_entries = _load_files(args.root, args.files, use_cache, jobs)
+        prompts = _prompts_from_entries(args.root, file_entries, stream)
+        # Cross-file rules compare the given files against the rest of the library,
+        # in library walk order so "first defined in" means the same as in a full lint.
+        only = {entry['path'] for entry in file_entries}
+        by_path = {entry['path']: entry for entry in file_entries}
+        entries = [by_path.pop(entry['path'], entry) for entry in entries] + list(by_path.values())
+    else:
+        prompts = _prompts_from_entries(args.root, entries, stream)
+        only = None
+    issues, errors = run_lint(prompts, rule_ids, jobs, args.root, _lint_library(entries), only)
+    output = FORMATTERS[args.format](issues, errors, rule_ids)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
     else:
-        print(f"Linting completed with {errors} errors.")
+        print(output)
+
+    if args.fail_on == 'error' and errors:
+        sys.exit(1)
+    if args.fail_on == 'warning' and issues:
+        sys.exit(1)
+
+def serve_command(args):
+    from prompt_server import serve
+    serve(args.root, host=args.host, port=args.port, socket_path=args.socket, poll_interval=args.poll_interval)
 
 def main():
     parser = argparse.ArgumentParser(description="CLI tool for managing prompt library.")
     parser.add_argument("--root", default=REPO_ROOT, help="Root directory of the prompt library.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every file and do not read or write the metadata cache.")
     
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # Search command
     search_parser = subparsers.add_parser("search", help="Search for prompts.")
-    search_parser.add_argument("keyword", nargs='?', help="Keyword to search in name, description, or ID.")
+    search_parser.add_argument("keyword", nargs='?', help="Keywords to search in frontmatter and prompt bodies (ranked by relevance).")
     search_parser.add_argument("--tag", help="Filter by tag.")
     search_parser.add_argument("--tool", help="Filter by AI tool compatibility.")
+    search_parser.add_argument("--limit", type=int, help="Show at most this many results.")
+    search_parser.add_argument("--fuzzy", action="store_true", help="Typo-tolerant match of keywords against ids, names, titles, tags and file names.")
     search_parser.set_defaults(func=search_prompts)
 
     # Show command
@@ -143,8 +230,24 @@ def main():
 
     # Lint command
     lint_parser = subparsers.add_parser("lint", help="Lint prompts for metadata consistency.")
+    lint_parser.add_argument("files", nargs='*', help="Lint only these files instead of the whole library.")
+    lint_parser.add_argument("--format", choices=sorted(FORMATTERS), default="text", help="Output format.")
+    lint_parser.add_argument("--output", "-o", help="Write the report to this file instead of stdout.")
+    lint_parser.add_argument("--select", action="append", help="Run only this rule id or name (repeatable).")
+    lint_parser.add_argument("--disable", action="append", help="Skip this rule id or name (repeatable).")
+    lint_parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of parallel workers (0 = one per CPU).")
+    lint_parser.add_argument("--fail-on", choices=["never", "error", "warning"], default="never",
+                             help="Exit non-zero when issues of this severity (or worse) are found.")
     lint_parser.set_defaults(func=lint_prompts)
 
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Serve search/show/lint as a JSON API from a warm in-memory library.")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to bind the HTTP server to.")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port for the HTTP server.")
+    serve_parser.add_argument("--socket", help="Listen on this Unix socket path instead of TCP.")
+    serve_parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between checks for changed library files.")
+    serve_parser.set_defaults(func=serve_command)
+
     args = parser.parse_args()
 
     if hasattr(args, 'func'):
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Long-running prompt library server used by `prompt_cli.py serve`.
+
+The library is loaded once and kept in memory together with its BM25 and
+trigram indexes. A background thread polls the tree and, when the manifest is
+no longer fresh, re-parses and re-indexes only the files that changed. Requests
+are answered as JSON over localhost HTTP or a Unix socket:
+
+    GET /search?q=<keywords>&tag=&tool=&limit=&fuzzy=1
+    GET /show?id=<prompt id>
+    GET /lint
+"""
+import json
+import os
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from fuzzy_index import TrigramIndex
+from library_manifest import (
+    build_id_map, build_manifest, is_fresh, read_body, walk_library, write_id_map, write_manifest,
+)
+from metadata_cache import MetadataCache
+from lint_engine import run_lint
+from prompt_cli import _filter_prompts, _lint_library, _prompts_from_entries
+from search_index import SearchIndex
+
+
+class LibraryState:
+    """In-memory library metadata and search indexes, refreshed on change."""
+
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self.cache = MetadataCache(root)
+        self.search_index = SearchIndex(root)
+        self.fuzzy_index = TrigramIndex(root)
+        self.manifest = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-walk the tree, re-parsing and re-indexing only changed files."""
+        filepaths, watched = walk_library(self.root)
+        with self.lock:
+            self.cache.get_many(filepaths)
+            self.cache.prune(os.path.relpath(filepath, self.root) for filepath in filepaths)
+            self.cache.save()
+            self.manifest = build_manifest(self.root, filepaths, watched, self.cache)
+            self.entries = self.manifest['prompts']
+            self.prompts = _prompts_from_entries(self.root, self.entries)
+            self.ids = build_id_map(self.entries)
+            searchable = [entry for entry in self.entries if entry['frontmatter']]
+            for index in (self.search_index, self.fuzzy_index):
+                index.update(searchable)
+                index.save()
+        # Keep the on-disk manifest current for one-shot CLI calls as well.
+        write_manifest(self.root, self.manifest)
+        write_id_map(self.root, self.ids, self.manifest)
+
+    def refresh_if_stale(self):
+        if not is_fresh(self.root, self.manifest):
+            self.refresh()
+
+    def search(self, keyword=None, tag=None, tool=None, limit=None, fuzzy=False):
+        with self.lock:
+            scores = {}
+            if keyword:
+                index = self.fuzzy_index if fuzzy else self.search_index
+                scores = dict(index.search(keyword))
+            results = _filter_prompts(self.prompts, scores, keyword, tag, tool, limit)
+            return [dict(prompt, score=scores.get(prompt['path'], 0)) for prompt in results]
+
+    def show(self, prompt_id):
+        with self.lock:
+            entry = self.ids.get(prompt_id)
+        if entry is None:
+            return None
+        return dict(entry['frontmatter'], path=entry['path'], content=read_body(self.root, entry).strip())
+
+    def lint(self):
+        with self.lock:
+            issues, errors = run_lint(self.prompts, root=self.root, library=_lint_library(self.entries))
+        return {'issues': issues, 'errors': errors}
+
+
+def _make_handler(state):
+    class PromptRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                if url.path == '/search':
+                    limit = int(query['limit']) if query.get('limit') else None
+                    results = state.search(query.get('q'), query.get('tag'), query.get('tool'), limit,
+                                           query.get('fuzzy', '') not in ('', '0', 'false'))
+                    self._send_json(200, {'results': results})
+                elif url.path == '/show':
+                    prompt = state.show(query.get('id', ''))
+                    if prompt is None:
+                        self._send_json(404, {'error': f"Prompt with ID '{query.get('id', '')}' not found."})
+                    else:
+                        self._send_json(200, prompt)
+                elif url.path == '/lint':
+                    self._send_json(200, state.lint())
+                else:
+                    self._send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            # Editor integrations poll frequently; keep the console quiet.
+            pass
+
+    return PromptRequestHandler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _watch(state, poll_interval, stop_event):
+    while not stop_event.wait(poll_interval):
+        try:
+            state.refresh_if_stale()
+        except OSError as e:
+            print(f"Warning: library refresh failed: {e}")
+
+
+def serve(root, host='127.0.0.1', port=8765, socket_path=None, poll_interval=2.0):
+    """Load the library and serve it until interrupted."""
+    state = LibraryState(root)
+    handler = _make_handler(state)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, handler)
+        print(f"Serving prompt library {root} on unix socket {socket_path}")
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        print(f"Serving prompt library {root} on http://{host}:{server.server_address[1]}")
+
+    stop_event = threading.Event()
+    watcher = threading.Thread(target=_watch, args=(state, poll_interval, stop_event), daemon=True)
+    watcher.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Persisted inverted index with BM25 ranking for prompt_cli search.
+
+Frontmatter fields and body text are tokenized, lightly stemmed and stored as
+postings in .prompt_cache/search_index.json. Documents are re-indexed only when
+their content hash changes, so a search reads one index file plus the bodies of
+any files edited since the last run.
+"""
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from library_manifest import read_body
+from metadata_cache import CACHE_DIR, write_atomic
+
+INDEX_FILE = "search_index.json"
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term-frequency multipliers per frontmatter field; other string fields count once.
+FIELD_WEIGHTS = {'name': 3, 'title': 3, 'id': 3, 'tags': 2, 'description': 2}
+UNINDEXED_FIELDS = {'version', 'created_date', 'last_updated'}
+BODY_WEIGHT = 1
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'with',
+}
+SUFFIXES = (('ies', 'y'), ('ing', ''), ('ed', ''), ('s', ''))
+
+
+def stem(word):
+    """Strip common English inflections (a deliberately light stemmer)."""
+    if word.endswith(('ss', 'us', 'is')):
+        return word
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def tokenize(text):
+    """Split text into lowercase, stemmed tokens, dropping stopwords."""
+    return [stem(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _field_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ' '.join(v for v in value if isinstance(v, str))
+    return ''
+
+
+class SearchIndex:
+    """Inverted index of library entries (as produced by the manifest)."""
+
+    def __init__(self, root, persist=True):
+        self.root = root
+        self.persist = persist
+        self.path = os.path.join(root, CACHE_DIR, INDEX_FILE)
+        self.docs = {}
+        self.postings = {}
+        self.dirty = False
+        if persist:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+            self.docs = data['docs']
+            self.postings = data['postings']
+
+    def _remove(self, path):
+        doc = self.docs.pop(path, None)
+        if doc is None:
+            return
+        for term in doc['terms']:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(path, None)
+                if not postings:
+                    del self.postings[term]
+        self.dirty = True
+
+    def _add(self, entry):
+        tf = Counter()
+        for field, value in entry['frontmatter'].items():
+            if field in UNINDEXED_FIELDS:
+                continue
+            weight = FIELD_WEIGHTS.get(field, 1)
+            for token in tokenize(_field_text(value)):
+                tf[token] += weight
+        for token in tokenize(read_body(self.root, entry)):
+            tf[token] += BODY_WEIGHT
+
+        path = entry['path']
+        self.docs[path] = {'sha256': entry['sha256'], 'length': sum(tf.values()), 'terms': sorted(tf)}
+        for term, count in tf.items():
+            self.postings.setdefault(term, {})[path] = count
+        self.dirty = True
+
+    def update(self, entries):
+        """Index new or changed entries and drop ones no longer in the library."""
+        live = set()
+        for entry in entries:
+            path = entry['path']
+            live.add(path)
+            doc = self.docs.get(path)
+            if doc and entry['sha256'] is not None and doc['sha256'] == entry['sha256']:
+                continue
+            self._remove(path)
+            self._add(entry)
+        for path in set(self.docs) - live:
+            self._remove(path)
+
+    def search(self, query, limit=None):
+        """Return [(path, score)] for documents matching query, best first."""
+        if not self.docs:
+            return []
+        total_docs = len(self.docs)
+        avg_length = sum(doc['length'] for doc in self.docs.values()) / total_docs or 1
+
+        scores = Counter()
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for path, tf in postings.items():
+                length_norm = 1 - B + B * self.docs[path]['length'] / avg_length
+                scores[path] += idf * tf * (K1 + 1) / (tf + K1 * length_norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def save(self):
+        """Atomically persist the index if it changed."""
+        if not self.persist or not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_atomic(self.path, json.dumps(
+                {'version': INDEX_VERSION, 'docs': self.docs, 'postings': self.postings},
+                separators=(',', ':'),
+            ))
+        except OSError as e:
+            print(f"Warning: could not write search index {self.path}: {e}")
+            return
+        self.dirty = False
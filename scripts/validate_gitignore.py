@@ -17,10 +17,15 @@ Usage:
 import argparse
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+
+from gitignore_rules import GitignoreMatcher
+from walker import walk
 
 
 class Severity(Enum):
@@ -52,6 +57,16 @@ class ProjectType(Enum):
     UNKNOWN = "unknown"
 
 
+# A single project type or every type detected in a (polyglot) directory
+ProjectTypes = Union[ProjectType, Iterable[ProjectType]]
+
+
+def _as_project_types(project_type: ProjectTypes) -> List[ProjectType]:
+    if isinstance(project_type, ProjectType):
+        return [project_type]
+    return list(project_type)
+
+
 # Define required patterns by category
 REQUIRED_PATTERNS = {
     "base": {
@@ -161,6 +176,26 @@ REQUIRED_PATTERNS = {
 }
 
 
+# Sample paths each CRITICAL pattern exists to protect. They are evaluated with
+# real gitignore semantics (negation, anchoring, '**', last match wins), so a
+# pattern that is present but later re-included still counts as missing.
+SENSITIVE_PROBES = {
+    ".env": [".env", "services/api/.env"],
+    "*.pem": ["server.pem", "certs/server.pem"],
+    "*.key": ["private.key", "certs/private.key"],
+    "credentials.json": ["credentials.json", "config/credentials.json"],
+    "secrets.json": ["secrets.json", "config/secrets.json"],
+    ".aws/": [".aws/credentials"],
+    ".azure/": [".azure/accessTokens.json"],
+    "kubeconfig": ["kubeconfig", "deploy/kubeconfig"],
+    "*.tfstate": ["prod.tfstate", "envs/prod/terraform.tfstate"],
+    "*.tfstate.*": ["prod.tfstate.backup", "envs/prod/terraform.tfstate.1700000000.backup"],
+    "*.tfvars": ["prod.tfvars", "envs/prod/secrets.tfvars"],
+    ".chef/*.pem": [".chef/x.pem"],
+    ".chef/encrypted_data_bag_secret": [".chef/encrypted_data_bag_secret"],
+}
+
+
 class GitignoreValidator:
     """Validates .gitignore files against best practices."""
 
@@ -168,6 +203,9 @@ class GitignoreValidator:
         self.path = gitignore_path
         self.content = self._read_file()
         self.patterns = self._extract_patterns()
+        self._bases, self._dir_prefixes = self._index_patterns()
+        self.matcher = GitignoreMatcher(self.content.split('\n'))
+        self._unignored_probes = self._evaluate_probes()
         self.issues: List[ValidationIssue] = []
 
     def _read_file(self) -> str:
@@ -192,6 +230,24 @@ class GitignoreValidator:
                 patterns.add(line)
         return patterns
 
+    def _index_patterns(self) -> Tuple[Set[str], Set[str]]:
+        """Index patterns once: normalized bases, and every 'dir/' prefix of a pattern."""
+        bases = set()
+        dir_prefixes = set()
+        for existing in self.patterns:
+            bases.add(existing.rstrip('/*'))
+            # Flattened prefix trie: each path prefix ending in '/' that a pattern starts with.
+            slash = existing.find('/')
+            while slash != -1:
+                dir_prefixes.add(existing[:slash + 1])
+                slash = existing.find('/', slash + 1)
+        return bases, dir_prefixes
+
+    def _evaluate_probes(self) -> Set[str]:
+        """Evaluate every sensitive sample path in one pass; returns those not ignored."""
+        probes = {path for paths in SENSITIVE_PROBES.values() for path in paths}
+        return {path for path in probes if not self.matcher.is_ignored(path)}
+
     def _pattern_exists(self, pattern: str) -> bool:
         """Check if a pattern or similar pattern exists in .gitignore."""
         # Direct match
@@ -200,21 +256,35 @@ class GitignoreValidator:
 
         # Check for wildcarded versions
         pattern_base = pattern.rstrip('/*')
-        for existing in self.patterns:
-            existing_base = existing.rstrip('/*')
-            if pattern_base == existing_base:
-                return True
-            # Check if pattern is covered by more general pattern
-            if pattern.startswith(existing_base + '/') or existing.startswith(pattern_base + '/'):
+        if pattern_base in self._bases:
+            return True
+
+        # Check if pattern is covered by more general pattern
+        slash = pattern.find('/')
+        while slash != -1:
+            if pattern[:slash] in self._bases:
                 return True
+            slash = pattern.find('/', slash + 1)
 
-        return False
+        # ...or if a more specific pattern lives under it
+        return pattern_base + '/' in self._dir_prefixes
 
     def validate_category(self, category: str, patterns_by_severity: Dict[Severity, List[Tuple[str, str]]]):
         """Validate patterns for a specific category."""
         for severity, patterns in patterns_by_severity.items():
             for pattern, description in patterns:
-                if not self._pattern_exists(pattern):
+                if severity == Severity.CRITICAL and pattern in SENSITIVE_PROBES:
+                    exposed = [p for p in SENSITIVE_PROBES[pattern] if p in self._unignored_probes]
+                    if not exposed:
+                        continue
+                    description = f"{description}; {', '.join(exposed)} would still be committed"
+                    self.issues.append(ValidationIssue(
+                        severity=severity,
+                        category=category,
+                        pattern=pattern,
+                        description=description
+                    ))
+                elif not self._pattern_exists(pattern):
                     self.issues.append(ValidationIssue(
                         severity=severity,
                         category=category,
@@ -230,16 +300,17 @@ class GitignoreValidator:
         """Validate security-critical patterns."""
         self.validate_category("security", REQUIRED_PATTERNS["security"])
 
-    def validate_technology_patterns(self, project_type: ProjectType):
-        """Validate technology-specific patterns."""
-        if project_type == ProjectType.UNKNOWN:
-            return
+    def validate_technology_patterns(self, project_type: ProjectTypes):
+        """Validate technology-specific patterns for one or several project types."""
+        for pt in _as_project_types(project_type):
+            if pt == ProjectType.UNKNOWN:
+                continue
 
-        tech_key = project_type.value
-        if tech_key in REQUIRED_PATTERNS:
-            self.validate_category(tech_key, REQUIRED_PATTERNS[tech_key])
+            tech_key = pt.value
+            if tech_key in REQUIRED_PATTERNS:
+                self.validate_category(tech_key, REQUIRED_PATTERNS[tech_key])
 
-    def validate_all(self, project_type: ProjectType = ProjectType.UNKNOWN):
+    def validate_all(self, project_type: ProjectTypes = ProjectType.UNKNOWN):
         """Run all validations."""
         self.validate_base_patterns()
         self.validate_security_patterns()
@@ -258,13 +329,18 @@ class GitignoreValidator:
 
     def print_report(self, verbose: bool = False):
         """Print validation report."""
+        print(self.format_report(verbose))
+
+    def format_report(self, verbose: bool = False) -> str:
+        """Render the validation report as text."""
         if not self.issues:
-            print(f"✅ {self.path}: No issues found")
-            return
+            return f"✅ {self.path}: No issues found"
 
-        print(f"\n{'='*80}")
-        print(f"Validation Report: {self.path}")
-        print(f"{'='*80}")
+        lines = []
+
+        lines.append(f"\n{'='*80}")
+        lines.append(f"Validation Report: {self.path}")
+        lines.append(f"{'='*80}")
 
         # Group issues by severity
         issues_by_severity = {
@@ -275,38 +351,56 @@ class GitignoreValidator:
         for issue in self.issues:
             issues_by_severity[issue.severity].append(issue)
 
-        # Print critical issues first
+        # Critical issues first
         for severity in [Severity.CRITICAL, Severity.WARNING, Severity.INFO]:
             issues = issues_by_severity[severity]
             if not issues and not verbose:
                 continue
 
             icon = "🔴" if severity == Severity.CRITICAL else "⚠️" if severity == Severity.WARNING else "ℹ️"
-            print(f"\n{icon} {severity.value} ({len(issues)} issues)")
-            print("-" * 80)
+            lines.append(f"\n{icon} {severity.value} ({len(issues)} issues)")
+            lines.append("-" * 80)
 
             for issue in issues:
-                print(f"  [{issue.category}] Missing pattern: {issue.pattern}")
-                print(f"      → {issue.description}")
+                lines.append(f"  [{issue.category}] Missing pattern: {issue.pattern}")
+                lines.append(f"      → {issue.description}")
 
-        # Print summary
+        # Summary
         summary = self.get_summary()
-        print(f"\n{'='*80}")
-        print("Summary:")
-        print(f"  CRITICAL: {summary['CRITICAL']}")
-        print(f"  WARNING:  {summary['WARNING']}")
-        print(f"  INFO:     {summary['INFO']}")
-        print(f"{'='*80}\n")
+        lines.append(f"\n{'='*80}")
+        lines.append("Summary:")
+        lines.append(f"  CRITICAL: {summary['CRITICAL']}")
+        lines.append(f"  WARNING:  {summary['WARNING']}")
+        lines.append(f"  INFO:     {summary['INFO']}")
+        lines.append(f"{'='*80}\n")
+        return '\n'.join(lines)
+
+
+@lru_cache(maxsize=4096)
+def _list_directory(directory: str) -> FrozenSet[str]:
+    """Return the entry names of directory, listing it at most once per process."""
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
 
 
 class ProjectTypeDetector:
-    """Detect project type based on directory contents."""
+    """Detect project types based on directory contents."""
 
-    def __init__(self, directory: Path):
+    def __init__(self, directory: Path, names: Optional[Iterable[str]] = None):
+        """names are the directory's file names when the caller has already listed it."""
         self.directory = directory
+        self.names = frozenset(names) if names is not None else _list_directory(str(directory))
 
     def detect(self) -> ProjectType:
         """Detect the primary project type."""
+        detected = self.detect_all()
+        return detected[0] if detected else ProjectType.UNKNOWN
+
+    def detect_all(self) -> List[ProjectType]:
+        """Detect every project type present, in priority order."""
         detection_rules = [
             (self._is_terraform, ProjectType.TERRAFORM),
             (self._is_python, ProjectType.PYTHON),
@@ -317,66 +411,127 @@ class ProjectTypeDetector:
             (self._is_chef, ProjectType.CHEF),
             (self._is_dotnet, ProjectType.DOTNET),
         ]
+        return [project_type for detector, project_type in detection_rules if detector()]
 
-        for detector, project_type in detection_rules:
-            if detector():
-                return project_type
-
-        return ProjectType.UNKNOWN
+    def _has_suffix(self, *suffixes: str) -> bool:
+        return any(name.endswith(suffixes) for name in self.names)
 
     def _is_terraform(self) -> bool:
         """Check if directory contains Terraform files."""
-        return any(self.directory.glob("*.tf"))
+        return self._has_suffix(".tf")
 
     def _is_python(self) -> bool:
         """Check if directory contains Python project files."""
-        indicators = [
+        indicators = {
             "setup.py", "pyproject.toml", "requirements.txt",
             "Pipfile", "poetry.lock", "setup.cfg"
-        ]
-        return any((self.directory / indicator).exists() for indicator in indicators)
+        }
+        return not indicators.isdisjoint(self.names)
 
     def _is_nodejs(self) -> bool:
         """Check if directory contains Node.js project files."""
-        return (self.directory / "package.json").exists()
+        return "package.json" in self.names
 
     def _is_go(self) -> bool:
         """Check if directory contains Go project files."""
-        return (self.directory / "go.mod").exists()
+        return "go.mod" in self.names
 
     def _is_java(self) -> bool:
         """Check if directory contains Java project files."""
-        return (self.directory / "pom.xml").exists() or (self.directory / "build.gradle").exists()
+        return "pom.xml" in self.names or "build.gradle" in self.names
 
     def _is_ruby(self) -> bool:
         """Check if directory contains Ruby project files."""
-        return (self.directory / "Gemfile").exists()
+        return "Gemfile" in self.names
 
     def _is_chef(self) -> bool:
         """Check if directory contains Chef files."""
-        return (self.directory / "metadata.rb").exists() or (self.directory / "Berksfile").exists()
+        return "metadata.rb" in self.names or "Berksfile" in self.names
 
     def _is_dotnet(self) -> bool:
         """Check if directory contains .NET project files."""
-        return any(self.directory.glob("*.csproj")) or any(self.directory.glob("*.sln"))
+        return self._has_suffix(".csproj", ".sln")
+
+
+def iter_gitignores(directory: Path):
+    """Yield (.gitignore path, file names in its directory) as they are found.
 
+    Pruned and ignored directories are skipped. The file names are the walker's
+    listing, so project type detection does not have to list the directory again.
+    """
+    for dirpath, _, filenames in walk(directory):
+        if ".gitignore" in filenames:
+            yield Path(dirpath) / ".gitignore", frozenset(filenames)
 
-def scan_directory(directory: Path, auto_detect: bool = False) -> List[Tuple[Path, ProjectType]]:
-    """Scan directory for .gitignore files."""
+
+def scan_directory(directory: Path, auto_detect: bool = False) -> List[Tuple[Path, List[ProjectType]]]:
+    """Scan directory for .gitignore files, skipping pruned and ignored directories."""
     gitignore_files = []
 
-    for gitignore in directory.rglob(".gitignore"):
+    for gitignore, names in iter_gitignores(directory):
         if auto_detect:
-            detector = ProjectTypeDetector(gitignore.parent)
-            project_type = detector.detect()
+            detector = ProjectTypeDetector(gitignore.parent, names)
+            project_type = detector.detect_all()
         else:
-            project_type = ProjectType.UNKNOWN
+            project_type = [ProjectType.UNKNOWN]
 
         gitignore_files.append((gitignore, project_type))
 
     return gitignore_files
 
 
+def validate_file(gitignore_path: Path, project_type: ProjectTypes, auto_detect: bool = False,
+                  verbose: bool = False, summary_only: bool = False,
+                  names: Optional[Iterable[str]] = None) -> Tuple[Path, str, Optional[Dict[str, int]]]:
+    """Validate one .gitignore and render its output; module-level for process pools.
+
+    names, if given, are the file names in its directory, used for auto-detection.
+    The summary is None when the file could not be read.
+    """
+    if auto_detect:
+        project_type = ProjectTypeDetector(gitignore_path.parent, names).detect_all()
+    try:
+        validator = GitignoreValidator(gitignore_path)
+    except SystemExit:
+        # _read_file already reported the error; don't abort the whole scan.
+        return gitignore_path, "", None
+    validator.validate_all(project_type)
+
+    summary = validator.get_summary()
+    if not summary_only:
+        output = validator.format_report(verbose)
+    elif any(summary.values()):
+        output = f"{gitignore_path}: C:{summary['CRITICAL']} W:{summary['WARNING']} I:{summary['INFO']}"
+    else:
+        output = ""
+    return gitignore_path, output, summary
+
+
+def scan_results(directory: Path, project_type: ProjectTypes, auto_detect: bool = False,
+                 verbose: bool = False, summary_only: bool = False, jobs: int = 1):
+    """Yield validate_file results while the tree is still being walked.
+
+    With jobs > 1, files are validated on a process pool and results are
+    yielded as they complete, so their order can differ between runs.
+    """
+    options = (project_type, auto_detect, verbose, summary_only)
+    if jobs <= 1:
+        for gitignore, names in iter_gitignores(directory):
+            yield validate_file(gitignore, *options, names=names)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = set()
+        for gitignore, names in iter_gitignores(directory):
+            pending.add(pool.submit(validate_file, gitignore, *options, names=names))
+            done = {future for future in pending if future.done()}
+            pending -= done
+            for future in done:
+                yield future.result()
+        for future in as_completed(pending):
+            yield future.result()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate .gitignore files against best practices",
@@ -425,6 +580,12 @@ Examples:
         action="store_true",
         help="Verbose output"
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Validate files on N worker processes with --scan (0 = one per CPU)"
+    )
     parser.add_argument(
         "--summary-only",
         action="store_true",
@@ -449,51 +610,51 @@ Examples:
         project_type = ProjectType(args.type)
 
     if args.scan or path.is_dir():
-        # Scan directory
-        gitignore_files = scan_directory(path, args.auto_detect)
-
-        if not gitignore_files:
-            print(f"No .gitignore files found in {path}")
-            sys.exit(0)
-
-        print(f"Found {len(gitignore_files)} .gitignore file(s)\n")
-
+        # Scan directory, reporting each file as soon as it has been validated
+        jobs = args.jobs or os.cpu_count() or 1
         total_issues = {"CRITICAL": 0, "WARNING": 0, "INFO": 0}
+        files_scanned = 0
+        files_failed = 0
 
-        for gitignore_path, detected_type in gitignore_files:
-            pt = detected_type if args.auto_detect else project_type
-
-            validator = GitignoreValidator(gitignore_path)
-            validator.validate_all(pt)
-
-            if not args.summary_only:
-                validator.print_report(args.verbose)
-            else:
-                summary = validator.get_summary()
-                if any(summary.values()):
-                    print(f"{gitignore_path}: C:{summary['CRITICAL']} W:{summary['WARNING']} I:{summary['INFO']}")
+        for _, output, summary in scan_results(path, project_type, args.auto_detect,
+                                               args.verbose, args.summary_only, jobs):
+            if summary is None:
+                files_failed += 1
+                continue
+            files_scanned += 1
+            if output:
+                print(output, flush=True)
 
             # Update totals
-            summary = validator.get_summary()
             for key in total_issues:
                 total_issues[key] += summary[key]
 
+        if not files_scanned and not files_failed:
+            print(f"No .gitignore files found in {path}")
+            sys.exit(0)
+
         # Print overall summary
         print(f"\n{'='*80}")
         print("Overall Summary:")
-        print(f"  Files scanned: {len(gitignore_files)}")
+        print(f"  Files scanned: {files_scanned}")
+        if files_failed:
+            print(f"  Files failed:  {files_failed}")
         print(f"  CRITICAL: {total_issues['CRITICAL']}")
         print(f"  WARNING:  {total_issues['WARNING']}")
         print(f"  INFO:     {total_issues['INFO']}")
         print(f"{'='*80}\n")
 
+        if files_failed:
+            sys.exit(1)
+
     else:
         # Validate single file
         if args.auto_detect:
             detector = ProjectTypeDetector(path.parent)
-            project_type = detector.detect()
+            project_type = detector.detect_all()
             if args.verbose:
-                print(f"Detected project type: {project_type.value}")
+                detected = ', '.join(pt.value for pt in project_type) or ProjectType.UNKNOWN.value
+                print(f"Detected project type(s): {detected}")
 
         validator = GitignoreValidator(path)
         validator.validate_all(project_type)
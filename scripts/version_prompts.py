@@ -2,20 +2,72 @@
 """
 Script to add version numbers to all prompt files in the repository.
 This script adds a version field to the YAML frontmatter of each prompt file.
+
+Files that already carry a version are left untouched, changed files are
+written atomically (temp file + rename), files are processed on a worker pool
+with --jobs, and the index is regenerated in-process only when something
+changed.
+
+With --bump, a sha256 of each prompt body (everything after the frontmatter) is
+recorded in .prompt_versions.json; on later runs only prompts whose body hash
+changed get their patch (or, with --minor, minor) version and last_updated
+bumped.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import re
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-def process_prompt_file(filepath):
-    """Add version information to a prompt file's YAML frontmatter"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+from frontmatter_parser import find_frontmatter_end, load_yaml
+from metadata_cache import write_atomic
+from walker import walk
+
+VERSIONS_FILE = ".prompt_versions.json"
+VERSIONS_FORMAT = 1
+
+VERSION_RE = re.compile(r'^version:[ \t]*(["\']?)(\d+)(?:\.(\d+))?(?:\.(\d+))?\1[ \t]*$')
+
+def _set_field(yaml_lines, key, value):
+    """Replace the top-level `key:` line in yaml_lines, or append one."""
+    line = f'{key}: "{value}"'
+    for i, existing in enumerate(yaml_lines):
+        if existing.startswith(f'{key}:'):
+            yaml_lines[i] = line
+            return
+    yaml_lines.append(line)
+
+def bump_version(version, level='patch'):
+    """Return the next semver for a 'X', 'X.Y' or 'X.Y.Z' version string."""
+    m = re.fullmatch(r'(\d+)(?:\.(\d+))?(?:\.(\d+))?', str(version))
+    if not m:
+        raise ValueError(f"not a semantic version: {version!r}")
+    major, minor, patch = (int(part or 0) for part in m.groups())
+    if level == 'minor':
+        return f"{major}.{minor + 1}.0"
+    return f"{major}.{minor}.{patch + 1}"
+
+def body_hash(content):
+    """Return the sha256 of content after its frontmatter (all of it if there is none)."""
+    lines = content.split('\n')
+    end = find_frontmatter_end(lines)
+    body = content if end is None else '\n'.join(lines[end + 1:])
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+def plan_prompt_file(content, today=None):
+    """Return (status, message, new_content) for versioning content.
+
+    status is 'changed', 'unchanged' or 'error'; new_content is only set when
+    the file needs rewriting. Existing frontmatter is edited line by line rather
+    than re-dumped, so untouched keys keep their formatting.
+    """
+    today = today or datetime.now().strftime("%Y-%m-%d")
     lines = content.split('\n')
-    
+
     # Check if file has YAML frontmatter
     if not lines or lines[0].strip() != '---':
         # No YAML frontmatter, add one with version
@@ -25,87 +77,164 @@ created_date: "{}"
 last_updated: "{}"
 ---
 
-""".format(datetime.now().strftime("%Y-%m-%d"), datetime.now().strftime("%Y-%m-%d"))
-        
-        new_content = frontmatter + content
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
-        return True, "Added new frontmatter with version 1.0.0"
-    
+""".format(today, today)
+        return 'changed', "Added new frontmatter with version 1.0.0", frontmatter + content
+
     # Find the end of YAML frontmatter
-    yaml_end_idx = None
-    for i, line in enumerate(lines[1:], 1):
-        if line.strip() == '---':
-            yaml_end_idx = i
-            break
-    
+    yaml_end_idx = find_frontmatter_end(lines)
+
     if yaml_end_idx is None:
-        return False, "Invalid YAML frontmatter structure"
-    
+        return 'error', "Invalid YAML frontmatter structure", None
+
     # Extract and parse YAML
-    yaml_lines = lines[1:yaml_end_idx]
-    yaml_content = '\n'.join(yaml_lines)
-    
+    yaml_content = '\n'.join(lines[1:yaml_end_idx])
+
     try:
-        metadata = yaml.safe_load(yaml_content) or {}
+        metadata = load_yaml(yaml_content) or {}
     except yaml.YAMLError:
-        return False, "Failed to parse YAML frontmatter"
-    
+        return 'error', "Failed to parse YAML frontmatter", None
+    if not isinstance(metadata, dict):
+        return 'error', "Failed to parse YAML frontmatter", None
+
+    if 'version' in metadata:
+        return 'unchanged', f"Already at version {metadata['version']}", None
+
     # Add versioning information
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    
-    if 'version' not in metadata:
-        metadata['version'] = "1.0.0"
-        metadata['created_date'] = current_date
-        metadata['last_updated'] = current_date
-    
-    # Write updated content
-    new_yaml = yaml.dump(metadata, default_flow_style=False, sort_keys=False).strip()
-    
-    new_lines = ['---'] + new_yaml.split('\n') + lines[yaml_end_idx:]
-    new_content = '\n'.join(new_lines)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(new_content)
-    
-    return True, f"Updated with version {metadata['version']}"
+    yaml_lines = lines[1:yaml_end_idx]
+    _set_field(yaml_lines, 'version', "1.0.0")
+    if 'created_date' not in metadata:
+        _set_field(yaml_lines, 'created_date', today)
+    _set_field(yaml_lines, 'last_updated', today)
+
+    new_content = '\n'.join(lines[:1] + yaml_lines + lines[yaml_end_idx:])
+    return 'changed', "Updated with version 1.0.0", new_content
+
+def plan_bump(content, recorded_hash, level='patch', today=None):
+    """Return (status, message, new_content) bumping the version if the body hash changed.
+
+    content must already carry a version (see plan_prompt_file).
+    """
+    if recorded_hash is None or recorded_hash == body_hash(content):
+        return 'unchanged', "Body unchanged", None
+
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    lines = content.split('\n')
+    yaml_end_idx = find_frontmatter_end(lines)
+    yaml_lines = lines[1:yaml_end_idx]
+    for i, line in enumerate(yaml_lines):
+        m = VERSION_RE.match(line)
+        if m:
+            version = '.'.join(part for part in m.groups()[1:] if part is not None)
+            new_version = bump_version(version, level)
+            yaml_lines[i] = f'version: {m.group(1)}{new_version}{m.group(1)}'
+            break
+    else:
+        return 'error', "Version is not a plain semantic version", None
+    _set_field(yaml_lines, 'last_updated', today)
+
+    new_content = '\n'.join(lines[:1] + yaml_lines + lines[yaml_end_idx:])
+    return 'changed', f"Bumped {version} -> {new_version}", new_content
+
+def version_file(filepath, recorded_hash=None, bump=None):
+    """Version one file in place; returns (status, message, body_hash).
+
+    With bump ('patch' or 'minor'), also bump the version when the body hash
+    differs from recorded_hash. Module-level for worker pools.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        status, message, new_content = plan_prompt_file(content)
+        if bump and status == 'unchanged':
+            status, message, new_content = plan_bump(content, recorded_hash, bump)
+        if status == 'changed':
+            write_atomic(filepath, new_content)
+            content = new_content
+        return status, message, body_hash(content)
+    except Exception as e:
+        return 'error', f"Error - {str(e)}", None
+
+def load_versions(root):
+    """Return the recorded {rel_path: body_sha256} map, or {} if there is none."""
+    try:
+        with open(os.path.join(root, VERSIONS_FILE), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if isinstance(data, dict) and data.get('format') == VERSIONS_FORMAT:
+        return data.get('prompts', {})
+    return {}
+
+def write_versions(root, hashes):
+    """Write the body hash map if it differs from what is on disk."""
+    if hashes == load_versions(root):
+        return False
+    text = json.dumps({'format': VERSIONS_FORMAT, 'prompts': dict(sorted(hashes.items()))}, indent=2)
+    write_atomic(os.path.join(root, VERSIONS_FILE), text + '\n')
+    return True
+
+def process_prompt_file(filepath):
+    """Add version information to a prompt file's YAML frontmatter"""
+    status, message, _ = version_file(filepath)
+    return status != 'error', message
 
 def main():
     """Process all prompt files in the repository"""
+    parser = argparse.ArgumentParser(description="Add version information to prompt files.")
+    parser.add_argument("--root", default='.', help="Root directory of the prompt library.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of parallel workers (0 = one per CPU).")
+    parser.add_argument("--bump", action="store_true",
+                        help=f"Bump the version of prompts whose body changed since the hashes in {VERSIONS_FILE}.")
+    parser.add_argument("--minor", action="store_true", help="With --bump, bump the minor instead of the patch version.")
+    args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
+
     prompt_files = []
-    
-    # Find all .prompt.md files
-    for root, dirs, files in os.walk('.'):
+
+    # Find all .prompt.md files; .gitignore is not honoured since synced repos ignore .github/prompts/
+    for root, _, files in walk(args.root, use_gitignore=False):
         for file in files:
             if file.endswith('.prompt.md'):
                 prompt_files.append(os.path.join(root, file))
-    
+    prompt_files.sort()
+
     print(f"Found {len(prompt_files)} prompt files to version")
-    
-    success_count = 0
-    error_count = 0
-    
-    for filepath in sorted(prompt_files):
-        try:
-            success, message = process_prompt_file(filepath)
-            if success:
-                print(f"✅ {filepath}: {message}")
-                success_count += 1
-            else:
-                print(f"❌ {filepath}: {message}")
-                error_count += 1
-        except Exception as e:
-            print(f"❌ {filepath}: Error - {str(e)}")
-            error_count += 1
-    
-    print(f"\n📊 Summary: {success_count} successful, {error_count} errors")
-    
-    if success_count > 0:
+
+    rel_paths = [os.path.relpath(filepath, args.root) for filepath in prompt_files]
+    recorded = load_versions(args.root) if args.bump else {}
+    bump = ('minor' if args.minor else 'patch') if args.bump else None
+    version_args = (prompt_files, [recorded.get(p) for p in rel_paths], [bump] * len(prompt_files))
+
+    if jobs > 1 and len(prompt_files) > 1:
+        chunksize = max(1, len(prompt_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(version_file, *version_args, chunksize=chunksize))
+    else:
+        results = list(map(version_file, *version_args))
+
+    counts = {'changed': 0, 'unchanged': 0, 'error': 0}
+    for filepath, (status, message, _) in zip(prompt_files, results):
+        counts[status] += 1
+        if status == 'changed':
+            print(f"✅ {filepath}: {message}")
+        elif status == 'error':
+            print(f"❌ {filepath}: {message}")
+
+    print(f"\n📊 Summary: {counts['changed']} updated, {counts['unchanged']} unchanged, {counts['error']} errors")
+
+    if args.bump:
+        # Files that failed keep their previous hash so they are retried next run.
+        hashes = {p: digest or recorded.get(p) for p, (_, _, digest) in zip(rel_paths, results)}
+        if write_versions(args.root, {p: h for p, h in hashes.items() if h}):
+            print(f"📝 Recorded body hashes in {VERSIONS_FILE}")
+
+    if counts['changed'] > 0:
+        from generate_index import INDEX_FILE, build_index
         print("\n🔄 Regenerating index file...")
-        os.system("python3 scripts/generate_index.py")
-        print("✅ Index file updated")
+        if build_index(args.root, jobs=jobs):
+            print(f"✅ Index file updated: {INDEX_FILE}")
+        else:
+            print(f"✅ Index file unchanged: {INDEX_FILE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
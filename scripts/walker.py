@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pruned, .gitignore-aware directory walker shared by the library scripts.
+
+`walk` is a drop-in replacement for os.walk built on os.scandir. It never
+descends into PRUNE_DIRS (VCS metadata, dependency trees, virtualenvs, caches)
+or into directories excluded by the .gitignore files it meets on the way down,
+and it does not follow symlinked directories unless asked to.
+"""
+import os
+
+from gitignore_rules import GitignoreMatcher
+
+PRUNE_DIRS = frozenset({
+    '.git', '.hg', '.svn',
+    'node_modules', 'bower_components', 'vendor',
+    '.venv', 'venv', '__pycache__', '.tox', '.nox',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache',
+    '.terraform', '.prompt_cache',
+})
+
+
+def _ignored(ignore_stack, rel_path, is_dir):
+    ignored = False
+    for base, matcher in ignore_stack:
+        if base:
+            if not rel_path.startswith(base + '/'):
+                continue
+            sub_path = rel_path[len(base) + 1:]
+        else:
+            sub_path = rel_path
+        result = matcher.match(sub_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def walk(root, prune_dirs=PRUNE_DIRS, use_gitignore=True, follow_symlinks=False):
+    """Yield (dirpath, dirnames, filenames) top-down, in os.walk order.
+
+    Pruned and ignored directories are left out of dirnames and never entered;
+    files excluded by .gitignore are left out of filenames.
+    """
+    stack = [(root, '', [])]
+    while stack:
+        dirpath, rel_dir, ignore_stack = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        if use_gitignore and any(entry.name == '.gitignore' and entry.is_file() for entry in entries):
+            try:
+                matcher = GitignoreMatcher.from_file(os.path.join(dirpath, '.gitignore'))
+                ignore_stack = ignore_stack + [(rel_dir, matcher)]
+            except OSError:
+                pass
+
+        dirnames = []
+        filenames = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if entry.name in prune_dirs:
+                    continue
+                if ignore_stack and _ignored(ignore_stack, rel_path, True):
+                    continue
+                dirnames.append(entry.name)
+            elif entry.is_file():
+                if ignore_stack and _ignored(ignore_stack, rel_path, False):
+                    continue
+                filenames.append(entry.name)
+
+        yield dirpath, dirnames, filenames
+
+        for name in reversed(dirnames):
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            stack.append((os.path.join(dirpath, name), rel_path, ignore_stack))
@@ -0,0 +1,78 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from benchmark_library import _read_strace_total, compare_results, generate_library, run_benchmarks
+from frontmatter_parser import read_frontmatter
+
+
+def test_generate_library_is_deterministic_and_parses(tmp_path):
+    paths = generate_library(str(tmp_path / 'a'), 40, seed=1)
+
+    assert paths == generate_library(str(tmp_path / 'b'), 40, seed=1)
+    assert len(paths) == len(set(paths)) == 40
+    assert sum(path.endswith('.mdc') for path in paths) == 4
+    for path in paths:
+        with open(tmp_path / 'a' / path) as a, open(tmp_path / 'b' / path) as b:
+            assert a.read() == b.read()
+        record = read_frontmatter(str(tmp_path / 'a' / path))
+        assert record['error'] is None
+        if path.endswith('.prompt.md'):
+            assert record['frontmatter']['id'].startswith('bench-prompt-')
+            assert isinstance(record['frontmatter']['tags'], list)
+
+
+def test_run_benchmarks_records_every_benchmark(tmp_path):
+    results = run_benchmarks([30], str(tmp_path), repeat=1, log=lambda *a: None)
+
+    assert [r['benchmark'] for r in results] == [
+        'generate_index (cold)', 'generate_index (warm)', 'prompt_cli search', 'prompt_cli show',
+        'prompt_cli lint', 'version_prompts (first run)', 'version_prompts (no-op)',
+    ]
+    for result in results:
+        assert result['exit_code'] == 0
+        assert result['wall_s'] > 0 and result['peak_rss_kb'] > 0
+        # Without strace only the main process's read/write syscalls are counted.
+        assert result['syscall_source'] == 'proc-io' and result['syscalls'] is None
+    assert not os.path.exists(tmp_path / 'library-30')
+
+
+def test_compare_results_flags_wall_time_regressions():
+    baseline = {'results': [
+        {'size': 1000, 'benchmark': 'prompt_cli lint', 'wall_s': 1.0, 'peak_rss_kb': 100},
+        {'size': 1000, 'benchmark': 'prompt_cli show', 'wall_s': 1.0, 'peak_rss_kb': 100},
+    ]}
+    current = {'results': [
+        {'size': 1000, 'benchmark': 'prompt_cli lint', 'wall_s': 1.5, 'peak_rss_kb': 100},
+        {'size': 1000, 'benchmark': 'prompt_cli show', 'wall_s': 1.1, 'peak_rss_kb': 200},
+        {'size': 10000, 'benchmark': 'prompt_cli show', 'wall_s': 9.0, 'peak_rss_kb': 200},
+    ]}
+
+    rows, regressions = compare_results(baseline, current, threshold=0.2)
+
+    assert regressions == 1
+    assert [(row['benchmark'], row['regressed']) for row in rows] == [('prompt_cli lint', True), ('prompt_cli show', False)]
+    assert rows[1]['rss_ratio'] == 2.0
+
+
+@pytest.mark.parametrize("summary", [
+    # strace 5.x and later: usecs/call is filled in on the total line, errors may be blank.
+    "% time     seconds  usecs/call     calls    errors syscall\n"
+    "------ ----------- ----------- --------- --------- ----------------\n"
+    " 60.00    0.000600           2       300           read\n"
+    " 40.00    0.000400           2       212        23 openat\n"
+    "------ ----------- ----------- --------- --------- ----------------\n"
+    "100.00    0.001000           1       512        23 total\n",
+    # Older strace leaves usecs/call blank on the total line.
+    "% time     seconds  usecs/call     calls    errors syscall\n"
+    "------ ----------- ----------- --------- --------- ----------------\n"
+    "100.00    0.001000                   512           total\n",
+])
+def test_read_strace_total(tmp_path, summary):
+    report = tmp_path / 'strace.txt'
+    report.write_text(summary)
+    assert _read_strace_total(str(report)) == 512
+    assert _read_strace_total(str(tmp_path / 'missing.txt')) is None
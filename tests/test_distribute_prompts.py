@@ -0,0 +1,171 @@
+import pytest
+import json
+import os
+import sys
+import tarfile
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from distribute_prompts import MANIFEST_FILE, _safe_destination, install, pack, plan_sources, sync, sync_many
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "library"
+    (root / "aiops").mkdir(parents=True)
+    (root / "aiops" / "a.prompt.md").write_text("A")
+    (root / "aiops" / "notes.md").write_text("not distributed")
+    (root / ".rules").mkdir()
+    (root / ".rules" / "python.mdc").write_text("rule")
+    (root / ".vscode").mkdir()
+    (root / ".vscode" / "settings.json").write_text("{}")
+    return root
+
+def test_plan_sources_flattens_like_copy_prompts(library):
+    (library / "dup").mkdir()
+    (library / "dup" / "a.prompt.md").write_text("other")
+    assert plan_sources(str(library)) == {
+        ".github/prompts/a.prompt.md": "aiops/a.prompt.md",
+        ".rules/python.mdc": ".rules/python.mdc",
+        ".vscode/settings.json": ".vscode/settings.json",
+    }
+
+def test_plan_sources_does_not_honour_gitignore(library):
+    (library / ".gitignore").write_text(".rules/\n.vscode/\n")
+    assert ".rules/python.mdc" in plan_sources(str(library))
+
+def test_resync_is_a_no_op(library, tmp_path):
+    target = tmp_path / "target"
+    assert sync(str(library), str(target)) == {'copied': 3, 'unchanged': 0, 'removed': 0}
+    assert (target / ".github" / "prompts" / "a.prompt.md").read_text() == "A"
+
+    prompt = target / ".github" / "prompts" / "a.prompt.md"
+    mtime = prompt.stat().st_mtime_ns
+    manifest_mtime = (target / MANIFEST_FILE).stat().st_mtime_ns
+    assert sync(str(library), str(target)) == {'copied': 0, 'unchanged': 3, 'removed': 0}
+    assert prompt.stat().st_mtime_ns == mtime
+    assert (target / MANIFEST_FILE).stat().st_mtime_ns == manifest_mtime
+
+def test_changed_files_are_copied_and_removed_files_deleted(library, tmp_path):
+    target = tmp_path / "target"
+    sync(str(library), str(target))
+    (library / "aiops" / "a.prompt.md").write_text("A2")
+    (library / ".rules" / "python.mdc").unlink()
+    (target / ".rules" / "local.mdc").write_text("mine")
+
+    assert sync(str(library), str(target)) == {'copied': 1, 'unchanged': 1, 'removed': 1}
+    assert (target / ".github" / "prompts" / "a.prompt.md").read_text() == "A2"
+    assert not (target / ".rules" / "python.mdc").exists()
+    assert (target / ".rules" / "local.mdc").read_text() == "mine"
+    assert set(json.loads((target / MANIFEST_FILE).read_text())['files']) == {
+        ".github/prompts/a.prompt.md", ".vscode/settings.json",
+    }
+
+def test_dry_run_writes_nothing(library, tmp_path):
+    target = tmp_path / "target"
+    assert sync(str(library), str(target), dry_run=True)['copied'] == 3
+    assert not target.exists()
+
+@pytest.mark.parametrize("link", ["hardlink", "reflink"])
+def test_link_modes(library, tmp_path, link):
+    target = tmp_path / "target"
+    sync(str(library), str(target), link=link)
+    copied = target / ".github" / "prompts" / "a.prompt.md"
+    assert copied.read_text() == "A"
+    if link == "hardlink":
+        assert os.path.samefile(copied, library / "aiops" / "a.prompt.md")
+
+def test_sync_many_reads_library_once(library, tmp_path, monkeypatch):
+    import distribute_prompts
+    hashed = []
+    real_hash = distribute_prompts.file_hash
+    monkeypatch.setattr(distribute_prompts, 'file_hash', lambda path: hashed.append(path) or real_hash(path))
+    targets = [str(tmp_path / f"target{i}") for i in range(4)]
+
+    results = list(sync_many(str(library), targets, jobs=3))
+    assert [r['target'] for r in results] == targets
+    assert all(r['copied'] == 3 and r['error'] is None for r in results)
+    assert sorted(p for p in hashed if p.startswith(str(library))) == sorted(
+        str(library / p) for p in ("aiops/a.prompt.md", ".rules/python.mdc", ".vscode/settings.json"))
+
+def test_sync_command_fans_out_from_config(library, tmp_path, monkeypatch, capsys):
+    import distribute_prompts
+    targets = [tmp_path / "one", tmp_path / "two"]
+    config = tmp_path / "symlink_config.json"
+    config.write_text(json.dumps({'repositories': [{'path': str(t), 'symlinks': {}} for t in targets]}))
+    (tmp_path / "blocked").write_text("a file, not a directory")
+    monkeypatch.setattr(sys, 'argv', ['distribute_prompts.py', '--root', str(library), 'sync',
+                                      str(tmp_path / "blocked"), '--config', str(config), '--jobs', '2'])
+
+    with pytest.raises(SystemExit) as exc:
+        distribute_prompts.main()
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "3 targets, 1 failed, 6 copied" in out
+    assert f"FAILED {tmp_path / 'blocked'}" in out
+    assert all((t / ".rules" / "python.mdc").exists() for t in targets)
+
+def test_pack_and_install_roundtrip(library, tmp_path):
+    (library / "templates" / "gitignore").mkdir(parents=True)
+    (library / "templates" / "gitignore" / "base.gitignore").write_text(".DS_Store\n")
+    (library / "PROMPT_RULE_INDEX.md").write_text("# Index\n")
+    output, manifest = pack(str(library), str(tmp_path / "bundle.tar.gz"), version="1.2.3")
+    assert output == str(tmp_path / "bundle.tar.gz")
+    assert {e['path'] for e in manifest['files'] if not e['install_to']} == {
+        "templates/gitignore/base.gitignore", "PROMPT_RULE_INDEX.md",
+    }
+
+    target = tmp_path / "target"
+    counts = install(output, str(target))
+    assert counts == {'installed': 3, 'unchanged': 0, 'removed': 0, 'version': "1.2.3"}
+    assert (target / ".github" / "prompts" / "a.prompt.md").read_text() == "A"
+    assert not (target / "PROMPT_RULE_INDEX.md").exists()
+
+    mtime = (target / ".rules" / "python.mdc").stat().st_mtime_ns
+    assert install(output, str(target))['unchanged'] == 3
+    assert (target / ".rules" / "python.mdc").stat().st_mtime_ns == mtime
+    # The target manifest is shared with sync, so either can follow the other.
+    assert sync(str(library), str(target)) == {'copied': 0, 'unchanged': 3, 'removed': 0}
+
+def test_install_updates_changed_files_and_removes_dropped_ones(library, tmp_path):
+    target = tmp_path / "target"
+    install(pack(str(library), str(tmp_path / "v1.tar.gz"))[0], str(target))
+    (library / "aiops" / "a.prompt.md").write_text("A2")
+    (library / ".vscode" / "settings.json").unlink()
+
+    counts = install(pack(str(library), str(tmp_path / "v2.tar.gz"))[0], str(target))
+    assert (counts['installed'], counts['unchanged'], counts['removed']) == (1, 1, 1)
+    assert (target / ".github" / "prompts" / "a.prompt.md").read_text() == "A2"
+    assert not (target / ".vscode" / "settings.json").exists()
+
+def test_pack_stores_symlinked_sources_as_files(tmp_path):
+    root = tmp_path / "library"
+    root.mkdir()
+    (tmp_path / "real.md").write_text("linked")
+    (root / "a.prompt.md").symlink_to(tmp_path / "real.md")
+    target = tmp_path / "target"
+
+    assert install(pack(str(root), str(tmp_path / "b.tar.gz"))[0], str(target))['installed'] == 1
+    assert (target / ".github" / "prompts" / "a.prompt.md").read_text() == "linked"
+
+def test_truncated_bundle_leaves_target_untouched(library, tmp_path):
+    target = tmp_path / "target"
+    install(pack(str(library), str(tmp_path / "v1.tar.gz"))[0], str(target))
+    (library / "aiops" / "a.prompt.md").write_text("A2")
+    (library / ".rules" / "python.mdc").write_text("rule2")
+    full, _ = pack(str(library), str(tmp_path / "v2.tar.gz"))
+    with tarfile.open(full) as src, tarfile.open(tmp_path / "cut.tar.gz", "w:gz") as dst:
+        for member in src.getmembers()[:-1]:
+            dst.addfile(member, src.extractfile(member))
+    manifest_before = (target / MANIFEST_FILE).read_text()
+
+    with pytest.raises(ValueError, match="truncated"):
+        install(str(tmp_path / "cut.tar.gz"), str(target))
+    assert (target / ".github" / "prompts" / "a.prompt.md").read_text() == "A"
+    assert (target / ".rules" / "python.mdc").read_text() == "rule"
+    assert (target / MANIFEST_FILE).read_text() == manifest_before
+    assert not [p for p in os.listdir(target) if p.startswith(".prompt-install-")]
+
+def test_install_rejects_paths_outside_target():
+    with pytest.raises(ValueError):
+        _safe_destination("../escape.md")
@@ -0,0 +1,53 @@
+import pytest
+import os
+import sys
+
+import yaml
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from frontmatter_parser import load_yaml, parse_flat, read_frontmatter
+
+@pytest.mark.parametrize("text", [
+    'title: "Azure AKS Cluster Analysis"\nversion: "1.0.0"',
+    "name: Plain Title\nalwaysApply: false",
+    "# comment\ndescription: 'single quoted'",
+])
+def test_parse_flat_matches_pyyaml(text):
+    assert parse_flat(text) == yaml.safe_load(text)
+
+@pytest.mark.parametrize("text", [
+    "tags:\n  - a\n  - b",
+    "tags: [a, b]",
+    "created_date: 2024-01-01",
+    "enabled: yes",
+    "version: 1.0",
+])
+def test_parse_flat_defers_non_flat_yaml(text):
+    assert parse_flat(text) is None
+    assert load_yaml(text) == yaml.safe_load(text)
+
+def test_read_frontmatter_reports_body_offset(tmp_path):
+    content = "---\nname: Test\n---\n# Heading\nBody text.\n"
+    file_path = tmp_path / "test.prompt.md"
+    file_path.write_text(content)
+    record = read_frontmatter(str(file_path))
+    assert record['frontmatter'] == {'name': 'Test'}
+    assert record['error'] is None
+    assert content.encode()[record['body_offset']:] == b"# Heading\nBody text.\n"
+
+def test_read_frontmatter_title_fallback_only_when_name_missing(tmp_path):
+    named = tmp_path / "named.md"
+    named.write_text("---\nname: Test\n---\n\n# Heading\n")
+    unnamed = tmp_path / "unnamed.md"
+    unnamed.write_text("---\ndescription: Test\n---\n\n# Heading\n")
+    assert read_frontmatter(str(named))['title'] is None
+    assert read_frontmatter(str(unnamed))['title'] == "Heading"
+
+def test_read_frontmatter_invalid_yaml(tmp_path):
+    file_path = tmp_path / "bad.md"
+    file_path.write_text("---\nversion: \"1.1.0\"\n  - invalid: yaml\n---\n")
+    record = read_frontmatter(str(file_path))
+    assert record['frontmatter'] == {}
+    assert record['error']
@@ -0,0 +1,40 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from fuzzy_index import TrigramIndex, trigrams
+
+def _entry(path, frontmatter, sha256="1"):
+    return {'path': path, 'frontmatter': frontmatter, 'sha256': sha256}
+
+@pytest.fixture
+def entries():
+    return [
+        _entry(".github/prompts/analyze_kubernetes_policy_manifests.prompt.md", {'title': "Kubernetes Policy Analysis"}),
+        _entry(".github/prompts/analyze_kubernetes_manifests.prompt.md", {'title': "Kubernetes Manifests"}),
+        _entry(".github/prompts/build_terraform_evaluation.prompt.md", {'id': "terraform-eval", 'tags': ["iac"]}),
+    ]
+
+def test_trigrams_are_padded():
+    assert trigrams("abc") == {"$ab", "abc", "bc$"}
+
+def test_fuzzy_search_tolerates_typos(tmp_path, entries):
+    index = TrigramIndex(str(tmp_path))
+    index.update(entries)
+    results = index.search("kubernets polcy")
+    assert results[0][0] == ".github/prompts/analyze_kubernetes_policy_manifests.prompt.md"
+    assert ".github/prompts/build_terraform_evaluation.prompt.md" not in dict(results)
+    assert index.search("terrafrom", limit=1)[0][0] == ".github/prompts/build_terraform_evaluation.prompt.md"
+
+def test_fuzzy_index_updates_incrementally(tmp_path, entries):
+    index = TrigramIndex(str(tmp_path))
+    index.update(entries)
+    index.save()
+
+    reloaded = TrigramIndex(str(tmp_path))
+    reloaded.update(entries[1:] + [_entry("new/helm_charts.prompt.md", {'name': "Helm Charts"}, "2")])
+    assert "polici" not in reloaded.words and "policy" not in reloaded.words
+    assert reloaded.search("helm chrts")[0][0] == "new/helm_charts.prompt.md"
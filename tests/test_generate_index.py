@@ -6,7 +6,8 @@ from datetime import datetime
 # Add the scripts directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
 
-from generate_index import extract_metadata
+from generate_index import SectionCache, collect_prompts, extract_metadata, render_index, write_index
+from metadata_cache import MetadataCache
 
 @pytest.fixture
 def temp_markdown_file(tmp_path):
@@ -87,3 +88,44 @@ Some content here.
     assert title is None
     assert description == "Test Description"
     assert category == "Test Category"
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_parallel_index_matches_serial(tmp_path, executor):
+    for i in range(12):
+        folder = tmp_path / f"group_{i % 3}"
+        folder.mkdir(exist_ok=True)
+        (folder / f"prompt_{i}.prompt.md").write_text(
+            f"---\nname: Prompt {i}\nid: prompt-{i}\ntags: [a, b]\n---\n\n# Prompt {i}\n"
+        )
+
+    serial = render_index(collect_prompts(str(tmp_path), MetadataCache(str(tmp_path), enabled=False)))
+    parallel = render_index(collect_prompts(str(tmp_path), MetadataCache(str(tmp_path), enabled=False), jobs=4, executor=executor))
+    assert parallel == serial
+
+def test_incremental_render_only_touches_changed_categories(tmp_path):
+    for group in ("alpha", "beta"):
+        (tmp_path / group).mkdir()
+        (tmp_path / group / "p.prompt.md").write_text(f"---\nname: {group}\n---\n")
+
+    cache = MetadataCache(str(tmp_path))
+    sections = SectionCache(str(tmp_path), cache)
+    first = render_index(collect_prompts(str(tmp_path), cache), sections)
+    cache.save()
+    sections.save(["alpha", "beta"])
+    assert sorted(sections.rendered) == ["alpha", "beta"]
+
+    (tmp_path / "beta" / "p.prompt.md").write_text("---\nname: beta renamed\n---\n")
+    cache = MetadataCache(str(tmp_path))
+    sections = SectionCache(str(tmp_path), cache)
+    all_prompts = collect_prompts(str(tmp_path), cache)
+    second = render_index(all_prompts, sections)
+    assert sections.rendered == ["beta"]
+    assert second == render_index(all_prompts)
+    assert second != first
+
+def test_write_index_skips_identical_content(tmp_path):
+    index_path = str(tmp_path / "PROMPT_RULE_INDEX.md")
+    assert write_index(index_path, "# Index\n") is True
+    mtime = os.stat(index_path).st_mtime_ns
+    assert write_index(index_path, "# Index\n") is False
+    assert os.stat(index_path).st_mtime_ns == mtime
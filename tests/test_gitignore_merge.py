@@ -0,0 +1,76 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from gitignore_merge import BANNER, HEADER, dedupe, load_templates, merge, merge_file
+from gitignore_rules import GitignoreMatcher
+
+TEMPLATES = [('base', ['# Logs', '*.log', '.env', '!.env.example', '']), ('python', ['*.pyc', '/build/', ''])]
+
+
+def _old_shell_merge(existing):
+    """What copy-prompts.sh used to write: everything generated, then the whole old file."""
+    text = HEADER + '\n'
+    for _, lines in TEMPLATES:
+        text += '\n'.join(lines) + '\n\n'
+    return text + '\n'.join(BANNER) + '\n' + existing
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (["a", "b", "a"], ["a", "b", None]),
+    (["a", "/a/", "a/"], ["a", "/a/", "a/"]),
+    (["/a/b", "a/b"], ["/a/b", None]),
+    (["*.log", "!keep.log", "*.log"], [None, "!keep.log", "*.log"]),
+    (["# c", "", "# c", "x", "x "], ["# c", "", "# c", "x", None]),
+])
+def test_dedupe(lines, expected):
+    assert dedupe(lines) == expected
+
+
+def test_merge_flattens_nested_output_and_is_idempotent():
+    nested = 'dist/\n*.log\n!keep.log\n# mine\nsecret.txt\n'
+    for _ in range(3):
+        nested = _old_shell_merge(nested)
+
+    merged, removed = merge(TEMPLATES, nested)
+
+    assert removed == 1
+    assert merged.count(BANNER[1]) == 1
+    # The template's *.log is overridden by the custom copy that follows a negation, so that copy is kept.
+    assert merged.endswith(BANNER[2] + '\ndist/\n*.log\n!keep.log\n# mine\nsecret.txt\n')
+    assert merge(TEMPLATES, merged)[0] == merged
+    for path in ['keep.log', 'a.log', '.env', '.env.example', 'dist/x', 'build/x', 'secret.txt', 'src/a.py']:
+        assert GitignoreMatcher(merged.splitlines()).is_ignored(path) == GitignoreMatcher(nested.splitlines()).is_ignored(path)
+
+
+def test_merge_keeps_patterns_edited_into_generated_section():
+    merged, _ = merge(TEMPLATES)
+    edited = merged.replace('*.pyc\n', '*.pyc\n*.sqlite\n')
+
+    remerged, _ = merge(TEMPLATES, edited)
+
+    assert remerged.endswith(BANNER[2] + '\n*.sqlite\n')
+
+
+def test_merge_file_writes_only_on_change(tmp_path):
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'base.gitignore').write_text('*.log\n')
+    (templates / 'python.gitignore').write_text('*.pyc\n')
+    gitignore = tmp_path / '.gitignore'
+    gitignore.write_text('*.log\n.idea/\n')
+
+    assert [name for name, _ in load_templates(str(templates), ['python', 'unknown', 'chef'])] == ['base', 'python']
+    assert merge_file(str(gitignore), ['python'], str(templates), dry_run=True)[0] is True
+    assert gitignore.read_text() == '*.log\n.idea/\n'
+
+    changed, removed, merged = merge_file(str(gitignore), ['python'], str(templates))
+    assert (changed, removed) == (True, 1)
+    assert gitignore.read_text() == merged
+    mtime = gitignore.stat().st_mtime_ns
+
+    assert merge_file(str(gitignore), ['python'], str(templates))[0] is False
+    assert gitignore.stat().st_mtime_ns == mtime
@@ -0,0 +1,29 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from gitignore_rules import GitignoreMatcher
+
+@pytest.mark.parametrize("lines, path, expected", [
+    (["*.pem"], ".chef/x.pem", True),
+    (["/anchored.txt"], "sub/anchored.txt", False),
+    (["/anchored.txt"], "anchored.txt", True),
+    (["docs/**/secret"], "docs/a/b/secret", True),
+    (["**/.terraform/*"], "mod/.terraform/plugins", True),
+    (["logs/"], "logs", False),
+    (["logs/"], "logs/app.txt", True),
+    (["*.log", "!keep.log"], "keep.log", False),
+    (["!keep.log", "*.log"], "keep.log", True),
+    (["[Bb]uild-[0-9].out"], "Build-3.out", True),
+    (["a?c.txt"], "abbc.txt", False),
+])
+def test_gitignore_semantics(lines, path, expected):
+    assert GitignoreMatcher(lines).is_ignored(path) is expected
+
+def test_match_reports_no_rule_as_none():
+    matcher = GitignoreMatcher(["# comment", "", "*.tmp"])
+    assert matcher.match("notes.txt") is None
+    assert matcher.match("a.tmp") is True
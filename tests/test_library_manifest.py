@@ -0,0 +1,101 @@
+import pytest
+import os
+import sys
+from argparse import Namespace
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import prompt_cli
+from library_manifest import (
+    build_id_map, build_manifest, load_id_entry, load_manifest, walk_library, write_id_map, write_manifest,
+)
+from metadata_cache import MetadataCache
+
+@pytest.fixture
+def library(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "a.prompt.md").write_text("---\nid: a\nname: A\ntags: [x]\n---\n\n# A\nBody.\n")
+    (tmp_path / "README.md").write_text("# Readme\n")
+    cache = MetadataCache(str(tmp_path))
+    filepaths, watched = walk_library(str(tmp_path))
+    cache.get_many(filepaths)
+    cache.save()
+    manifest = build_manifest(str(tmp_path), filepaths, watched, cache)
+    write_manifest(str(tmp_path), manifest)
+    write_id_map(str(tmp_path), build_id_map(manifest['prompts']))
+    return tmp_path
+
+def test_manifest_records_prompt_fields(library):
+    manifest = load_manifest(str(library))
+    entry = next(p for p in manifest['prompts'] if p['id'] == 'a')
+    assert entry['path'] == os.path.join("prompts", "a.prompt.md")
+    assert entry['name'] == "A"
+    assert entry['tags'] == ["x"]
+    body = (library / entry['path']).read_bytes()[entry['body_offset']:]
+    assert body == b"\n# A\nBody.\n"
+
+def test_manifest_goes_stale_on_change(library):
+    (library / "prompts" / "b.prompt.md").write_text("---\nid: b\n---\n")
+    assert load_manifest(str(library)) is None
+
+def test_cli_uses_fresh_manifest_without_walking(library, monkeypatch):
+    def _no_walk(root):
+        raise AssertionError("walked the tree despite a fresh manifest")
+    monkeypatch.setattr(prompt_cli, 'walk_library', _no_walk)
+    prompts = prompt_cli._get_all_prompts(str(library))
+    assert [p['id'] for p in prompts] == ['a']
+
+def test_show_resolves_id_without_loading_library(library, monkeypatch, capsys):
+    def _no_load(root, use_cache=True):
+        raise AssertionError("loaded the library despite a fresh id map")
+    monkeypatch.setattr(prompt_cli, '_load_library', _no_load)
+    prompt_cli.show_prompt(Namespace(root=str(library), prompt_id='a', no_cache=False))
+    out = capsys.readouterr().out
+    assert "(ID: a)" in out
+    assert out.rstrip().endswith("# A\nBody.")
+
+def test_show_rebuilds_stale_id_entry(library, capsys):
+    (library / "prompts" / "a.prompt.md").write_text("---\nid: a\nname: A\n---\nNew body.\n")
+    assert load_id_entry(str(library), 'a') is None
+    prompt_cli.show_prompt(Namespace(root=str(library), prompt_id='a', no_cache=False))
+    assert capsys.readouterr().out.rstrip().endswith("New body.")
+    assert load_id_entry(str(library), 'a') is not None
+
+def test_show_caches_unknown_ids_while_library_is_unchanged(library, monkeypatch, capsys):
+    ids_path = library / ".prompt_cache" / "ids.json"
+    args = Namespace(root=str(library), prompt_id='nope', no_cache=False)
+    prompt_cli.show_prompt(args)
+    assert "not found" in capsys.readouterr().out
+    mtime = ids_path.stat().st_mtime_ns
+
+    def _no_load(root, use_cache=True, jobs=1):
+        raise AssertionError("rebuilt the library for an id already known to be missing")
+    monkeypatch.setattr(prompt_cli, '_load_manifest', _no_load)
+    prompt_cli.show_prompt(args)
+    assert "not found" in capsys.readouterr().out
+    assert ids_path.stat().st_mtime_ns == mtime
+
+    monkeypatch.undo()
+    (library / "prompts" / "nope.prompt.md").write_text("---\nid: nope\nname: Nope\n---\nFound.\n")
+    prompt_cli.show_prompt(args)
+    assert capsys.readouterr().out.rstrip().endswith("Found.")
+
+def test_write_id_map_skips_unchanged_content(library):
+    manifest = load_manifest(str(library))
+    ids = build_id_map(manifest['prompts'])
+    assert write_id_map(str(library), ids, manifest) is True
+    assert write_id_map(str(library), ids, manifest) is False
+
+def test_library_in_synced_repo_ignores_gitignore(tmp_path):
+    from distribute_prompts import sync
+    library = tmp_path / "library"
+    (library / "aiops").mkdir(parents=True)
+    (library / "aiops" / "a.prompt.md").write_text("---\nid: a\nname: A\n---\nBody\n")
+    target = tmp_path / "target"
+    sync(str(library), str(target))
+    # copy-prompts.sh ignores the synced locations in the target repository.
+    (target / ".gitignore").write_text(".github/prompts/\n.rules/\n.vscode/\n")
+
+    prompts = prompt_cli._get_all_prompts(str(target))
+    assert [p['id'] for p in prompts] == ['a']
@@ -0,0 +1,124 @@
+import pytest
+import json
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from lint_engine import RULES, format_json, format_sarif, format_text, run_lint, select_rules
+import prompt_cli
+
+PROMPTS = [
+    {'path': 'a.prompt.md', 'id': 'a', 'name': 'A', 'description': 'd', 'version': '1.0.0'},
+    {'path': 'b.prompt.md', 'name': 'B', 'tags': 'oops'},
+    {'path': 'c.prompt.md', 'id': 'c', 'name': 'C'},
+]
+
+def test_select_and_disable_accept_ids_and_names():
+    assert select_rules() == sorted(RULES)
+    assert select_rules(select=['PL001', 'missing-name']) == ['PL001', 'PL002']
+    assert 'PL004' not in select_rules(disable=['missing-version'])
+    with pytest.raises(ValueError):
+        select_rules(disable=['nope'])
+
+def test_run_lint_counts_prompts_with_errors():
+    issues, errors = run_lint(PROMPTS)
+    assert errors == 1
+    assert {(i['rule'], i['path']) for i in issues if i['severity'] == 'ERROR'} == {
+        ('PL001', 'b.prompt.md'), ('PL005', 'b.prompt.md'),
+    }
+    issues, errors = run_lint(PROMPTS, select_rules(select=['PL004']))
+    assert errors == 0
+    assert [i['path'] for i in issues] == ['b.prompt.md', 'c.prompt.md']
+
+def test_parallel_lint_matches_serial():
+    assert run_lint(PROMPTS * 5, jobs=2) == run_lint(PROMPTS * 5)
+
+def test_formats():
+    issues, errors = run_lint(PROMPTS)
+    text = format_text(issues, errors)
+    assert "[ERROR] b.prompt.md: Missing 'id' in frontmatter." in text
+    assert text.endswith("Linting completed with 1 errors.")
+    assert json.loads(format_json(issues, errors))['errors'] == 1
+
+    sarif = json.loads(format_sarif(issues, errors, ['PL001', 'PL005']))
+    run = sarif['runs'][0]
+    assert sarif['version'] == '2.1.0'
+    assert [r['id'] for r in run['tool']['driver']['rules']] == ['PL001', 'PL005']
+    assert run['results'][0]['locations'][0]['physicalLocation']['artifactLocation']['uri'] == 'b.prompt.md'
+
+def test_cli_lints_only_given_files(tmp_path, monkeypatch, capsys):
+    (tmp_path / "good.prompt.md").write_text("---\nid: g\nname: G\ndescription: d\nversion: 1.0.0\n---\nBody\n")
+    (tmp_path / "bad.prompt.md").write_text("---\nname: B\n---\nBody\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['prompt_cli.py', '--root', str(tmp_path), 'lint',
+                                      '--format', 'json', '--fail-on', 'error', 'good.prompt.md'])
+    prompt_cli.main()
+    assert json.loads(capsys.readouterr().out) == {'issues': [], 'errors': 0}
+
+    monkeypatch.setattr(sys, 'argv', ['prompt_cli.py', '--root', str(tmp_path), 'lint',
+                                      '--format', 'json', '--fail-on', 'error', 'bad.prompt.md'])
+    with pytest.raises(SystemExit) as exc:
+        prompt_cli.main()
+    assert exc.value.code == 1
+    assert json.loads(capsys.readouterr().out)['issues'][0]['path'] == 'bad.prompt.md'
+
+def test_cross_file_rules(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "x.prompt.md").write_text("---\nid: x\n---\nSee [other](../b/x.prompt.md) and [gone](missing.md).\n")
+    (tmp_path / "b" / "x.prompt.md").write_text("---\nid: x\n---\n```\n[not a link](nowhere.md)\n```\n[ph](link)\n")
+    prompts = [{'path': 'a/x.prompt.md', 'id': 'x'}, {'path': 'b/x.prompt.md', 'id': 'x'}]
+    rule_ids = select_rules(select=['PL101', 'PL102', 'PL103'])
+    issues, errors = run_lint(prompts, rule_ids, root=str(tmp_path))
+    found = {(i['rule'], i['path']) for i in issues}
+    assert found == {
+        ('PL101', 'b/x.prompt.md'),
+        ('PL102', 'a/x.prompt.md'), ('PL102', 'b/x.prompt.md'),
+        ('PL103', 'a/x.prompt.md'),
+    }
+    assert errors == 1
+
+    issues, _ = run_lint(prompts[:1], rule_ids, root=str(tmp_path), library=prompts, only={'a/x.prompt.md'})
+    assert {i['path'] for i in issues} == {'a/x.prompt.md'}
+    assert {i['rule'] for i in issues} == {'PL101', 'PL102', 'PL103'}
+
+@pytest.mark.parametrize("path, message", [
+    ("missing.prompt.md", "No such file: missing.prompt.md"),
+    ("../outside.prompt.md", "is outside the library root"),
+])
+def test_cli_rejects_missing_and_outside_files(tmp_path, monkeypatch, capsys, path, message):
+    (tmp_path / "outside.prompt.md").write_text("---\nid: o\n---\n")
+    (tmp_path / "lib").mkdir()
+    monkeypatch.chdir(tmp_path / "lib")
+    monkeypatch.setattr(sys, 'argv', ['prompt_cli.py', '--root', str(tmp_path / "lib"), 'lint', path])
+    with pytest.raises(SystemExit) as exc:
+        prompt_cli.main()
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
+    assert not (tmp_path / "lib" / ".prompt_cache").exists()
+
+def test_link_rule_reads_only_linted_files(tmp_path, monkeypatch):
+    import lint_engine
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.prompt.md").write_text(f"---\nid: {name}\n---\n[gone](missing-{name}.md)\n")
+    library = [{'path': f"{name}.prompt.md", 'id': name} for name in ("a", "b", "c")]
+    opened = []
+    monkeypatch.setattr(lint_engine, 'open', lambda path, *a, **k: opened.append(path) or open(path, *a, **k), raising=False)
+
+    issues, _ = run_lint(library[:1], select_rules(select=['PL103']), root=str(tmp_path), library=library, only={'a.prompt.md'})
+
+    assert [i['path'] for i in issues] == ['a.prompt.md']
+    assert opened == [os.path.join(str(tmp_path), 'a.prompt.md')]
+
+@pytest.mark.parametrize("linted", ["a/one.prompt.md", "b/two.prompt.md"])
+def test_cli_reports_duplicate_id_for_a_single_file(tmp_path, monkeypatch, capsys, linted):
+    for rel_path in ("a/one.prompt.md", "b/two.prompt.md"):
+        (tmp_path / rel_path).parent.mkdir()
+        (tmp_path / rel_path).write_text("---\nid: dup\nname: N\ndescription: d\nversion: 1.0.0\n---\nBody\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['prompt_cli.py', '--root', str(tmp_path), 'lint', '--format', 'json', linted])
+    prompt_cli.main()
+    issues = json.loads(capsys.readouterr().out)['issues']
+    assert [(i['rule'], i['path']) for i in issues] == [('PL101', linted)]
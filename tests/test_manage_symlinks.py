@@ -0,0 +1,90 @@
+import pytest
+import json
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import manage_symlinks
+from manage_symlinks import apply_plan, plan_repo
+
+@pytest.fixture
+def setup(tmp_path):
+    library = tmp_path / "library"
+    (library / ".rules").mkdir(parents=True)
+    for name in ("a.mdc", "b.mdc", "c.mdc"):
+        (library / ".rules" / name).write_text(name)
+    repo = tmp_path / "repo"
+    rules = repo / ".rules"
+    rules.mkdir(parents=True)
+    os.symlink(str(library / ".rules" / "a.mdc"), rules / "a.mdc")           # correct
+    os.symlink(str(library / ".rules" / "c.mdc"), rules / "b.mdc")           # wrong target
+    os.symlink(str(library / ".rules" / "gone.mdc"), rules / "gone.mdc")     # orphan
+    (rules / "local.mdc").write_text("mine")                                 # unmanaged file
+    config = {'path': str(repo), 'symlinks': {'.rules': ["*"]}}
+    return library, repo, config
+
+def _ops(operations):
+    return {(o['op'], os.path.basename(o['link'])) for o in operations}
+
+def test_plan_classifies_links(setup):
+    library, repo, config = setup
+    assert _ops(plan_repo(config, str(library))) == {
+        ('no-op', 'a.mdc'), ('fix', 'b.mdc'), ('create', 'c.mdc'), ('remove-orphan', 'gone.mdc'),
+    }
+
+def test_apply_converges_and_leaves_other_files(setup):
+    library, repo, config = setup
+    assert apply_plan(plan_repo(config, str(library))) == 0
+    assert {o['op'] for o in plan_repo(config, str(library))} == {'no-op'}
+    assert os.readlink(repo / ".rules" / "b.mdc") == str(library / ".rules" / "b.mdc")
+    assert not os.path.lexists(repo / ".rules" / "gone.mdc")
+    assert (repo / ".rules" / "local.mdc").read_text() == "mine"
+
+def test_regular_file_is_only_replaced_with_force(setup):
+    library, repo, config = setup
+    os.remove(repo / ".rules" / "a.mdc")
+    (repo / ".rules" / "a.mdc").write_text("copy")
+    operations = [o for o in plan_repo(config, str(library)) if o['link'].endswith("a.mdc")]
+    assert apply_plan(operations) == 1
+    assert apply_plan(operations, force=True) == 0
+    assert os.path.islink(repo / ".rules" / "a.mdc")
+
+def test_plan_command_json(setup, tmp_path, monkeypatch, capsys):
+    library, repo, config = setup
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({'repositories': [config]}))
+    monkeypatch.setattr(sys, 'argv', ['manage_symlinks.py', '--config', str(config_path),
+                                      '--root', str(library), 'plan', '--json'])
+    manage_symlinks.main()
+    plan = json.loads(capsys.readouterr().out)
+    assert plan[0]['repository'] == str(repo)
+    assert len(plan[0]['operations']) == 4
+
+def test_parallel_validate_reports_per_repo_results(tmp_path, monkeypatch, capsys):
+    library = tmp_path / "library"
+    (library / ".rules").mkdir(parents=True)
+    (library / ".rules" / "a.mdc").write_text("a")
+    repositories = []
+    for i in range(4):
+        repo = tmp_path / f"repo{i}"
+        (repo / ".rules").mkdir(parents=True)
+        if i != 2:
+            os.symlink(str(library / ".rules" / "a.mdc"), repo / ".rules" / "a.mdc")
+        repositories.append({'path': str(repo), 'symlinks': {'.rules': ["a.mdc"]}})
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({'repositories': repositories}))
+    report = tmp_path / "report.json"
+    monkeypatch.setattr(sys, 'argv', ['manage_symlinks.py', '--config', str(config_path), '--root', str(library),
+                                      '--jobs', '3', 'validate', '--report', str(report)])
+
+    with pytest.raises(SystemExit) as exc:
+        manage_symlinks.main()
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "4 repositories, 3 links ok, 1 failed" in out
+    assert f"FAILED {tmp_path / 'repo2'}" in out
+    results = json.loads(report.read_text())
+    assert [r['repository'] for r in results] == [r['path'] for r in repositories]
+    assert [r['failed'] for r in results] == [0, 0, 1, 0]
@@ -0,0 +1,75 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import metadata_cache
+from metadata_cache import MetadataCache
+
+PROMPT = """---
+id: test-prompt
+description: Test Prompt
+created_date: 2024-01-01
+---
+
+# Heading
+Some content.
+"""
+
+@pytest.fixture
+def parse_counter(monkeypatch):
+    calls = []
+    original = metadata_cache.read_frontmatter
+    def _counting_parse(filepath):
+        calls.append(filepath)
+        return original(filepath)
+    monkeypatch.setattr(metadata_cache, 'read_frontmatter', _counting_parse)
+    return calls
+
+def test_cache_reuses_unchanged_files_across_runs(tmp_path, parse_counter):
+    prompt = tmp_path / "a.prompt.md"
+    prompt.write_text(PROMPT)
+
+    cache = MetadataCache(str(tmp_path))
+    record = cache.get(str(prompt))
+    cache.save()
+    assert record['frontmatter']['description'] == "Test Prompt"
+    assert record['frontmatter']['created_date'] == "2024-01-01"
+    assert record['title'] == "Heading"
+
+    warm = MetadataCache(str(tmp_path))
+    assert warm.get(str(prompt)) == record
+    assert len(parse_counter) == 1
+
+def test_cache_reparses_modified_file(tmp_path, parse_counter):
+    prompt = tmp_path / "a.prompt.md"
+    prompt.write_text(PROMPT)
+    cache = MetadataCache(str(tmp_path))
+    cache.get(str(prompt))
+
+    prompt.write_text(PROMPT.replace("Test Prompt", "Renamed Prompt plus extra"))
+    assert cache.get(str(prompt))['frontmatter']['description'] == "Renamed Prompt plus extra"
+    assert len(parse_counter) == 2
+
+def test_cache_touched_file_with_same_hash_is_not_reparsed(tmp_path, parse_counter):
+    prompt = tmp_path / "a.prompt.md"
+    prompt.write_text(PROMPT)
+    cache = MetadataCache(str(tmp_path))
+    cache.get(str(prompt))
+
+    st = os.stat(prompt)
+    os.utime(prompt, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    cache.get(str(prompt))
+    assert len(parse_counter) == 1
+
+def test_cache_prune_drops_deleted_files(tmp_path):
+    prompt = tmp_path / "a.prompt.md"
+    prompt.write_text(PROMPT)
+    cache = MetadataCache(str(tmp_path))
+    cache.get(str(prompt))
+    cache.prune([])
+    cache.save()
+
+    assert MetadataCache(str(tmp_path)).entries == {}
@@ -0,0 +1,55 @@
+import pytest
+import json
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.request import urlopen
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from prompt_server import LibraryState, _make_handler
+
+@pytest.fixture
+def state(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "k8s.prompt.md").write_text(
+        "---\nid: k8s\nname: Kubernetes Policy\ndescription: Policies\nversion: 1.0.0\n---\nKyverno rules.\n"
+    )
+    (tmp_path / "prompts" / "tf.prompt.md").write_text("---\nid: tf\nname: Terraform\n---\nModules.\n")
+    return LibraryState(str(tmp_path))
+
+def test_state_answers_search_show_and_lint(state):
+    assert [r['id'] for r in state.search("kubernetes")] == ["k8s"]
+    assert [r['id'] for r in state.search("kubernets polcy", fuzzy=True)] == ["k8s"]
+    assert state.show("tf")['content'] == "Modules."
+    assert state.show("missing") is None
+    assert state.lint()['errors'] == 0
+
+def test_state_refreshes_only_when_files_change(state, tmp_path, monkeypatch):
+    calls = []
+    original = state.refresh
+    monkeypatch.setattr(state, 'refresh', lambda: calls.append(1) or original())
+    state.refresh_if_stale()
+    assert calls == []
+
+    (tmp_path / "prompts" / "tf.prompt.md").write_text("---\nid: tf\nname: Terraform\n---\nState backends.\n")
+    state.refresh_if_stale()
+    assert calls == [1]
+    assert state.show("tf")['content'] == "State backends."
+    assert [r['id'] for r in state.search("backends")] == ["tf"]
+
+def test_http_api_serves_json(state):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urlopen(f"{base}/show?id=k8s") as response:
+            assert json.load(response)['name'] == "Kubernetes Policy"
+        with urlopen(f"{base}/search?q=terraform&limit=1") as response:
+            assert [r['id'] for r in json.load(response)['results']] == ["tf"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,49 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import search_index
+from search_index import SearchIndex, tokenize
+
+def _entry(tmp_path, name, frontmatter, body, sha256):
+    (tmp_path / name).write_text("---\n---\n" + body)
+    return {'path': name, 'frontmatter': frontmatter, 'body_offset': 8, 'sha256': sha256}
+
+def test_tokenize_stems_and_drops_stopwords():
+    assert tokenize("Testing the Kubernetes policies") == ["test", "kubernete", "policy"]
+    assert tokenize("kubernetes policy") == tokenize("Kubernetes Policies")
+
+def test_search_ranks_best_match_first(tmp_path):
+    entries = [
+        _entry(tmp_path, "a.md", {'name': "Analyze Terraform"}, "Review terraform modules.", "1"),
+        _entry(tmp_path, "b.md", {'name': "Kubernetes Policy"}, "Kyverno policy for kubernetes.", "2"),
+        _entry(tmp_path, "c.md", {'name': "Kubernetes Manifests"}, "Deployments and services.", "3"),
+    ]
+    index = SearchIndex(str(tmp_path))
+    index.update(entries)
+    results = index.search("kubernetes policies")
+    assert [path for path, _ in results] == ["b.md", "c.md"]
+    assert index.search("kubernetes", limit=1)[0][0] in ("b.md", "c.md")
+    assert index.search("nonexistent") == []
+
+def test_index_persists_and_reindexes_only_changed_docs(tmp_path, monkeypatch):
+    entries = [
+        _entry(tmp_path, "a.md", {'name': "Alpha"}, "first body", "1"),
+        _entry(tmp_path, "b.md", {'name': "Beta"}, "second body", "2"),
+    ]
+    index = SearchIndex(str(tmp_path))
+    index.update(entries)
+    index.save()
+
+    reads = []
+    original = search_index.read_body
+    monkeypatch.setattr(search_index, 'read_body', lambda root, entry: reads.append(entry['path']) or original(root, entry))
+    entries[1] = _entry(tmp_path, "b.md", {'name': "Beta"}, "replaced gamma text", "3")
+    reloaded = SearchIndex(str(tmp_path))
+    reloaded.update(entries)
+    assert reads == ["b.md"]
+    assert reloaded.search("gamma")[0][0] == "b.md"
+    assert reloaded.search("second") == []
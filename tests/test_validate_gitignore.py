@@ -0,0 +1,142 @@
+import pytest
+import itertools
+import os
+import sys
+from pathlib import Path
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from validate_gitignore import REQUIRED_PATTERNS, GitignoreValidator, ProjectType, ProjectTypeDetector, Severity, scan_results
+
+def _linear_pattern_exists(patterns, pattern):
+    """The original O(present) scan, kept as a reference for the indexed lookup."""
+    if pattern in patterns:
+        return True
+    pattern_base = pattern.rstrip('/*')
+    for existing in patterns:
+        existing_base = existing.rstrip('/*')
+        if pattern_base == existing_base:
+            return True
+        if pattern.startswith(existing_base + '/') or existing.startswith(pattern_base + '/'):
+            return True
+    return False
+
+@pytest.fixture
+def write_gitignore(tmp_path):
+    def _write(content):
+        path = tmp_path / ".gitignore"
+        path.write_text(content)
+        return GitignoreValidator(path)
+    return _write
+
+def test_indexed_lookup_matches_linear_scan(write_gitignore):
+    present = [".env", "!keep.log", "vendor/", "**/.terraform/*", ".chef/", "build/**", "/", "node_modules",
+               "a/b/c.txt", "*.py[cod]", "tmp/*"]
+    validator = write_gitignore("# comment\n\n" + "\n".join(present) + "\n")
+    required = [p for category in REQUIRED_PATTERNS.values() for group in category.values() for p, _ in group]
+    probes = required + ["a", "a/b", "a/b/c.txt/x", "vendor/bundle/", "build", "x/y", "/etc"]
+    for pattern in probes:
+        assert validator._pattern_exists(pattern) == _linear_pattern_exists(validator.patterns, pattern), pattern
+
+def test_indexed_lookup_matches_linear_scan_exhaustively(write_gitignore):
+    alphabet = ["a", "b", "/", "*"]
+    words = ["".join(p) for n in range(1, 4) for p in itertools.product(alphabet, repeat=n)]
+    validator = write_gitignore("\n".join(["a/", "b/a", "*", "a*/b", "/b"]) + "\n")
+    for pattern in words:
+        assert validator._pattern_exists(pattern) == _linear_pattern_exists(validator.patterns, pattern), pattern
+
+def test_validate_all_reports_missing_security_patterns(write_gitignore):
+    validator = write_gitignore(".env\n*.pem\n*.key\n.aws/\n")
+    validator.validate_security_patterns()
+    assert {issue.pattern for issue in validator.issues} == {
+        "credentials.json", "secrets.json", ".azure/", "kubeconfig",
+    }
+
+def _critical(validator, project_type=ProjectType.UNKNOWN):
+    validator.validate_all(project_type)
+    return {issue.pattern: issue.description for issue in validator.issues if issue.severity == Severity.CRITICAL}
+
+SECURE = ".env\n*.pem\n*.key\ncredentials.json\nsecrets.json\n.aws/\n.azure/\nkubeconfig\n"
+
+def test_negated_sensitive_pattern_is_critical(write_gitignore):
+    validator = write_gitignore(SECURE + "!.env\n")
+    critical = _critical(validator)
+    assert list(critical) == [".env"]
+    assert ".env, services/api/.env would still be committed" in critical[".env"]
+
+def test_later_rule_reignores_and_anchoring_counts(write_gitignore):
+    assert _critical(write_gitignore(SECURE + "!.env\n**/.env\n")) == {}
+    critical = _critical(write_gitignore(SECURE.replace("secrets.json", "/secrets.json")))
+    assert list(critical) == ["secrets.json"]
+    assert "config/secrets.json" in critical["secrets.json"]
+
+def test_probes_cover_technology_patterns(write_gitignore):
+    validator = write_gitignore(SECURE + "*.tfstate\n*.tfstate.*\n**/*.tfvars\n.chef/\n")
+    assert _critical(validator, ProjectType.TERRAFORM) == {}
+    assert _critical(write_gitignore(SECURE + ".chef/\n!.chef/x.pem\n"), ProjectType.CHEF) == {}
+    critical = _critical(write_gitignore(SECURE.replace("*.pem", "") + ".chef/*.pem\n"), ProjectType.CHEF)
+    assert set(critical) == {"*.pem", ".chef/encrypted_data_bag_secret"}
+
+def test_scan_prunes_and_parallel_matches_serial(tmp_path):
+    for rel in ("a", "b/c", "node_modules/pkg", ".git/x"):
+        (tmp_path / rel).mkdir(parents=True)
+        (tmp_path / rel / ".gitignore").write_text(".env\n")
+    (tmp_path / "b" / "c" / ".gitignore").write_text(SECURE)
+
+    serial = list(scan_results(tmp_path, ProjectType.UNKNOWN, summary_only=True))
+    parallel = list(scan_results(tmp_path, ProjectType.UNKNOWN, summary_only=True, jobs=2))
+    assert sorted(serial) == sorted(parallel)
+    assert {path.relative_to(tmp_path).as_posix() for path, _, _ in serial} == {"a/.gitignore", "b/c/.gitignore"}
+    assert {path.parent.name: summary["CRITICAL"] for path, _, summary in serial} == {"a": 7, "c": 0}
+
+def test_detector_lists_directory_once_and_finds_all_types(tmp_path, monkeypatch):
+    for name in ("main.tf", "pyproject.toml", "Gemfile", "app.sln"):
+        (tmp_path / name).write_text("")
+    calls = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: calls.append(path) or real_scandir(path))
+
+    detector = ProjectTypeDetector(tmp_path)
+    assert detector.detect_all() == [ProjectType.TERRAFORM, ProjectType.PYTHON, ProjectType.RUBY, ProjectType.DOTNET]
+    assert detector.detect() == ProjectType.TERRAFORM
+    ProjectTypeDetector(tmp_path).detect_all()
+    assert calls == [str(tmp_path)]
+
+def test_all_detected_types_are_validated(write_gitignore):
+    validator = write_gitignore(SECURE)
+    validator.validate_all([ProjectType.TERRAFORM, ProjectType.PYTHON])
+    categories = {issue.category for issue in validator.issues}
+    assert {"terraform", "python"} <= categories
+
+def test_scan_reports_unreadable_files_as_failed(tmp_path, monkeypatch, capsys):
+    import validate_gitignore
+    (tmp_path / "good").mkdir()
+    (tmp_path / "good" / ".gitignore").write_text(SECURE)
+    (tmp_path / "bad").mkdir()
+    (tmp_path / "bad" / ".gitignore").write_bytes(b"\xff\xfe.env\n")
+
+    results = {path.parent.name: summary for path, _, summary in scan_results(tmp_path, ProjectType.UNKNOWN)}
+    assert results["bad"] is None and results["good"]["CRITICAL"] == 0
+
+    monkeypatch.setattr(sys, 'argv', ['validate_gitignore.py', '--scan', str(tmp_path), '--summary-only'])
+    with pytest.raises(SystemExit) as exc:
+        validate_gitignore.main()
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "Files scanned: 1" in out and "Files failed:  1" in out
+
+def test_auto_detect_scan_reuses_walker_listing(tmp_path, monkeypatch):
+    for rel, marker in (("tf", "main.tf"), ("py/app", "pyproject.toml")):
+        (tmp_path / rel).mkdir(parents=True)
+        (tmp_path / rel / ".gitignore").write_text(SECURE)
+        (tmp_path / rel / marker).write_text("")
+    calls = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: calls.append(str(path)) or real_scandir(path))
+
+    results = {path.parent.name: output for path, output, _ in scan_results(tmp_path, ProjectType.UNKNOWN, auto_detect=True)}
+
+    assert "[terraform]" in results["tf"] and "[python]" not in results["tf"]
+    assert "[python]" in results["app"] and "[terraform]" not in results["app"]
+    assert sorted(calls) == sorted(set(calls))
@@ -6,7 +6,9 @@ from datetime import datetime
 # Add the scripts directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
 
-from version_prompts import process_prompt_file
+import generate_index
+import version_prompts
+from version_prompts import bump_version, load_versions, plan_prompt_file, process_prompt_file
 
 @pytest.fixture
 def temp_prompt_file(tmp_path):
@@ -89,3 +91,71 @@ Some content.
     success, message = process_prompt_file(str(file_path))
     assert success is False
     assert "Failed to parse YAML frontmatter" in message
+
+def test_process_prompt_file_versioned_file_is_not_rewritten(temp_prompt_file):
+    file_path = temp_prompt_file("---\nname: 'Quoted'\nversion: 2.0.0\n---\nBody\n")
+    os.utime(file_path, ns=(1_000_000_000, 1_000_000_000))
+
+    success, message = process_prompt_file(str(file_path))
+    assert success is True
+    assert "Already at version 2.0.0" in message
+    assert file_path.stat().st_mtime_ns == 1_000_000_000
+    assert file_path.read_text() == "---\nname: 'Quoted'\nversion: 2.0.0\n---\nBody\n"
+
+def test_plan_prompt_file_keeps_existing_lines():
+    content = "---\nname: 'Quoted'\ncreated_date: 2023-05-01\nlast_updated: 2023-05-02\n---\nBody\n"
+    status, _, new_content = plan_prompt_file(content, today="2024-02-03")
+    assert status == 'changed'
+    assert new_content == (
+        "---\nname: 'Quoted'\ncreated_date: 2023-05-01\n"
+        "last_updated: \"2024-02-03\"\nversion: \"1.0.0\"\n---\nBody\n"
+    )
+
+def test_main_parallel_run_is_idempotent(tmp_path, monkeypatch, capsys):
+    for i in range(4):
+        (tmp_path / f"p{i}.prompt.md").write_text(f"---\nname: P{i}\n---\nBody\n")
+    builds = []
+    monkeypatch.setattr(generate_index, 'build_index', lambda root, **kwargs: builds.append(root) or True)
+
+    monkeypatch.setattr(sys, 'argv', ['version_prompts.py', '--root', str(tmp_path), '--jobs', '2'])
+    version_prompts.main()
+    assert "4 updated, 0 unchanged, 0 errors" in capsys.readouterr().out
+    assert builds == [str(tmp_path)]
+
+    version_prompts.main()
+    assert "0 updated, 4 unchanged, 0 errors" in capsys.readouterr().out
+    assert builds == [str(tmp_path)]
+
+def test_bump_version():
+    assert bump_version("1.0") == "1.0.1"
+    assert bump_version("1.2.3") == "1.2.4"
+    assert bump_version("1.2.3", "minor") == "1.3.0"
+    with pytest.raises(ValueError):
+        bump_version("v1-beta")
+
+def test_main_bumps_only_prompts_whose_body_changed(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(generate_index, 'build_index', lambda root, **kwargs: True)
+    stable = tmp_path / "stable.prompt.md"
+    edited = tmp_path / "edited.prompt.md"
+    stable.write_text("---\nversion: 1.0.0\n---\nSame\n")
+    edited.write_text("---\nversion: '1.4'\nlast_updated: 2020-01-01\n---\nOld\n")
+    monkeypatch.setattr(sys, 'argv', ['version_prompts.py', '--root', str(tmp_path), '--bump'])
+
+    version_prompts.main()  # first run only records hashes
+    assert "0 updated" in capsys.readouterr().out
+    assert set(load_versions(str(tmp_path))) == {"stable.prompt.md", "edited.prompt.md"}
+
+    edited.write_text("---\nversion: '1.4'\nlast_updated: 2020-01-01\n---\nNew\n")
+    version_prompts.main()
+    assert "Bumped 1.4 -> 1.4.1" in capsys.readouterr().out
+    today = datetime.now().strftime('%Y-%m-%d')
+    assert edited.read_text() == f"---\nversion: '1.4.1'\nlast_updated: \"{today}\"\n---\nNew\n"
+    assert stable.read_text() == "---\nversion: 1.0.0\n---\nSame\n"
+
+    version_prompts.main()
+    assert "0 updated" in capsys.readouterr().out
+
+    edited.write_text(edited.read_text().replace("New", "Newer"))
+    monkeypatch.setattr(sys, 'argv', ['version_prompts.py', '--root', str(tmp_path), '--bump', '--minor'])
+    version_prompts.main()
+    assert "Bumped 1.4.1 -> 1.5.0" in capsys.readouterr().out
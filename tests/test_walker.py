@@ -0,0 +1,46 @@
+import pytest
+import os
+import sys
+
+# Add the scripts directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+from walker import walk
+
+def _files(root, **kwargs):
+    found = []
+    for dirpath, _, filenames in walk(str(root), **kwargs):
+        found.extend(os.path.relpath(os.path.join(dirpath, f), root) for f in filenames)
+    return sorted(found)
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in ["a.md", "docs/b.md", "docs/build/c.md", "node_modules/pkg/d.md", ".git/objects/e", "sub/f.md", "sub/g.log"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (tmp_path / ".gitignore").write_text("build/\n*.log\n")
+    (tmp_path / "sub" / ".gitignore").write_text("f.md\n!g.log\n")
+    return tmp_path
+
+def test_walk_prunes_and_honours_nested_gitignores(tree):
+    assert _files(tree) == [".gitignore", "a.md", "docs/b.md", "sub/.gitignore", "sub/g.log"]
+
+def test_walk_without_gitignore_still_prunes(tree):
+    assert "docs/build/c.md" in _files(tree, use_gitignore=False)
+    assert not any(path.startswith(("node_modules", ".git" + os.sep)) for path in _files(tree, use_gitignore=False))
+
+def test_walk_matches_os_walk_order(tree):
+    prune = lambda dirs: [d for d in dirs if d not in ("node_modules", ".git")]
+    expected = []
+    for dirpath, dirnames, filenames in os.walk(tree):
+        dirnames[:] = prune(dirnames)
+        expected.append((dirpath, filenames))
+    assert [(d, f) for d, _, f in walk(str(tree), use_gitignore=False)] == expected
+
+def test_walk_does_not_follow_symlinked_dirs(tree, tmp_path_factory):
+    target = tmp_path_factory.mktemp("target")
+    (target / "linked.md").write_text("x")
+    os.symlink(target, tree / "linked_repo")
+    assert not any("linked" in path for path in _files(tree))
+    assert os.path.join("linked_repo", "linked.md") in _files(tree, follow_symlinks=True)